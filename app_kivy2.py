@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Mapping
 
 from functools import partial
 
@@ -26,9 +26,12 @@ from kivy.uix.widget import Widget
 # Config.set('graphics', 'fullscreen', '1')
 
 from game_engine import (
-    GameEngine, GameEngineConfig,
+    GameEngine, GameEngineConfig, StateChange,
     Player, VP, SignalLevel, Call, hand_category
 )
+import engine_server
+import ux_assets
+from session_snapshot import SnapshotStore
 
 # --- Wahrheitsregel (anpassbar) ---
 def signal_truth_mapping(p1_cards: Tuple[int, int], level: SignalLevel) -> bool:
@@ -242,7 +245,6 @@ class CardWidget(ButtonBehavior, Image):
         self.face_up = face_up
         self.source = self.front_source if face_up else self.back_source
         self.opacity = 1.0 if face_up or not self.disabled else 0.7
-        self.reload()
 
     def set_interactive(self, enabled: bool):
         self.disabled = not enabled
@@ -258,10 +260,11 @@ class TwoPlayerUI(BoxLayout):
 
         base = Path(__file__).resolve().parent
         self.base = base
-        self.card_dir = base / "Karten"
-        self.img_back = str(self.card_dir / "back.png") if (self.card_dir / "back.png").exists() else ""
+        self.img_back = ux_assets.card_source(None)
 
         self.engine: Optional[GameEngine] = None
+        # ENGINE_SERVER gesetzt → die Engine läuft im engine_server-Prozess, hier nur der Client
+        self.engine_client = engine_server.connect_from_env()
         self.session_popup: Optional[Popup] = None
         self._session_inputs = {}
         self.session_message = ""
@@ -364,6 +367,7 @@ class TwoPlayerUI(BoxLayout):
 
         self.in_transition = False
         self.transition_message = ""
+        self.transition_button_text = ""
         self.transition_final = False
         self.transition_ready_vp1 = False
         self.transition_ready_vp2 = False
@@ -380,11 +384,54 @@ class TwoPlayerUI(BoxLayout):
         self.session_number_value: Optional[int] = None
 
         self.log_dir = self.base / "logs"
+        # Snapshot nach jeder Zustandsänderung; beim Start wird eine unterbrochene Session fortgesetzt
+        self.snapshots = SnapshotStore(self.log_dir / "snapshots" / Path(__file__).stem)
 
-        Clock.schedule_interval(lambda dt: self.refresh(), 0.1)
-        Clock.schedule_once(lambda dt: self._open_session_dialog(), 0.1)
+        # Kein Polling: die Engine meldet Änderungen (siehe _on_state_change)
+        Clock.schedule_once(lambda dt: self._resume_or_open_dialog(), 0.1)
         self.refresh()
 
+    def _resume_or_open_dialog(self):
+        """ Gibt es einen nicht abgeschlossenen Snapshot, dort weitermachen – sonst Sessiondialog. """
+        entry = self.snapshots.latest_unfinished()
+        if entry is None:
+            self._open_session_dialog()
+            return
+        _key, data = entry
+        try:
+            self._resume(data["state"])
+        except (KeyError, ValueError, OSError) as e:
+            self.bottom_detail_label.text = f"Fortsetzen fehlgeschlagen: {e}"
+            self._open_session_dialog()
+
+    def _resume(self, state: Dict[str, Any]):
+        self.session_number_value = state["session_number"]
+        self.session_identifier = f"S{self.session_number_value:03d}"
+        self.session_message = f"Session {self.session_number_value} (fortgesetzt)"
+        if state["engine"] is not None:
+            self.next_block_idx = state["current_block_idx"]
+            self._start_block(resume_state=state["engine"])
+        else:
+            self.current_block_idx = None
+            self.next_block_idx = state["next_block_idx"]
+            self.transition_final = state["transition_final"]
+            self._show_transition(state["transition_message"], state["transition_button"])
+            self._save_snapshot()
+
+    def _save_snapshot(self, finished: bool = False):
+        """ Block- und Engine-Fortschritt sichern (atomar, < 1 ms). """
+        if not self.session_identifier:
+            return
+        self.snapshots.save(self.session_identifier, {
+            "session_number": self.session_number_value,
+            "current_block_idx": self.current_block_idx,
+            "next_block_idx": self.next_block_idx,
+            "transition_final": self.transition_final,
+            "transition_message": self.transition_message,
+            "transition_button": self.transition_button_text,
+            "engine": self.engine.export_state() if self.engine else None,
+        }, finished=finished)
+
     def _open_session_dialog(self):
         if self.session_popup:
             return
@@ -461,6 +508,7 @@ class TwoPlayerUI(BoxLayout):
 
     def _show_transition(self, message: str, button_text: str):
         self.transition_message = message
+        self.transition_button_text = button_text
         self.transition_label_vp1.text = f"{button_text} (VP1)"
         self.transition_label_vp2.text = f"{button_text} (VP2)"
         self.btn_transition_vp1.set_state(True, highlighted=True)
@@ -486,7 +534,8 @@ class TwoPlayerUI(BoxLayout):
             widget.set_card(None, False)
             widget.set_interactive(False)
 
-    def _start_block(self):
+    def _start_block(self, resume_state: Optional[Dict[str, Any]] = None):
+        """ Startet den Block next_block_idx; `resume_state` (GameEngine.export_state) setzt ihn fort. """
         if not self.session_identifier:
             return
         if self.next_block_idx >= len(self.block_sequence):
@@ -495,6 +544,7 @@ class TwoPlayerUI(BoxLayout):
             )
             self.transition_final = True
             self._show_transition(message, "Experiment beenden")
+            self._save_snapshot()
             return
 
         block_info = self.block_sequence[self.next_block_idx]
@@ -516,12 +566,15 @@ class TwoPlayerUI(BoxLayout):
             log_dir=str(self.log_dir),
             payout=block_info["payout"],
             payout_start_points=16 if block_info["payout"] else 0,
+            log_async=True,
         )
 
         if self.engine:
+            self.engine.unsubscribe(self._on_state_change)
             self.engine.close()
 
-        self.engine = GameEngine(cfg)
+        self.engine = self._create_engine(cfg)
+        self.engine.subscribe(self._on_state_change)
         self.current_block_idx = self.next_block_idx
         self.next_block_idx = self.current_block_idx + 1
         condition_label = "Auszahlung" if block_info["payout"] else "ohne Auszahlung"
@@ -530,8 +583,20 @@ class TwoPlayerUI(BoxLayout):
         )
         self.transition_final = False
         self._show_board()
+        if resume_state is not None:
+            self.engine.restore_state(resume_state)
+        self._save_snapshot()
         self.refresh()
 
+    def _create_engine(self, cfg: GameEngineConfig):
+        """ Lokale GameEngine oder RemoteEngine (Zustands-Pushes laufen im Kivy-Mainloop). """
+        if self.engine_client is None:
+            return GameEngine(cfg)
+        return engine_server.RemoteEngine(
+            cfg, self.engine_client,
+            dispatch=lambda fn: Clock.schedule_once(lambda dt: fn(), 0),
+        )
+
     def _handle_block_finished(self):
         if self.in_transition:
             return
@@ -539,6 +604,7 @@ class TwoPlayerUI(BoxLayout):
         if self.current_block_idx is not None and self.current_block_idx < len(self.block_sequence):
             finished_info = self.block_sequence[self.current_block_idx]
         if self.engine:
+            self.engine.unsubscribe(self._on_state_change)
             self.engine.close()
             self.engine = None
         block_label = finished_info["block"] if finished_info else ""
@@ -558,6 +624,7 @@ class TwoPlayerUI(BoxLayout):
             self.transition_final = True
         self.current_block_idx = None
         self._show_transition(message, button_text)
+        self._save_snapshot()
 
     def _continue_after_block(self, vp: VP):
         if vp == VP.VP1:
@@ -574,6 +641,7 @@ class TwoPlayerUI(BoxLayout):
             self.bottom_info_label.text = "Experiment abgeschlossen."
             self.top_info_label.text = "Experiment abgeschlossen."
             self.bottom_detail_label.text = ""
+            self._save_snapshot(finished=True)
             return
         self._start_block()
 
@@ -613,10 +681,7 @@ class TwoPlayerUI(BoxLayout):
             widget.center = (cx + offset_x, cy + offset_y)
 
     def _img_for_value(self, val: Optional[int]) -> str:
-        if val is None:
-            return self.img_back
-        p = self.card_dir / f"{val}.png"
-        return str(p) if p.exists() else self.img_back
+        return ux_assets.card_source(val)
 
     def _player_for_vp(self, vp: VP) -> Player:
         if not self.engine:
@@ -639,7 +704,7 @@ class TwoPlayerUI(BoxLayout):
         """Welcher VP ist als nächstes dran (rollenrichtig) und welche Karte (0/1)?"""
         if not self.engine:
             return None
-        st = self.engine.get_public_state()
+        st = self.engine.snapshot()
         if st["phase"] != "DEALING":
             return None
         vp_p1 = VP[st["roles"]["P1"]]   # 'VP1'/'VP2' → Enum
@@ -672,7 +737,7 @@ class TwoPlayerUI(BoxLayout):
             return SignalLevel.TIEF
         return None
 
-    def _info_text_for_vp(self, vp: VP, st: Dict[str, Any], rs) -> str:
+    def _info_text_for_vp(self, vp: VP, st: Mapping[str, Any], rs) -> str:
         lines = []
         role_label = "Spieler 1" if st["roles"]["P1"] == vp.value else "Spieler 2"
         lines.append(f"Du bist {role_label}")
@@ -708,7 +773,7 @@ class TwoPlayerUI(BoxLayout):
     def _start_or_next_for_vp(self, vp: VP):
         if not self.engine:
             return
-        st = self.engine.get_public_state()
+        st = self.engine.snapshot()
         player = self._player_for_vp(vp)
         try:
             if st["phase"] == "WAITING_START":
@@ -717,7 +782,6 @@ class TwoPlayerUI(BoxLayout):
                 self.engine.click_next_round(player)
         except Exception as e:
             self.bottom_detail_label.text = f"Start/Next-Fehler ({vp.value}): {e}"
-        self.refresh()
 
     def _reveal(self, vp: VP, idx: int):
         if not self.engine:
@@ -727,7 +791,6 @@ class TwoPlayerUI(BoxLayout):
             self.engine.click_reveal_card(p, idx)
         except Exception as e:
             self.bottom_detail_label.text = f"Reveal-Fehler ({vp.value} K{idx+1}): {e}"
-        self.refresh()
 
     def _signal_from_vp(self, vp: VP, level: SignalLevel):
         # Nur die VP, die gerade Spieler 1 ist, darf signalen
@@ -739,7 +802,6 @@ class TwoPlayerUI(BoxLayout):
             self.engine.p1_signal(level)
         except Exception as e:
             self.bottom_detail_label.text = f"Signal-Fehler ({vp.value}): {e}"
-        self.refresh()
 
     def _call_from_vp(self, vp: VP, call: Call):
         # Nur die VP, die gerade Spieler 2 ist, darf callen
@@ -757,10 +819,32 @@ class TwoPlayerUI(BoxLayout):
             self.engine.p2_call(call, p1_hat_wahrheit_gesagt=truth)
         except Exception as e:
             self.bottom_detail_label.text = f"Call-Fehler ({vp.value}): {e}"
-        self.refresh()
 
     # ===== Refresh =====
+    # Welche Teile der Oberfläche von welchen Schlüsseln aus get_public_state() abhängen
+    _REDRAW_SECTIONS = (
+        ("_redraw_info", frozenset({"roles", "phase", "p1_signal", "p2_call", "winner", "outcome_reason"})),
+        ("_redraw_scores", frozenset({"scores"})),
+        ("_redraw_controls", frozenset({"roles", "phase", "p1_ready", "p2_ready",
+                                        "next_ready_p1", "next_ready_p2", "p1_signal", "p2_call"})),
+        ("_redraw_categories", frozenset({"round_index"})),
+        ("_redraw_cards", frozenset({"roles", "phase", "round_index", "p1_revealed", "p2_revealed"})),
+    )
+
+    def _on_state_change(self, change: StateChange):
+        if self.in_transition or not self.engine:
+            return
+        if change.state.get("phase") == "FINISHED":
+            self._handle_block_finished()
+            return
+        self._save_snapshot()
+        rs = self.engine.current
+        for name, keys in self._REDRAW_SECTIONS:
+            if change.touches(keys):
+                getattr(self, name)(change.state, rs)
+
     def refresh(self):
+        """ Vollständiges Neuzeichnen (Blockstart, ohne Engine). """
         if self.in_transition:
             return
 
@@ -779,20 +863,23 @@ class TwoPlayerUI(BoxLayout):
                 widget.set_interactive(False)
             return
 
-        st = self.engine.get_public_state()
+        st = self.engine.snapshot()
         if st.get("phase") == "FINISHED":
             self._handle_block_finished()
             return
 
         rs = self.engine.current
-        ph = st["phase"]
+        for name, _keys in self._REDRAW_SECTIONS:
+            getattr(self, name)(st, rs)
 
+    def _redraw_info(self, st: Mapping[str, Any], rs):
         self.top_info_label.text = self._info_text_for_vp(VP.VP2, st, rs)
         self.bottom_info_label.text = self._info_text_for_vp(VP.VP1, st, rs)
 
         outcome = st.get("outcome_reason")
         self.bottom_detail_label.text = outcome or self.session_message
 
+    def _redraw_scores(self, st: Mapping[str, Any], rs):
         scores = st.get("scores")
         if scores:
             self.vp1_panel.set_score(f"{scores.get('VP1', '')} Punkte")
@@ -801,6 +888,8 @@ class TwoPlayerUI(BoxLayout):
             self.vp1_panel.set_score("")
             self.vp2_panel.set_score("")
 
+    def _redraw_controls(self, st: Mapping[str, Any], rs):
+        ph = st["phase"]
         is_vp1_p1 = (st["roles"]["P1"] == "VP1")
         is_vp2_p1 = (st["roles"]["P1"] == "VP2")
 
@@ -834,9 +923,12 @@ class TwoPlayerUI(BoxLayout):
         selected_call_vp2 = rs.p2_call if rs.roles.p2_is == VP.VP2 else None
         self.vp2_panel.set_call_state(enable_call_vp2, selected_call_vp2)
 
+    def _redraw_categories(self, st: Mapping[str, Any], rs):
         self.vp1_panel.set_category(self._category_for_cards(self._cards_for_vp(VP.VP1)))
         self.vp2_panel.set_category(self._category_for_cards(self._cards_for_vp(VP.VP2)))
 
+    def _redraw_cards(self, st: Mapping[str, Any], rs):
+        ph = st["phase"]
         show_mid = ph in ("REVEAL_SCORE", "ROUND_DONE")
         expected = self._expected_reveal()
 
@@ -853,12 +945,15 @@ class TwoPlayerUI(BoxLayout):
 
 class TouchGameApp(App):
     def build(self):
+        ux_assets.preload()
         return TwoPlayerUI()
 
     def on_stop(self):
         root = self.root
         if root and getattr(root, "engine", None):
             root.engine.close()
+        if root and getattr(root, "engine_client", None):
+            root.engine_client.close()
 
 
 if __name__ == "__main__":
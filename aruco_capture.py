@@ -0,0 +1,412 @@
+# aruco_capture.py  (Kamera → ArUco-Marker → Tabletop-UI)
+#
+# FrameGrabber liest in einem eigenen Thread von der Kamera, aus einer Videodatei oder aus
+# einer Folge synthetischer Frames und hält nur die neuesten `buffer_size` Frames; ältere
+# werden verworfen. Ist die Erkennung kurz langsamer als die Kamera, wächst so keine
+# Warteschlange (und keine Latenz) auf. MarkerDetector sucht ArUco-Marker auf einem
+# verkleinerten Graubild. Wurden im letzten Frame Marker gefunden, sucht er nur in einer
+# ROI um deren Positionen, das ganze Bild erst wieder, wenn dort nichts gefunden wird
+# (oder alle `full_scan_every` Frames, damit neue Marker auftauchen können).
+# ArucoPipeline verbindet beides in einem Erkennungs-Thread; die UI holt mit latest() nur
+# das neueste Ergebnis ab (Clock.schedule_interval) und wird dabei nie blockiert.
+#
+# OpenCV (opencv-contrib-python bzw. opencv-python ≥ 4.7 mit cv2.aruco) ist optional und
+# wird erst beim Öffnen einer Quelle bzw. beim Erkennen importiert.
+#     python aruco_capture.py --source 0            (Kamera 0, Marker fortlaufend ausgeben)
+#     python aruco_capture.py --source aufnahme.mp4
+#     python bench_aruco_capture.py                 (synthetisches Video, Latenz und FPS)
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import argparse
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_DICTIONARY = "DICT_4X4_50"
+DEFAULT_SCALE = 0.5          # Erkennung auf halber Auflösung (¼ der Pixel)
+ROI_MARGIN = 0.75            # ROI = Bounding-Box der letzten Marker ± 75 % ihrer Größe
+FULL_SCAN_EVERY = 15         # spätestens jeder 15. Frame wird komplett durchsucht
+
+Point = Tuple[float, float]
+
+
+def _require_cv2():
+    try:
+        import cv2
+    except ImportError as exc:
+        raise RuntimeError(
+            "OpenCV fehlt: pip install opencv-contrib-python (mit cv2.aruco)."
+        ) from exc
+    if not hasattr(cv2, "aruco"):
+        raise RuntimeError("Diese OpenCV-Version enthält kein cv2.aruco (opencv-contrib-python).")
+    return cv2
+
+
+@dataclass(frozen=True)
+class Marker:
+    """ Koordinaten normiert auf den ganzen Frame (0..1), Ursprung oben links wie im Bild. """
+    id: int
+    center: Point
+    corners: Tuple[Point, Point, Point, Point]
+
+    def to_window(self, width: float, height: float) -> Point:
+        """ Mittelpunkt in Kivy-Fensterkoordinaten (Ursprung unten links). """
+        return self.center[0] * width, (1.0 - self.center[1]) * height
+
+
+@dataclass(frozen=True)
+class Frame:
+    index: int
+    t_capture: float             # time.perf_counter() beim Einlesen
+    image: Any                   # numpy-Array (BGR oder Grau)
+
+
+@dataclass(frozen=True)
+class Detection:
+    frame_index: int
+    t_capture: float
+    t_done: float
+    markers: Tuple[Marker, ...]
+    roi: bool                    # nur in der ROI gesucht (kein Vollscan nötig)
+
+    @property
+    def latency(self) -> float:
+        """ Sekunden vom Einlesen des Frames bis zum fertigen Ergebnis. """
+        return self.t_done - self.t_capture
+
+
+class DropOldestBuffer:
+    """ Begrenzter Frame-Puffer: put() verdrängt bei Überlauf den ältesten Eintrag. """
+    def __init__(self, size: int = 2):
+        self._items: Deque[Frame] = deque(maxlen=max(1, size))
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item: Frame):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """ Ältester noch vorhandener Frame; None bei Timeout oder geschlossenem, leerem Puffer. """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self.closed, timeout):
+                return None
+            return self._items.popleft() if self._items else None
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+FrameSource = Union[int, str, Iterable[Any]]
+
+
+class FrameGrabber:
+    """
+    Liest Frames in einem eigenen Thread in einen DropOldestBuffer. `source`: Kamera-Index,
+    Pfad einer Videodatei oder eine Folge von Bildern (numpy-Arrays, z. B. synthetic_video).
+    `pace_fps` spielt Dateien/Folgen im Kameratakt ab, statt so schnell wie möglich zu lesen.
+    """
+    def __init__(self, source: FrameSource, buffer_size: int = 2, *,
+                 width: Optional[int] = None, height: Optional[int] = None,
+                 fps: Optional[float] = None, pace_fps: Optional[float] = None):
+        self.buffer = DropOldestBuffer(buffer_size)
+        self.pace_fps = pace_fps
+        self.frames_read = 0
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._capture = None
+        if isinstance(source, (int, str)):
+            cv2 = _require_cv2()
+            self._capture = cv2.VideoCapture(source)
+            if not self._capture.isOpened():
+                raise RuntimeError(f"Videoquelle {source!r} lässt sich nicht öffnen.")
+            # Treiberseitigen Puffer klein halten, sonst liefert read() alte Bilder
+            self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            if width:
+                self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            if height:
+                self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps:
+                self._capture.set(cv2.CAP_PROP_FPS, fps)
+            self._frames: Iterator[Any] = self._read_capture()
+        else:
+            self._frames = iter(source)
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+
+    def start(self) -> "FrameGrabber":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(2.0)
+        if self._capture is not None:
+            self._capture.release()
+        self.buffer.close()
+
+    def _read_capture(self) -> Iterator[Any]:
+        while True:
+            ok, image = self._capture.read()
+            if not ok:
+                return
+            yield image
+
+    def _run(self):
+        interval = 1.0 / self.pace_fps if self.pace_fps else 0.0
+        next_due = time.perf_counter()
+        try:
+            for image in self._frames:
+                if self._stop.is_set():
+                    break
+                if interval:
+                    next_due += interval
+                    delay = next_due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.buffer.put(Frame(self.frames_read, time.perf_counter(), image))
+                self.frames_read += 1
+        finally:
+            self.finished.set()
+            self.buffer.close()
+
+
+class MarkerDetector:
+    """
+    ArUco-Erkennung auf verkleinertem Graubild (`scale`) mit ROI-Tracking. Nicht
+    thread-sicher: gehört dem Erkennungs-Thread der Pipeline.
+    """
+    def __init__(self, dictionary: str = DEFAULT_DICTIONARY, scale: float = DEFAULT_SCALE,
+                 roi_margin: float = ROI_MARGIN, full_scan_every: int = FULL_SCAN_EVERY,
+                 use_roi: bool = True):
+        cv2 = _require_cv2()
+        self._cv2 = cv2
+        self.scale = scale
+        self.roi_margin = roi_margin
+        self.full_scan_every = max(1, full_scan_every)
+        self.use_roi = use_roi
+        aruco = cv2.aruco
+        self.dictionary = aruco.getPredefinedDictionary(getattr(aruco, dictionary))
+        modern = hasattr(aruco, "ArucoDetector")       # OpenCV ≥ 4.7
+        params = aruco.DetectorParameters() if modern else aruco.DetectorParameters_create()
+        # Keine Eckenverfeinerung: die UI braucht nur Positionen, keine Posenschätzung
+        params.cornerRefinementMethod = aruco.CORNER_REFINE_NONE
+        # In ROI-Ausschnitten liegen Marker oft nah am Ausschnittrand
+        params.minDistanceToBorder = 0
+        if modern:
+            self._detect = aruco.ArucoDetector(self.dictionary, params).detectMarkers
+        else:
+            self._detect = lambda image: aruco.detectMarkers(image, self.dictionary, parameters=params)
+        self._last: Tuple[Marker, ...] = ()
+        self._since_full = 0
+
+    def detect(self, image) -> Tuple[Tuple[Marker, ...], bool]:
+        """ Rückgabe: (Marker, nur ROI durchsucht). """
+        cv2 = self._cv2
+        height, width = image.shape[:2]
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        if self.scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.scale, fy=self.scale,
+                              interpolation=cv2.INTER_AREA)
+        markers: Tuple[Marker, ...] = ()
+        used_roi = False
+        if self.use_roi and self._last and self._since_full < self.full_scan_every:
+            x0, y0, x1, y1 = self._roi(gray.shape[1], gray.shape[0])
+            markers = self._find(gray[y0:y1, x0:x1], x0, y0, gray.shape[1], gray.shape[0])
+            used_roi = bool(markers)
+        if used_roi:
+            self._since_full += 1
+        else:
+            markers = self._find(gray, 0, 0, gray.shape[1], gray.shape[0])
+            self._since_full = 0
+        self._last = markers
+        return markers, used_roi
+
+    def _roi(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        xs = [x for marker in self._last for x, _ in marker.corners]
+        ys = [y for marker in self._last for _, y in marker.corners]
+        margin_x = (max(xs) - min(xs)) * self.roi_margin + 0.05
+        margin_y = (max(ys) - min(ys)) * self.roi_margin + 0.05
+        return (max(0, int((min(xs) - margin_x) * width)),
+                max(0, int((min(ys) - margin_y) * height)),
+                min(width, int((max(xs) + margin_x) * width) + 1),
+                min(height, int((max(ys) + margin_y) * height) + 1))
+
+    def _find(self, gray, offset_x: int, offset_y: int, width: int, height: int) -> Tuple[Marker, ...]:
+        corners, ids, _rejected = self._detect(gray)
+        if ids is None:
+            return ()
+        found = []
+        for quad, marker_id in zip(corners, ids.ravel()):
+            points = quad.reshape(4, 2)
+            normed = tuple(((float(x) + offset_x) / width, (float(y) + offset_y) / height)
+                           for x, y in points)
+            center = (sum(x for x, _ in normed) / 4.0, sum(y for _, y in normed) / 4.0)
+            found.append(Marker(int(marker_id), center, normed))
+        found.sort(key=lambda marker: marker.id)
+        return tuple(found)
+
+
+class ArucoPipeline:
+    """
+    Grabber-Thread → Erkennungs-Thread → latest(). `on_detection` läuft im Erkennungs-
+    Thread (z. B. für Benchmarks); UIs pollen latest() aus ihrem eigenen Takt.
+    """
+    def __init__(self, grabber: FrameGrabber, detector: MarkerDetector,
+                 on_detection: Optional[Callable[[Detection], None]] = None):
+        self.grabber = grabber
+        self.detector = detector
+        self.on_detection = on_detection
+        self.frames_processed = 0
+        self.error: Optional[BaseException] = None
+        self._latest: Optional[Detection] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ArucoPipeline", daemon=True)
+
+    @classmethod
+    def open(cls, source: FrameSource, **detector_options) -> "ArucoPipeline":
+        """ Kamera/Datei öffnen und beide Threads starten (RuntimeError ohne OpenCV/Kamera). """
+        detector = MarkerDetector(**detector_options)
+        return cls(FrameGrabber(source), detector).start()
+
+    def start(self) -> "ArucoPipeline":
+        self.grabber.start()
+        self._thread.start()
+        return self
+
+    def latest(self) -> Optional[Detection]:
+        """ Neuestes Ergebnis ohne Warten (eine Attributzuweisung, daher ohne Lock). """
+        return self._latest
+
+    def join(self, timeout: Optional[float] = None):
+        """ Wartet, bis eine endliche Quelle (Datei, synthetisches Video) abgearbeitet ist. """
+        self._thread.join(timeout)
+
+    def stop(self):
+        self._stop.set()
+        self.grabber.stop()
+        self._thread.join(2.0)
+
+    @property
+    def dropped(self) -> int:
+        return self.grabber.buffer.dropped
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                frame = self.grabber.buffer.get(timeout=0.5)
+                if frame is None:
+                    if self.grabber.buffer.closed:
+                        return
+                    continue
+                markers, used_roi = self.detector.detect(frame.image)
+                detection = Detection(frame.index, frame.t_capture, time.perf_counter(),
+                                      markers, used_roi)
+                self._latest = detection
+                self.frames_processed += 1
+                if self.on_detection is not None:
+                    self.on_detection(detection)
+        except Exception as exc:   # UI zeigt den Fehler, statt dass der Thread still stirbt
+            self.error = exc
+
+
+# -------------- Synthetische Testvideos --------------
+
+def synthetic_video(n_frames: int, size: Tuple[int, int] = (1280, 720),
+                    marker_ids: Iterable[int] = (0, 1, 2, 3), marker_px: int = 96,
+                    dictionary: str = DEFAULT_DICTIONARY, seed: int = 0
+                    ) -> Tuple[List[Any], List[Dict[int, Point]]]:
+    """
+    Frames (BGR, Rauschhintergrund) mit langsam wandernden Markern und die wahren
+    Mittelpunkte je Frame (normiert), z. B. für bench_aruco_capture oder write_video().
+    """
+    cv2 = _require_cv2()
+    aruco = cv2.aruco
+    dict_obj = aruco.getPredefinedDictionary(getattr(aruco, dictionary))
+    draw = getattr(aruco, "generateImageMarker", None) or aruco.drawMarker
+    rng = np.random.default_rng(seed)
+    width, height = size
+    quiet = marker_px // 4   # weißer Rand, ohne den ArUco nicht erkannt wird
+    tiles = {}
+    for marker_id in marker_ids:
+        tile = np.full((marker_px + 2 * quiet, marker_px + 2 * quiet), 255, np.uint8)
+        tile[quiet:quiet + marker_px, quiet:quiet + marker_px] = draw(dict_obj, marker_id, marker_px)
+        tiles[marker_id] = tile
+    tile_size = marker_px + 2 * quiet
+    starts = {marker_id: (rng.uniform(0, width - tile_size), rng.uniform(0, height - tile_size),
+                          rng.uniform(-3, 3), rng.uniform(-2, 2)) for marker_id in tiles}
+    # Tischfläche: weiche Helligkeitsverläufe plus leichtes Sensorrauschen (reines Pixel-
+    # rauschen wäre unrealistisch und erzeugt Tausende Scheinkandidaten)
+    coarse = rng.uniform(90, 170, size=(height // 32 + 1, width // 32 + 1)).astype(np.float32)
+    shading = cv2.resize(coarse, (width, height), interpolation=cv2.INTER_CUBIC)
+    noise = rng.normal(0, 4, size=(height, width))
+    background = np.clip(shading + noise, 0, 255).astype(np.uint8)
+    frames, truth = [], []
+    for idx in range(n_frames):
+        gray = background.copy()
+        centers = {}
+        placed: List[Tuple[int, int, int]] = []
+        for marker_id, (x0, y0, vx, vy) in starts.items():
+            # Hin- und Herbewegung innerhalb des Bildes (Dreieckswelle)
+            x = int(abs((x0 + vx * idx) % (2 * (width - tile_size)) - (width - tile_size)))
+            y = int(abs((y0 + vy * idx) % (2 * (height - tile_size)) - (height - tile_size)))
+            gray[y:y + tile_size, x:x + tile_size] = tiles[marker_id]
+            centers[marker_id] = ((x + tile_size / 2) / width, (y + tile_size / 2) / height)
+            # überdeckte Marker zählen nicht als sichtbar
+            for other_id, ox, oy in placed:
+                if abs(ox - x) < tile_size - quiet and abs(oy - y) < tile_size - quiet:
+                    centers.pop(other_id, None)
+            placed.append((marker_id, x, y))
+        frames.append(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+        truth.append(centers)
+    return frames, truth
+
+
+def write_video(path: str, frames: List[Any], fps: float = 30.0):
+    """ Schreibt Frames als Videodatei (MJPG), um den Datei-/Kamerapfad zu testen. """
+    cv2 = _require_cv2()
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+    try:
+        for frame in frames:
+            writer.write(frame)
+    finally:
+        writer.release()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ArUco-Marker aus Kamera oder Videodatei ausgeben")
+    ap.add_argument("--source", default="0", help="Kamera-Index oder Videodatei")
+    ap.add_argument("--scale", type=float, default=DEFAULT_SCALE)
+    ap.add_argument("--dictionary", default=DEFAULT_DICTIONARY)
+    args = ap.parse_args()
+    source: FrameSource = int(args.source) if args.source.isdigit() else args.source
+    pipeline = ArucoPipeline.open(source, scale=args.scale, dictionary=args.dictionary)
+    last = None
+    try:
+        while not (pipeline.grabber.finished.is_set() and pipeline.latest() is last):
+            detection = pipeline.latest()
+            if detection is not None and detection is not last:
+                last = detection
+                ids = ", ".join(f"{m.id}@({m.center[0]:.3f},{m.center[1]:.3f})"
+                                for m in detection.markers) or "-"
+                print(f"Frame {detection.frame_index:>6} {detection.latency * 1000:6.1f} ms  {ids}")
+            time.sleep(0.01)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pipeline.stop()
+    if pipeline.error is not None:
+        raise pipeline.error
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+# behavior_analytics.py  (Reaktionszeiten und Verhalten je Versuchsperson aus der Event-DB, mit NumPy)
+#
+# Liest aus einer oder mehreren Event-DBs (logs/events.sqlite3, Studien-DB von log_merge)
+# je Aktion nur die benötigten Spalten per SQL und rechnet alles Weitere spaltenweise:
+# Runden werden über (Lauf, round_idx) zusammengeführt, Kennzahlen per np.bincount bzw.
+# sortierten Gruppen (Median) gebildet – keine Python-Schleife über Events oder Runden.
+# Ein Lauf ist eine Engine (ein Block): app_kivy2 loggt alle Blöcke unter derselben
+# session_id, jede Engine beginnt wieder bei round_idx 0. Läufe beginnen wie in event_replay
+# nach phase_change → FINISHED oder mit einem erneuten start_click, zusätzlich mit
+# session_config; Block, Bedingung und Payout gelten je Lauf.
+# Versuchsperson = (Session, VP1/VP2), ausgewiesen je Block und Payout; wer in einer Runde
+# P1 ist, steht in role_vp der reveal_card-Events (sonst Rollentausch: gerade Runden P1 = VP1).
+#   Signal-Latenz   phase_change → SIGNAL_WAIT bis signal (P1)
+#   Call-Latenz     phase_change → CALL_WAIT bis call (P2)
+#   Bluff-Rate      Anteil p1_truth = 0 je Handkategorie der Signalgeberin (hand_batch)
+#   Urteil korrekt  call "bluff" genau dann, wenn P1 geblufft hat
+#   Gewinnrate      gewonnene / gespielte Runden, zusammengefasst je Block und Payout
+# Block, Bedingung und Payout stammen aus dem session_config-Event der Engine; ältere Logs
+# ohne dieses Event: Payout = Punkte im call-Payload, Block 0 (unbekannt). Runden mit
+# session_resumed (Fortsetzung nach Absturz, anderer Prozess) haben keine Latenzen.
+# Ausgewertet wird das Engine-Vokabular (game_engine_w/_wl); Tabletop-Events
+# (signal_choice, showdown …) bleiben außen vor.
+#     python behavior_analytics.py report logs/events.sqlite3
+#     python behavior_analytics.py report study.sqlite3 --csv auswertung.csv
+#     python behavior_analytics.py conditions study.sqlite3
+from __future__ import annotations
+from dataclasses import dataclass, fields
+from typing import Dict, List, Sequence, Tuple
+import argparse
+import csv
+import sqlite3
+
+import numpy as np
+
+import hand_batch
+
+CATEGORY_LABELS = hand_batch.SIGNAL_LEVELS + (hand_batch.FORCED_BLUFF_LABEL,)
+CONFIG_ACTION = "session_config"   # == event_replay.CONFIG_ACTION
+ROWID_BITS = 40                    # Schlüssel (Session << 40) | Position für die Laufgrenzen
+CAT_UNKNOWN = -2               # Karten der Signalgeberin nicht (vollständig) geloggt
+VP_LABELS = ("VP1", "VP2")
+
+# Typspalte aus event_log.TYPED_COLUMNS bzw. Ersatz aus dem Payload (Schema < 2)
+_TYPED_FALLBACK = {
+    "signal": "json_extract(payload, '$.level')",
+    "call": "json_extract(payload, '$.call')",
+    "winner": "json_extract(payload, '$.winner')",
+    "p1_truth": "json_extract(payload, '$.p1_truth')",
+    "score_vp1": "json_extract(payload, '$.scores.VP1')",
+    "card_idx": "json_extract(payload, '$.card_idx')",
+    "card_value": "json_extract(payload, '$.value')",
+}
+
+
+@dataclass
+class Rounds:
+    """ Eine Zeile je Runde mit call-Event; Codes statt Strings, NaN = nicht messbar. """
+    sessions: np.ndarray       # Session-IDs (Index = Code in `session`)
+    session: np.ndarray        # int32
+    run: np.ndarray            # int32: Lauf (Engine/Block) innerhalb aller Sessions
+    round_idx: np.ndarray      # int32, je Lauf ab 0
+    signaler: np.ndarray       # int8: 0 = VP1, 1 = VP2 (Rolle P1 in dieser Runde)
+    category: np.ndarray       # int8: hand_batch-Code der Hand von P1, CAT_UNKNOWN
+    bluff: np.ndarray          # int8: 1 = p1_truth falsch, 0 = ehrlich, −1 unbekannt
+    call_bluff: np.ndarray     # int8: 1 = P2 rief bluff, 0 = wahrheit, −1 unbekannt
+    winner: np.ndarray         # int8: 0/1 = VP1/VP2, −1 = unentschieden/unbekannt
+    signal_ms: np.ndarray      # float64
+    call_ms: np.ndarray        # float64
+    block: np.ndarray          # int16 des Laufs (0 = unbekannt)
+    payout: np.ndarray         # bool des Laufs
+    condition: np.ndarray      # str des Laufs
+
+    def __len__(self) -> int:
+        return len(self.session)
+
+    @property
+    def judge(self) -> np.ndarray:
+        return 1 - self.signaler
+
+    @property
+    def correct(self) -> np.ndarray:
+        """ int8: 1 = Urteil von P2 richtig, 0 = falsch, −1 unbekannt. """
+        known = (self.bluff >= 0) & (self.call_bluff >= 0)
+        return np.where(known, (self.bluff == self.call_bluff).astype(np.int8), -1).astype(np.int8)
+
+
+@dataclass
+class ParticipantMetrics:
+    """ Eine Zeile je Versuchsperson und Bedingung (Session × VP × Block × Payout); NaN ohne Daten. """
+    session_id: np.ndarray
+    vp: np.ndarray
+    block: np.ndarray
+    payout: np.ndarray
+    condition: np.ndarray
+    rounds: np.ndarray
+    signal_rounds: np.ndarray
+    signal_ms_median: np.ndarray
+    signal_ms_mean: np.ndarray
+    call_rounds: np.ndarray
+    call_ms_median: np.ndarray
+    call_ms_mean: np.ndarray
+    bluff_rate: np.ndarray
+    bluff_rate_by_category: np.ndarray    # Form (n, 4): Spalten wie CATEGORY_LABELS
+    judge_accuracy: np.ndarray
+    win_rate: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.session_id)
+
+    def header(self) -> List[str]:
+        names = [f.name for f in fields(self) if f.name != "bluff_rate_by_category"]
+        at = names.index("bluff_rate") + 1
+        return names[:at] + [f"bluff_rate_{label}" for label in CATEGORY_LABELS] + names[at:]
+
+    def columns(self) -> List[np.ndarray]:
+        cols = [getattr(self, f.name) for f in fields(self) if f.name != "bluff_rate_by_category"]
+        at = [f.name for f in fields(self)].index("bluff_rate") + 1
+        return cols[:at] + list(self.bluff_rate_by_category.T) + cols[at:]
+
+
+@dataclass
+class ConditionSummary:
+    """ Eine Zeile je (Block, Payout). """
+    block: np.ndarray
+    payout: np.ndarray
+    sessions: np.ndarray
+    runs: np.ndarray
+    rounds: np.ndarray
+    signaler_win_rate: np.ndarray
+    bluff_rate: np.ndarray
+    judge_accuracy: np.ndarray
+    signal_ms_median: np.ndarray
+    call_ms_median: np.ndarray
+
+
+# -------------- Gruppierte Kennzahlen (bincount / sortierte Gruppen) --------------
+
+def group_count(groups: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(groups, minlength=n_groups)
+
+
+def group_mean(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """ Mittelwert je Gruppe; NaN-Werte zählen nicht, leere Gruppen → NaN. """
+    values = np.asarray(values, dtype=np.float64)
+    ok = ~np.isnan(values)
+    counts = np.bincount(groups[ok], minlength=n_groups)
+    sums = np.bincount(groups[ok], weights=values[ok], minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def group_rate(groups: np.ndarray, flags: np.ndarray, n_groups: int) -> np.ndarray:
+    """ Anteil flags == 1 je Gruppe; −1 = unbekannt zählt nicht. """
+    return group_mean(groups, np.where(flags >= 0, flags, np.nan), n_groups)
+
+
+def group_quantile(groups: np.ndarray, values: np.ndarray, n_groups: int, q: float) -> np.ndarray:
+    """ Quantil je Gruppe (linear interpoliert wie np.quantile), NaN ignoriert. """
+    values = np.asarray(values, dtype=np.float64)
+    ok = ~np.isnan(values)
+    groups, values = groups[ok], values[ok]
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    has = counts > 0
+    pos = starts[has] + (counts[has] - 1) * q
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, starts[has] + counts[has] - 1)
+    frac = pos - lo
+    out = np.full(n_groups, np.nan)
+    out[has] = values[lo] * (1.0 - frac) + values[hi] * frac
+    return out
+
+
+def _last(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Eindeutige Schlüssel und Index ihres letzten Vorkommens (späteres Event gewinnt). """
+    uniq, idx = np.unique(keys[::-1], return_index=True)
+    return uniq, len(keys) - 1 - idx
+
+
+# -------------- Laden --------------
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def _fetch(conn: sqlite3.Connection, sql: str, dtypes: Sequence) -> List[np.ndarray]:
+    rows = conn.execute(sql).fetchall()
+    if not rows:
+        return [np.empty(0, dtype=dtype) for dtype in dtypes]
+    return [np.array(col, dtype=dtype) for col, dtype in zip(zip(*rows), dtypes)]
+
+
+def _columns(conn: sqlite3.Connection) -> Dict[str, str]:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    return {name: name if name in existing else expr for name, expr in _TYPED_FALLBACK.items()}
+
+
+def _run_starts(ids: np.ndarray, tables: Dict[str, List[np.ndarray]],
+                bounds: List[np.ndarray]):
+    """
+    Ersetzt in jeder Tabelle die rowid-Spalte (Index 1) durch t_mono_ns des letzten
+    Laufbeginns derselben Session bei bzw. vor dem Event (0 = erster Lauf). Laufbeginn:
+    session_config und ein start_click nach bereits gespielten Events (das Event selbst
+    gehört zum neuen Lauf) sowie das Event nach phase_change → FINISHED.
+    """
+    b_sess, b_rowid, b_t, b_finished = bounds
+    b_key = (np.searchsorted(ids, b_sess).astype(np.int64) << ROWID_BITS) | (b_rowid * 2 + b_finished)
+    order = np.argsort(b_key, kind="stable")
+    b_key, b_t = b_key[order], b_t[order]
+    for cols in tables.values():
+        sess = np.searchsorted(ids, cols[0]).astype(np.int64)
+        if not len(b_key):
+            cols[1] = np.zeros(len(sess), dtype=np.int64)
+            continue
+        at = np.searchsorted(b_key, (sess << ROWID_BITS) | (cols[1] * 2), side="right") - 1
+        same = (at >= 0) & ((b_key[np.maximum(at, 0)] >> ROWID_BITS) == sess)
+        cols[1] = np.where(same, b_t[np.maximum(at, 0)], 0)
+
+
+def _restarts(ids: np.ndarray, tables: Dict[str, List[np.ndarray]], bounds: List[np.ndarray],
+              clicks: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    start_click-Events, die wie in event_replay einen Neustart derselben session_id
+    markieren: das vorige geladene Event der Session ist kein start_click, es wurde also
+    schon gespielt (abgebrochene Läufe ohne geladene Events ändern nichts an den Runden).
+    """
+    sess = np.concatenate([cols[0] for cols in tables.values()] + [bounds[0], clicks[0]])
+    rowid = np.concatenate([cols[1] for cols in tables.values()] + [bounds[1], clicks[1]])
+    is_click = np.zeros(len(sess), dtype=bool)
+    is_click[len(sess) - len(clicks[0]):] = True
+    key = (np.searchsorted(ids, sess).astype(np.int64) << ROWID_BITS) | rowid
+    order = np.argsort(key, kind="stable")
+    key, is_click = key[order], is_click[order]
+    prev_same = np.r_[False, (key[1:] >> ROWID_BITS) == (key[:-1] >> ROWID_BITS)]
+    restart = is_click & prev_same & ~np.r_[False, is_click[:-1]]
+    picked = order[restart] - (len(sess) - len(clicks[0]))
+    return [col[picked] for col in clicks]
+
+
+def _read_db(db_path: str) -> Dict[str, List[np.ndarray]]:
+    """ Tabellen je Aktion; Spalte 0 = session_id, Spalte 1 = Laufbeginn (siehe _run_starts). """
+    conn = _connect(db_path)
+    try:
+        c = _columns(conn)
+        tables = {
+            "starts": _fetch(conn, "SELECT session_id, rowid, round_idx, phase = 'CALL_WAIT', t_mono_ns "
+                                   "FROM events WHERE action = 'phase_change' "
+                                   "AND phase IN ('SIGNAL_WAIT', 'CALL_WAIT') ORDER BY rowid",
+                             (str, np.int64, np.int64, np.int8, np.int64)),
+            "signals": _fetch(conn, "SELECT session_id, rowid, round_idx, t_mono_ns FROM events "
+                                    "WHERE action = 'signal' ORDER BY rowid", (str, np.int64, np.int64, np.int64)),
+            "calls": _fetch(conn, f"SELECT session_id, rowid, round_idx, t_mono_ns, "
+                                  f"COALESCE({c['call']} = 'bluff', -1), COALESCE(1 - {c['p1_truth']}, -1), "
+                                  f"COALESCE({c['winner']}, ''), {c['score_vp1']} IS NOT NULL FROM events "
+                                  f"WHERE action = 'call' ORDER BY rowid",
+                            (str, np.int64, np.int64, np.int64, np.int8, np.int8, str, bool)),
+            "cards": _fetch(conn, f"SELECT session_id, rowid, round_idx, {c['card_idx']}, {c['card_value']}, "
+                                  f"COALESCE(json_extract(payload, '$.role_vp'), '') = 'VP2' FROM events "
+                                  f"WHERE action = 'reveal_card' AND actor = 'P1' "
+                                  f"AND {c['card_idx']} IN (0, 1) ORDER BY rowid",
+                            (str, np.int64, np.int64, np.int64, np.int64, bool)),
+            "resumed": _fetch(conn, "SELECT session_id, rowid, round_idx FROM events "
+                                    "WHERE action = 'session_resumed'", (str, np.int64, np.int64)),
+            "configs": _fetch(conn, "SELECT session_id, rowid, COALESCE(json_extract(payload, '$.block'), 0), "
+                                    "COALESCE(json_extract(payload, '$.payout'), 0), "
+                                    "COALESCE(json_extract(payload, '$.condition'), '') FROM events "
+                                    "WHERE action = 'session_config' ORDER BY rowid",
+                              (str, np.int64, np.int64, bool, str)),
+        }
+        bounds = _fetch(conn, f"SELECT session_id, rowid, t_mono_ns, action = 'phase_change' FROM events "
+                              f"WHERE action = '{CONFIG_ACTION}' "
+                              f"OR (action = 'phase_change' AND phase = 'FINISHED')",
+                        (str, np.int64, np.int64, np.int64))
+        clicks = _fetch(conn, "SELECT session_id, rowid, t_mono_ns, 0 FROM events "
+                              "WHERE action = 'start_click' AND phase = 'WAITING_START'",
+                        (str, np.int64, np.int64, np.int64))
+    finally:
+        conn.close()
+    ids = np.unique(np.concatenate([cols[0] for cols in tables.values()] + [bounds[0], clicks[0]]))
+    bounds = [np.concatenate(cols) for cols in zip(bounds, _restarts(ids, tables, bounds, clicks))]
+    _run_starts(ids, tables, bounds)
+    return tables
+
+
+def load_rounds(db_paths: Sequence[str]) -> Rounds:
+    """
+    Runden aller Engine-Läufe der DBs. Ein Lauf = eine Engine (ein Block); mehrere Blöcke
+    unter derselben session_id (app_kivy2) sind getrennte Läufe, jeder mit eigenem
+    round_idx ab 0 und eigener Konfiguration. Derselbe Lauf in zwei DBs zählt einmal.
+    """
+    parts = [_read_db(path) for path in db_paths]
+    data = {name: [np.concatenate(cols) for cols in zip(*(p[name] for p in parts))]
+            for name in parts[0]}
+    sessions, codes = np.unique(np.concatenate([data[name][0] for name in data]), return_inverse=True)
+    pairs = np.stack([codes.ravel(), np.concatenate([data[name][1] for name in data])])
+    runs, run_codes = np.unique(pairs, axis=1, return_inverse=True)
+    run_codes = run_codes.ravel()
+    run_session = runs[0].astype(np.int32)
+    bounds = np.cumsum([0] + [len(data[name][0]) for name in data])
+    for i, name in enumerate(data):
+        data[name] = [run_codes[bounds[i]:bounds[i + 1]]] + data[name][2:]
+    stride = int(max((data[name][1].max(initial=-1) for name in data if name != "configs"), default=-1)) + 2
+
+    def keys(name):
+        return data[name][0].astype(np.int64) * stride + data[name][1]
+
+    # Runden = letzte call-Events je (Lauf, Runde)
+    call_keys, at = _last(keys("calls"))
+    _, _, t_call, call_bluff, bluff, winner_role, scored = (col[at] for col in data["calls"])
+    run = (call_keys // stride).astype(np.int32)
+    round_idx = (call_keys % stride).astype(np.int32)
+
+    def lookup(k, values, fill):
+        """ values[k] für Runden-Schlüssel aus k (letztes Vorkommen), sonst fill. """
+        uniq, idx = _last(k)
+        pos = np.clip(np.searchsorted(uniq, call_keys), 0, max(len(uniq) - 1, 0))
+        found = (uniq[pos] == call_keys) if len(uniq) else np.zeros(len(call_keys), dtype=bool)
+        out = np.full(len(call_keys), fill, dtype=np.asarray(values).dtype if len(values) else type(fill))
+        out[found] = values[idx[pos[found]]]
+        return out, found
+
+    # Latenzen: Beginn der Eingabephase bis Entscheidung, ohne Runden nach einer Fortsetzung
+    s_run, s_round, is_call, t_start = data["starts"]
+    start_keys = s_run.astype(np.int64) * stride + s_round
+    t_sig_start, _ = lookup(start_keys[is_call == 0], t_start[is_call == 0], -1)
+    t_call_start, _ = lookup(start_keys[is_call == 1], t_start[is_call == 1], -1)
+    t_signal, _ = lookup(keys("signals"), data["signals"][2], -1)
+    _, resumed = lookup(keys("resumed"), np.ones(len(data["resumed"][0]), dtype=bool), False)
+    signal_ms = np.where((t_sig_start >= 0) & (t_signal >= t_sig_start) & ~resumed,
+                         (t_signal - t_sig_start) / 1e6, np.nan)
+    call_ms = np.where((t_call_start >= 0) & (t_call >= t_call_start) & ~resumed,
+                       (t_call - t_call_start) / 1e6, np.nan)
+
+    # Hand von P1: beide Karten aufgedeckt → Summe → Kategorie; role_vp bestimmt die VP
+    c_run, c_round, c_idx, c_value, c_vp2 = data["cards"]
+    card_keys, at = _last((c_run.astype(np.int64) * stride + c_round) * 2 + c_idx)
+    hand_keys = card_keys // 2
+    first = np.r_[True, hand_keys[1:] != hand_keys[:-1]] if len(hand_keys) else np.empty(0, dtype=bool)
+    uniq_hands = hand_keys[first]
+    n_cards = np.diff(np.r_[np.flatnonzero(first), len(hand_keys)])
+    totals = np.add.reduceat(c_value[at], np.flatnonzero(first)) if len(hand_keys) else np.empty(0, np.int64)
+    hand_cat = np.where(n_cards == 2, hand_batch.hand_category_codes(totals), CAT_UNKNOWN).astype(np.int8)
+    hand_vp2 = c_vp2[at][first]
+    category, _ = lookup(uniq_hands, hand_cat, np.int8(CAT_UNKNOWN))
+    signaler_vp2, has_cards = lookup(uniq_hands, hand_vp2, False)
+    signaler = np.where(has_cards, signaler_vp2, round_idx % 2 == 1).astype(np.int8)
+
+    winner = np.select([winner_role == "P1", winner_role == "P2"], [signaler, 1 - signaler], -1).astype(np.int8)
+
+    # Bedingungen je Lauf: session_config, sonst Punkte im call-Payload
+    n_runs = runs.shape[1]
+    block = np.zeros(n_runs, dtype=np.int16)
+    payout = np.bincount(run[scored], minlength=n_runs) > 0
+    condition = np.full(n_runs, "", dtype=object)
+    cfg_run, at = _last(data["configs"][0])
+    block[cfg_run] = data["configs"][1][at]
+    payout[cfg_run] = data["configs"][2][at]
+    condition[cfg_run] = data["configs"][3][at]
+
+    return Rounds(sessions, run_session[run], run, round_idx, signaler, category.astype(np.int8), bluff,
+                  call_bluff, winner, signal_ms, call_ms, block[run], payout[run], condition[run].astype(str))
+
+
+# -------------- Kennzahlen --------------
+
+def _category_column(category: np.ndarray) -> np.ndarray:
+    """ hand_batch-Code → Spalte in CATEGORY_LABELS (erzwungener Bluff zuletzt). """
+    return np.where(category == hand_batch.CAT_FORCED_BLUFF, len(CATEGORY_LABELS) - 1, category)
+
+
+def _distinct(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """ Anzahl verschiedener values je Gruppe. """
+    pairs = np.unique(np.stack([groups, values]), axis=1)
+    return np.bincount(pairs[0], minlength=n_groups)
+
+
+def participant_metrics(rounds: Rounds) -> ParticipantMetrics:
+    """ Eine Zeile je Versuchsperson und Bedingung: (Session, VP, Block, Payout). """
+    n_rounds = len(rounds)
+    roles = np.concatenate([rounds.signaler, rounds.judge])
+    keys = np.stack([np.tile(rounds.session, 2), roles, np.tile(rounds.block, 2), np.tile(rounds.payout, 2)])
+    groups, first, played = np.unique(keys, axis=1, return_index=True, return_inverse=True)
+    played = played.ravel()
+    as_signaler, as_judge = played[:n_rounds], played[n_rounds:]
+    n = groups.shape[1]
+
+    known = rounds.category != CAT_UNKNOWN
+    n_cat = len(CATEGORY_LABELS)
+    by_cat = group_rate(as_signaler[known] * n_cat + _category_column(rounds.category[known]),
+                        rounds.bluff[known], n * n_cat).reshape(n, n_cat)
+    won = np.concatenate([rounds.winner == rounds.signaler, rounds.winner == rounds.judge]).astype(np.int8)
+    return ParticipantMetrics(
+        session_id=rounds.sessions[groups[0]],
+        vp=np.array(VP_LABELS)[groups[1]],
+        block=groups[2].astype(np.int16),
+        payout=groups[3].astype(bool),
+        condition=np.tile(rounds.condition, 2)[first],
+        rounds=group_count(played, n),
+        signal_rounds=group_count(as_signaler, n),
+        signal_ms_median=group_quantile(as_signaler, rounds.signal_ms, n, 0.5),
+        signal_ms_mean=group_mean(as_signaler, rounds.signal_ms, n),
+        call_rounds=group_count(as_judge, n),
+        call_ms_median=group_quantile(as_judge, rounds.call_ms, n, 0.5),
+        call_ms_mean=group_mean(as_judge, rounds.call_ms, n),
+        bluff_rate=group_rate(as_signaler, rounds.bluff, n),
+        bluff_rate_by_category=by_cat,
+        judge_accuracy=group_rate(as_judge, rounds.correct, n),
+        win_rate=group_mean(played, won, n),
+    )
+
+
+def condition_summary(rounds: Rounds) -> ConditionSummary:
+    conditions, groups = np.unique(np.stack([rounds.block, rounds.payout]), axis=1, return_inverse=True)
+    groups = groups.ravel()
+    n = conditions.shape[1]
+    return ConditionSummary(
+        block=conditions[0].astype(np.int16),
+        payout=conditions[1].astype(bool),
+        sessions=_distinct(groups, rounds.session, n),
+        runs=_distinct(groups, rounds.run, n),
+        rounds=group_count(groups, n),
+        signaler_win_rate=group_rate(groups, np.where(rounds.winner >= 0,
+                                                      rounds.winner == rounds.signaler, -1), n),
+        bluff_rate=group_rate(groups, rounds.bluff, n),
+        judge_accuracy=group_rate(groups, rounds.correct, n),
+        signal_ms_median=group_quantile(groups, rounds.signal_ms, n, 0.5),
+        call_ms_median=group_quantile(groups, rounds.call_ms, n, 0.5),
+    )
+
+
+# -------------- Ausgabe --------------
+
+def _fmt(value, width: int, digits: int = 2) -> str:
+    if isinstance(value, (float, np.floating)):
+        return f"{'–':>{width}}" if np.isnan(value) else f"{value:>{width}.{digits}f}"
+    return f"{value!s:>{width}}"
+
+
+def print_participants(metrics: ParticipantMetrics):
+    print(f"{'Session':<14}{'VP':<5}{'Block':>6}{'Payout':>7}{'Runden':>7}{'Sig ms':>9}{'Call ms':>9}"
+          f"{'Bluff':>7}" + "".join(f"{label[:6]:>8}" for label in CATEGORY_LABELS)
+          + f"{'Urteil':>8}{'Gewinn':>8}")
+    for i in range(len(metrics)):
+        print(f"{metrics.session_id[i]:<14}{metrics.vp[i]:<5}{metrics.block[i]:>6}"
+              f"{'ja' if metrics.payout[i] else 'nein':>7}{metrics.rounds[i]:>7}"
+              f"{_fmt(metrics.signal_ms_median[i], 9, 0)}{_fmt(metrics.call_ms_median[i], 9, 0)}"
+              f"{_fmt(metrics.bluff_rate[i], 7)}"
+              + "".join(_fmt(v, 8) for v in metrics.bluff_rate_by_category[i])
+              + f"{_fmt(metrics.judge_accuracy[i], 8)}{_fmt(metrics.win_rate[i], 8)}")
+
+
+def print_conditions(summary: ConditionSummary):
+    print(f"{'Block':>6}{'Payout':>7}{'Sessions':>9}{'Läufe':>7}{'Runden':>8}{'P1 gew.':>9}{'Bluff':>7}"
+          f"{'Urteil':>8}{'Sig ms':>9}{'Call ms':>9}")
+    for i in range(len(summary.block)):
+        print(f"{summary.block[i]:>6}{'ja' if summary.payout[i] else 'nein':>7}{summary.sessions[i]:>9}"
+              f"{summary.runs[i]:>7}{summary.rounds[i]:>8}{_fmt(summary.signaler_win_rate[i], 9)}{_fmt(summary.bluff_rate[i], 7)}"
+              f"{_fmt(summary.judge_accuracy[i], 8)}{_fmt(summary.signal_ms_median[i], 9, 0)}"
+              f"{_fmt(summary.call_ms_median[i], 9, 0)}")
+
+
+def write_csv(metrics: ParticipantMetrics, path: str):
+    """ Eine Zeile je Versuchsperson, leere Zellen statt NaN (für die Tabellenkalkulation). """
+    cols = [np.where(np.isnan(c), "", np.round(c, 4).astype(str)) if c.dtype.kind == "f" else c
+            for c in metrics.columns()]
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(metrics.header())
+        writer.writerows(zip(*(c.tolist() for c in cols)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Reaktionszeiten, Bluff-Raten, Urteile und Gewinne je Versuchsperson")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_report = sub.add_parser("report", help="Kennzahlen je Versuchsperson")
+    p_report.add_argument("db", nargs="+", help="Pfad(e) zu events*.sqlite3 bzw. Studien-DB")
+    p_report.add_argument("--csv", help="zusätzlich als CSV schreiben")
+    p_cond = sub.add_parser("conditions", help="Kennzahlen je Block und Payout")
+    p_cond.add_argument("db", nargs="+")
+    args = ap.parse_args()
+
+    rounds = load_rounds(args.db)
+    print(f"{len(rounds.sessions)} Sessions, {len(np.unique(rounds.run))} Läufe, {len(rounds)} Runden\n")
+    if args.cmd == "conditions":
+        print_conditions(condition_summary(rounds))
+        return
+    metrics = participant_metrics(rounds)
+    print_participants(metrics)
+    if args.csv:
+        write_csv(metrics, args.csv)
+        print(f"\n{len(metrics)} Zeilen → {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# bench_aruco_capture.py  (ArUco-Pipeline: Erkennungslatenz und Frames/s auf synthetischem Video)
+#
+# Benötigt OpenCV mit cv2.aruco. Je Konfiguration zwei Läufe: so schnell wie möglich
+# (Durchsatz in Frames/s) und im Kameratakt --fps (Latenz Einlesen → Ergebnis, verworfene
+# Frames). Trefferquote: Anteil der Frames, in denen alle Marker nahe ihrer wahren
+# Position gefunden wurden. Mit --video wird das Video erst als Datei geschrieben und
+# über den Dateipfad (wie eine aufgezeichnete Kamera) gelesen.
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from aruco_capture import (ArucoPipeline, Detection, FrameGrabber, MarkerDetector,
+                           synthetic_video, write_video)
+
+CONFIGS = [
+    ("voll", dict(scale=1.0, use_roi=False)),
+    ("halb", dict(scale=0.5, use_roi=False)),
+    ("halb+ROI", dict(scale=0.5, use_roi=True)),
+]
+MAX_CENTER_ERROR = 0.02   # normiert, ~25 px bei 1280 px Breite
+
+
+def run(source, detector_options: Dict, pace_fps, truth) -> Dict[str, float]:
+    detections: List[Detection] = []
+    pipeline = ArucoPipeline(FrameGrabber(source, pace_fps=pace_fps),
+                             MarkerDetector(**detector_options), on_detection=detections.append)
+    t0 = time.perf_counter()
+    pipeline.start()
+    pipeline.join()
+    elapsed = time.perf_counter() - t0
+    pipeline.stop()
+    if pipeline.error is not None:
+        raise pipeline.error
+    latencies = sorted(d.latency * 1000.0 for d in detections)
+    hits = 0
+    for detection in detections:
+        expected = truth[detection.frame_index]
+        found = {m.id: m.center for m in detection.markers}
+        if all(marker_id in found
+               and abs(found[marker_id][0] - x) <= MAX_CENTER_ERROR
+               and abs(found[marker_id][1] - y) <= MAX_CENTER_ERROR
+               for marker_id, (x, y) in expected.items()):
+            hits += 1
+    return {
+        "fps": len(detections) / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "dropped": pipeline.dropped,
+        "roi": sum(d.roi for d in detections) / len(detections),
+        "hits": hits / len(detections),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ArUco-Pipeline: Latenz und Frames/s")
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--width", type=int, default=1280)
+    ap.add_argument("--height", type=int, default=720)
+    ap.add_argument("--markers", type=int, default=4)
+    ap.add_argument("--fps", type=float, default=30.0, help="Kameratakt für den Latenz-Lauf")
+    ap.add_argument("--video", action="store_true", help="über eine MJPG-Datei statt aus dem Speicher")
+    args = ap.parse_args()
+
+    frames, truth = synthetic_video(args.frames, (args.width, args.height),
+                                    marker_ids=range(args.markers))
+    print(f"{args.frames} Frames {args.width}x{args.height}, {args.markers} Marker, "
+          f"Kameratakt {args.fps:.0f} fps")
+    print(f"{'Konfiguration':<14}{'max FPS':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+          f"{'verworfen':>11}{'ROI':>7}{'Treffer':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = frames
+        if args.video:
+            source = os.path.join(tmp, "synthetisch.avi")
+            write_video(source, frames, args.fps)
+        for label, options in CONFIGS:
+            fast = run(source, options, None, truth)
+            paced = run(source, options, args.fps, truth)
+            print(f"{label:<14}{fast['fps']:>9.1f}{paced['p50']:>10.2f}{paced['p95']:>10.2f}"
+                  f"{paced['dropped']:>11}{paced['roi']:>7.0%}{paced['hits']:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# bench_behavior_analytics.py  (Kennzahlen je Versuchsperson: Event-Schleife mit json.loads vs. behavior_analytics)
+#
+# Spielt --sessions Sessions über die GameEngine in eine gemeinsame Event-DB – je Session
+# die vier Blöcke wie app_kivy2 (eine Engine je Block, dieselbe session_id, round_idx je
+# Block ab 0, Payout in Block 2 und 4), zufällige Signale und Calls – und rechnet die
+# Kennzahlen einmal wie bisher – alle Events lesen, Payload parsen, je Runde ein dict – und
+# einmal mit behavior_analytics (SQL-Spalten + NumPy). Die Ergebnisse müssen übereinstimmen,
+# und jede geloggte call-Runde muss in der Auswertung landen.
+from __future__ import annotations
+import argparse
+import json
+import pathlib
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+
+import behavior_analytics
+import game_engine_w as ge
+from event_log import Durability, EventLogger
+from session_host import TableLogger
+
+
+# wie app_kivy2.block_sequence
+BLOCKS = (
+    {"block": 1, "csv": "Paare1.csv", "condition": "no_payout", "payout": False},
+    {"block": 2, "csv": "Paare3.csv", "condition": "payout", "payout": True},
+    {"block": 3, "csv": "Paare2.csv", "condition": "no_payout", "payout": False},
+    {"block": 4, "csv": "Paare4.csv", "condition": "payout", "payout": True},
+)
+
+
+def play_block(base: pathlib.Path, log_dir: pathlib.Path, logger: EventLogger, idx: int,
+               block_info: dict, rng: random.Random):
+    cfg = ge.GameEngineConfig(session_id=f"BA{idx:04d}", csv_path=str(base / block_info["csv"]),
+                              log_dir=str(log_dir), session_number=idx, block=block_info["block"],
+                              condition=block_info["condition"], payout=block_info["payout"])
+    eng = ge.GameEngine(cfg, logger=TableLogger(logger))
+    levels = list(ge.SignalLevel)
+    calls = list(ge.Call)
+    try:
+        eng.click_start(ge.Player.P1); eng.click_start(ge.Player.P2)
+        for _ in range(len(eng.schedule.rounds)):
+            eng.click_reveal_card(ge.Player.P1, 0)
+            eng.click_reveal_card(ge.Player.P2, 0)
+            eng.click_reveal_card(ge.Player.P1, 1)
+            eng.click_reveal_card(ge.Player.P2, 1)
+            eng.p1_signal(rng.choice(levels))
+            eng.p2_call(rng.choice(calls), p1_hat_wahrheit_gesagt=None)
+            eng.click_next_round(ge.Player.P1); eng.click_next_round(ge.Player.P2)
+    finally:
+        eng.close()
+
+
+def build_db(base: pathlib.Path, tmp: pathlib.Path, sessions: int, seed: int) -> str:
+    db_path = str(tmp / "events.sqlite3")
+    logger = EventLogger(db_path, durability=Durability.CLOSE)
+    rng = random.Random(seed)
+    try:
+        for idx in range(sessions):
+            for block_info in BLOCKS:
+                play_block(base, tmp, logger, idx, block_info, rng)
+    finally:
+        logger.close()
+    return db_path
+
+
+def scalar_metrics(db_path: str):
+    """ Bisheriger Weg: Events der Reihe nach, Runden als dicts, Kennzahlen je Person und Block. """
+    conn = sqlite3.connect(db_path)
+    rounds = defaultdict(dict)
+    config = {}
+    try:
+        for session_id, round_idx, phase, actor, action, payload, t in conn.execute(
+                "SELECT session_id, round_idx, phase, actor, action, payload, t_mono_ns FROM events ORDER BY rowid"):
+            payload = json.loads(payload)
+            if action == "session_config":
+                config[session_id] = payload     # neuer Block
+                continue
+            cfg = config.get(session_id)
+            if cfg is None:
+                continue     # start_click vor dem ersten session_config
+            r = rounds[session_id, cfg["block"], cfg["payout"], round_idx]
+            if action == "phase_change" and phase in ("SIGNAL_WAIT", "CALL_WAIT"):
+                r[phase] = t
+            elif action == "signal":
+                r["signal"] = t
+            elif action == "reveal_card" and actor == "P1":
+                r["vp"] = payload["role_vp"]
+            elif action == "call":
+                r.update(call_t=t, call=payload["call"], truth=payload["p1_truth"], winner=payload.get("winner"))
+    finally:
+        conn.close()
+    per = defaultdict(lambda: defaultdict(list))
+    for (session_id, block, payout, _), r in rounds.items():
+        if "call" not in r:
+            continue
+        p1 = (session_id, r["vp"], block, payout)
+        p2 = (session_id, "VP2" if r["vp"] == "VP1" else "VP1", block, payout)
+        per[p1]["sig"].append((r["signal"] - r["SIGNAL_WAIT"]) / 1e6)
+        per[p2]["call"].append((r["call_t"] - r["CALL_WAIT"]) / 1e6)
+        per[p1]["bluff"].append(0 if r["truth"] else 1)
+        per[p2]["correct"].append(int((r["call"] == "bluff") == (not r["truth"])))
+        per[p1]["won"].append(int(r["winner"] == "P1"))
+        per[p2]["won"].append(int(r["winner"] == "P2"))
+    return {key: (statistics.median(m["sig"]), statistics.median(m["call"]), statistics.mean(m["bluff"]),
+                  statistics.mean(m["correct"]), statistics.mean(m["won"]))
+            for key, m in per.items()}
+
+
+def vector_metrics(db_path: str):
+    rounds = behavior_analytics.load_rounds([db_path])
+    return rounds, behavior_analytics.participant_metrics(rounds), behavior_analytics.condition_summary(rounds)
+
+
+def timed(label: str, fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - t0
+    print(f"{label:<34}{seconds * 1000:>10.1f} ms")
+    return seconds, result
+
+
+def main():
+    base = pathlib.Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(description="Kennzahlen je Versuchsperson: Schleife vs. NumPy")
+    ap.add_argument("--sessions", type=int, default=50, help="Sessions zu je vier Blöcken")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        db_path = build_db(base, pathlib.Path(tmp), args.sessions, args.seed)
+        conn = sqlite3.connect(db_path)
+        n_events, n_calls = conn.execute(
+            "SELECT COUNT(*), SUM(action = 'call') FROM events").fetchone()
+        conn.close()
+        print(f"{args.sessions} Sessions × {len(BLOCKS)} Blöcke, {n_events} Events "
+              f"({time.perf_counter() - t0:.1f} s gespielt)\n")
+
+        t_loop, expected = timed("Schleife + json.loads", scalar_metrics, db_path)
+        t_vec, (rounds, metrics, summary) = timed("behavior_analytics", vector_metrics, db_path)
+        print(f"{'Faktor':<34}{t_loop / t_vec:>10.1f} x")
+
+        if len(rounds) != n_calls:
+            raise AssertionError(f"{len(rounds)} Runden ausgewertet, {n_calls} call-Events geloggt.")
+        if set(summary.block.tolist()) != {b["block"] for b in BLOCKS} or summary.runs.sum() != args.sessions * len(BLOCKS):
+            raise AssertionError("Blöcke bzw. Läufe falsch zugeordnet.")
+        got = {(s, vp, block, bool(payout)): (a, b, c, d, e) for s, vp, block, payout, a, b, c, d, e in zip(
+            metrics.session_id, metrics.vp, metrics.block.tolist(), metrics.payout, metrics.signal_ms_median,
+            metrics.call_ms_median, metrics.bluff_rate, metrics.judge_accuracy, metrics.win_rate)}
+        if got.keys() != expected.keys() or not all(
+                np.allclose(got[key], expected[key]) for key in expected):
+            raise AssertionError("Kennzahlen von Schleife und behavior_analytics unterscheiden sich.")
+        print(f"\n{len(rounds)} Runden = call-Events, {len(metrics)} Zeilen (Person × Block), Kennzahlen identisch\n")
+        behavior_analytics.print_conditions(summary)
+
+
+if __name__ == "__main__":
+    main()
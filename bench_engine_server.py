@@ -0,0 +1,111 @@
+# bench_engine_server.py  (Round-Trip-Latenz Client → Engine-Server → Client auf localhost)
+#
+# Startet engine_server.py als eigenen Prozess und lässt 1..N Skript-Clients (je ein
+# Prozess, je ein Tisch) vollständige Sessions spielen. Gemessen wird jede Anfrage vom
+# Senden bis zur Antwort; Pushes des Zustands laufen dabei mit.
+from __future__ import annotations
+import argparse
+import multiprocessing
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+import game_engine_w as ge
+from engine_server import EngineClient, RemoteEngine
+
+BASE = pathlib.Path(__file__).resolve().parent
+
+
+def wait_for_server(address: str, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            EngineClient(address).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def play(args) -> List[int]:
+    """ Ein Client: Tisch öffnen, abonnieren, `sessions` Sessions spielen; RTTs in ns. """
+    address, csv_path, log_dir, idx, sessions = args
+    client = EngineClient(address)
+    rtts: List[int] = []
+    pushes = []
+    P = ge.Player
+    levels = list(ge.SignalLevel)
+    calls = list(ge.Call)
+    try:
+        for session in range(sessions):
+            cfg = ge.GameEngineConfig(
+                session_id=f"C{idx:02d}S{session:02d}", csv_path=csv_path,
+                log_dir=log_dir, payout=True,
+            )
+            engine = RemoteEngine(cfg, client)
+            engine.subscribe(pushes.append)
+
+            def timed(fn, *fn_args):
+                t0 = time.perf_counter_ns()
+                fn(*fn_args)
+                rtts.append(time.perf_counter_ns() - t0)
+
+            timed(engine.click_start, P.P1); timed(engine.click_start, P.P2)
+            for i in range(len(engine.schedule.rounds)):
+                for player, card in ((P.P1, 0), (P.P2, 0), (P.P1, 1), (P.P2, 1)):
+                    timed(engine.click_reveal_card, player, card)
+                timed(engine.p1_signal, levels[i % len(levels)])
+                timed(engine.p2_call, calls[i % len(calls)], None)
+                timed(engine.click_next_round, P.P1); timed(engine.click_next_round, P.P2)
+            if engine.current.phase is not ge.Phase.FINISHED:
+                raise RuntimeError(f"Client {idx}: Session nicht beendet ({engine.current.phase.name}).")
+            engine.close()
+    finally:
+        client.close()
+    return rtts
+
+
+def percentile(sorted_values: List[int], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))] / 1000.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Engine-Server: Round-Trip-Latenz mit Skript-Clients")
+    ap.add_argument("--csv", default=str(BASE / "Paare1.csv"))
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    ap.add_argument("--sessions", type=int, default=3, help="Sessions je Client")
+    ap.add_argument("--transport", nargs="+", default=["tcp", "unix"], choices=["tcp", "unix"])
+    args = ap.parse_args()
+
+    print(f"Schedule: {pathlib.Path(args.csv).name}, {args.sessions} Sessions je Client")
+    print(f"{'Transport':<10}{'Clients':>8}{'Anfragen':>10}{'p50 (µs)':>10}{'p90 (µs)':>10}"
+          f"{'p99 (µs)':>10}{'max (µs)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for transport in args.transport:
+            address = f"unix:{tmp}/engine.sock" if transport == "unix" else "127.0.0.1:8799"
+            server = subprocess.Popen(
+                [sys.executable, str(BASE / "engine_server.py"), "--listen", address,
+                 "--db", os.path.join(tmp, f"events_{transport}.sqlite3")],
+                stdout=subprocess.DEVNULL,
+            )
+            try:
+                wait_for_server(address)
+                for n_clients in args.clients:
+                    jobs = [(address, args.csv, tmp, idx, args.sessions) for idx in range(n_clients)]
+                    with multiprocessing.Pool(n_clients) as pool:
+                        rtts = sorted(rtt for result in pool.map(play, jobs) for rtt in result)
+                    print(f"{transport:<10}{n_clients:>8}{len(rtts):>10}"
+                          f"{percentile(rtts, 0.5):>10.0f}{percentile(rtts, 0.9):>10.0f}"
+                          f"{percentile(rtts, 0.99):>10.0f}{rtts[-1] / 1000.0:>10.0f}")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
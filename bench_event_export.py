@@ -0,0 +1,117 @@
+# bench_event_export.py  (Studie laden: events.csv neu parsen vs. Spaltenexport per mmap)
+#
+# Baut mit bench_event_schema eine synthetische Event-DB (--events Events), schreibt daraus
+# events.csv wie event_log, exportiert spaltenweise (event_export, npy bzw. Parquet) und
+# vergleicht die Ladezeit einer ganzen Studie: CSV lesen + Payload parsen gegen
+# event_export.load samt Zugriff auf die Spalten einer typischen Auswertung. Danach kommen
+# weitere Sessions dazu; der zweite Export darf nur diese übernehmen, ein dritter nichts.
+from __future__ import annotations
+import argparse
+import csv
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+
+import bench_event_schema
+import event_export
+import event_log
+
+
+def write_events_csv(db_path: str, csv_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT {', '.join(event_log.EVENT_COLUMNS)} FROM events ORDER BY rowid")
+        with open(csv_path, "w", encoding="utf-8", newline="") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(event_log.EVENT_COLUMNS)
+            writer.writerows(rows)
+    finally:
+        conn.close()
+    return os.path.getsize(csv_path)
+
+
+def load_csv(csv_path: str):
+    """ Wie in den Auswertungsskripten: alle Zeilen lesen, Payload parsen. """
+    with open(csv_path, encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp)
+        next(reader)
+        rows = [(*row[:5], json.loads(row[5]), *row[6:]) for row in reader]
+    calls = sum(1 for row in rows if row[4] == "call" and row[5].get("call") == "bluff")
+    return len(rows), calls
+
+
+def load_columnar(out_dir: str):
+    study = event_export.load(out_dir)
+    calls = int(np.count_nonzero(
+        (study.column("action") == study.code("action", "call"))
+        & (study.column("call") == study.code("call", "bluff"))
+    ))
+    return len(study), calls
+
+
+def append_sessions(db_path: str, sessions: int, first: int, seed: int):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    try:
+        for s in range(first, first + sessions):
+            conn.executemany("INSERT INTO events(session_id, round_idx, phase, actor, action, payload, "
+                             "t_mono_ns, t_utc_iso) VALUES (?,?,?,?,?,?,?,?)",
+                             bench_event_schema.session_rows(f"S{s:05d}", rng))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def timed(label: str, fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - t0
+    print(f"{label:<34}{seconds * 1000:>10.1f} ms")
+    return seconds, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="events.csv parsen vs. Spaltenexport laden")
+    ap.add_argument("--events", type=int, default=1_000_000)
+    ap.add_argument("--more-sessions", type=int, default=20, help="Sessions für den inkrementellen Export")
+    ap.add_argument("--format", choices=("auto", "npy", "parquet"), default="auto")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "events.sqlite3")
+        sessions = bench_event_schema.build_legacy_db(db, args.events, args.seed)
+        event_log.migrate(db)
+        csv_size = write_events_csv(db, os.path.join(tmp, "events.csv"))
+        out = os.path.join(tmp, "columnar")
+        print(f"{sessions} Sessions, events.csv {csv_size / 2**20:.0f} MB\n")
+
+        _, first = timed("Export (alle Sessions)", event_export.export, [db], out, args.format)
+        t_csv, from_csv = timed("events.csv laden + Payload parsen", load_csv, os.path.join(tmp, "events.csv"))
+        t_col, from_col = timed("event_export.load + Spalten", load_columnar, out)
+        if from_csv != from_col:
+            raise AssertionError(f"Ergebnisse unterscheiden sich: CSV {from_csv}, Export {from_col}")
+        print(f"{'Faktor Laden':<34}{t_csv / t_col:>10.0f} x")
+
+        append_sessions(db, args.more_sessions, sessions, args.seed + 1)
+        _, second = timed(f"Export (+{args.more_sessions} Sessions)", event_export.export, [db], out, args.format)
+        _, third = timed("Export (nichts Neues)", event_export.export, [db], out, args.format)
+        if second.new_sessions != args.more_sessions or second.continued_sessions or third.part is not None:
+            raise AssertionError("Inkrementeller Export hat falsche Sessions übernommen.")
+        study = event_export.load(out)
+        print(f"\n{first.part} + {second.part}: {len(study)} Events, {len(study.sessions)} Sessions, "
+              f"{_dir_size(out) / 2**20:.0f} MB")
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+if __name__ == "__main__":
+    main()
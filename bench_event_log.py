@@ -0,0 +1,101 @@
+# bench_event_log.py  (Events/Sekunde und Verlustfenster je Durability-Stufe)
+from __future__ import annotations
+import argparse
+import pathlib
+import tempfile
+import time
+
+import game_engine_w as ge
+from event_log import Durability
+
+
+class LossWindow:
+    """
+    Misst nach jedem log(), wie viele Events (und wie lange) noch nicht committet sind –
+    also was bei einem Absturz in diesem Moment verloren ginge.
+    """
+    def __init__(self, logger):
+        self.logger = logger
+        self.max_events = 0
+        self.max_seconds = 0.0
+        self._oldest_open: dict = {}
+        self._log = logger.log
+        logger.log = self.log
+
+    def log(self, *args, **kwargs):
+        data = self._log(*args, **kwargs)
+        now = time.perf_counter()
+        self._oldest_open[data["seq"]] = now
+        written = self.logger.written_seq
+        for seq in [s for s in self._oldest_open if s <= written]:
+            del self._oldest_open[seq]
+        if self._oldest_open:
+            self.max_events = max(self.max_events, len(self._oldest_open))
+            self.max_seconds = max(self.max_seconds, now - min(self._oldest_open.values()))
+        return data
+
+
+def play_session(csv_path: pathlib.Path, log_dir: pathlib.Path, durability: Durability,
+                 log_async: bool, session_idx: int) -> LossWindow:
+    cfg = ge.GameEngineConfig(
+        session_id=f"BENCH{session_idx:03d}",
+        csv_path=str(csv_path),
+        db_path=str(log_dir / "events_bench.sqlite3"),
+        csv_log_path=str(log_dir / "events_bench.csv"),
+        log_dir=str(log_dir),
+        payout=True,
+        log_async=log_async,
+        durability=durability.value,
+    )
+    eng = ge.GameEngine(cfg)
+    window = LossWindow(eng.logger)
+    levels = list(ge.SignalLevel)
+    calls = list(ge.Call)
+    try:
+        eng.click_start(ge.Player.P1); eng.click_start(ge.Player.P2)
+        for i in range(len(eng.schedule.rounds)):
+            eng.click_reveal_card(ge.Player.P1, 0)
+            eng.click_reveal_card(ge.Player.P2, 0)
+            eng.click_reveal_card(ge.Player.P1, 1)
+            eng.click_reveal_card(ge.Player.P2, 1)
+            eng.p1_signal(levels[i % len(levels)])
+            eng.p2_call(calls[i % len(calls)], p1_hat_wahrheit_gesagt=None)
+            eng.click_next_round(ge.Player.P1); eng.click_next_round(ge.Player.P2)
+    finally:
+        eng.close()
+    return window
+
+
+def bench(csv_path: pathlib.Path, durability: Durability, log_async: bool, sessions: int):
+    """ Rückgabe: (Events/s, max. offene Events, max. offenes Zeitfenster in ms). """
+    max_events, max_seconds, n_events = 0, 0.0, 0
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for idx in range(sessions):
+            window = play_session(csv_path, pathlib.Path(tmp), durability, log_async, idx)
+            max_events = max(max_events, window.max_events)
+            max_seconds = max(max_seconds, window.max_seconds)
+            n_events += window.logger.written_seq
+        elapsed = time.perf_counter() - t0
+    return n_events / elapsed, max_events, max_seconds * 1000.0
+
+
+def main():
+    base = pathlib.Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(description="EventLogger: Durability-Stufen im Vergleich")
+    ap.add_argument("--csv", default=str(base / "Paare1.csv"))
+    ap.add_argument("--sessions", type=int, default=5)
+    args = ap.parse_args()
+    csv_path = pathlib.Path(args.csv)
+
+    print(f"Schedule: {csv_path.name}, {args.sessions} Sessions je Stufe")
+    print(f"{'Durability':<12}{'Modus':<8}{'Events/s':>12}{'Verlust (Events)':>18}{'Verlust (ms)':>14}")
+    for durability in Durability:
+        for log_async in (False, True):
+            rate, lost_events, lost_ms = bench(csv_path, durability, log_async, args.sessions)
+            mode = "async" if log_async else "sync"
+            print(f"{durability.value:<12}{mode:<8}{rate:>12,.0f}{lost_events:>18}{lost_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# bench_event_schema.py  (Abfragen auf einer synthetischen Event-DB: JSON-Payload vs. Typspalten + Indizes)
+#
+# Erzeugt eine Event-DB im alten Schema (nur Payload, keine Indizes) mit --events Events in
+# Sessions zu 64 Runden (Engine-Events plus round_start mit payout wie in den UIs), misst
+# drei typische Auswertungen, migriert eine Kopie an Ort und Stelle (event_log.migrate) und
+# misst dieselben Auswertungen über Typspalten und Indizes. Die Ergebnisse werden verglichen.
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+
+import event_log
+
+ROUNDS = 64
+ROUND_EVENTS = 13     # round_start, 4× reveal_card, signal, call, reveal_and_score, 3× phase_change, 2× next_round_click
+LEGACY_SCHEMA = """
+CREATE TABLE events(
+  session_id TEXT, round_idx INT, phase TEXT, actor TEXT, action TEXT,
+  payload TEXT, t_mono_ns INTEGER, t_utc_iso TEXT
+)"""
+
+
+def session_rows(session_id: str, rng: random.Random):
+    t = 0
+    scores = {"VP1": 0, "VP2": 0}
+    for round_idx in range(ROUNDS):
+        payout = (round_idx // 16) % 2 == 1        # Blöcke 2 und 4 mit Stake
+        cards = [rng.randint(7, 11) for _ in range(4)]
+        level = rng.choice(("hoch", "mittel", "tief"))
+        call = rng.choice(("wahrheit", "bluff"))
+        truth = rng.random() < 0.6
+        winner = rng.choice(("P1", "P2"))
+        scores["VP1" if winner == "P1" else "VP2"] += 1
+
+        def row(phase, actor, action, payload):
+            nonlocal t
+            t += 1
+            return (session_id, round_idx, phase, actor, action,
+                    json.dumps(payload, ensure_ascii=False), t, "2025-01-01T00:00:00+00:00")
+
+        yield row("DEALING", "SYS", "round_start", {"round": round_idx + 1, "payout": payout})
+        for idx, (player, card) in enumerate(zip(("P1", "P2", "P1", "P2"), cards)):
+            yield row("DEALING", player, "reveal_card", {"card_idx": idx // 2, "value": card,
+                                                         "role_vp": "VP1"})
+        yield row("SIGNAL_WAIT", "SYS", "phase_change", {"to": "SIGNAL_WAIT"})
+        yield row("SIGNAL_WAIT", "P1", "signal", {"level": level})
+        yield row("CALL_WAIT", "SYS", "phase_change", {"to": "CALL_WAIT"})
+        yield row("CALL_WAIT", "P2", "call", {"call": call, "p1_truth": truth, "winner": winner,
+                                              "scores": dict(scores)})
+        yield row("REVEAL_SCORE", "SYS", "reveal_and_score", {"winner": winner, "reason": "…",
+                                                              "vp1_cards": cards[:2], "vp2_cards": cards[2:]})
+        yield row("ROUND_DONE", "SYS", "phase_change", {"to": "ROUND_DONE"})
+        yield row("ROUND_DONE", "P1", "next_round_click", {})
+        yield row("ROUND_DONE", "P2", "next_round_click", {})
+
+
+def build_legacy_db(path: str, n_events: int, seed: int) -> int:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute(LEGACY_SCHEMA)
+    sessions = max(1, n_events // (ROUNDS * ROUND_EVENTS))
+    for s in range(sessions):
+        conn.executemany("INSERT INTO events VALUES (?,?,?,?,?,?,?,?)",
+                         session_rows(f"S{s:05d}", rng))
+    conn.commit()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return sessions
+
+
+# --- Auswertungen: jeweils alt (Scan + json.loads) und neu (Typspalten/Indizes)
+
+def round_events_legacy(conn, session_id, round_idx):
+    return conn.execute("SELECT action, payload FROM events WHERE session_id = ? AND round_idx = ? "
+                        "ORDER BY rowid", (session_id, round_idx)).fetchall()
+
+
+def round_events_typed(conn, session_id, round_idx):
+    return round_events_legacy(conn, session_id, round_idx)   # gleiche SQL, jetzt per Index
+
+
+def payout_calls_legacy(conn):
+    """ Alle Calls in Runden mit Stake: (session, runde, call). """
+    payout_rounds = set()
+    calls = []
+    for session_id, round_idx, action, payload in conn.execute(
+            "SELECT session_id, round_idx, action, payload FROM events ORDER BY rowid"):
+        if action == "round_start":
+            if json.loads(payload).get("payout"):
+                payout_rounds.add((session_id, round_idx))
+        elif action == "call":
+            calls.append((session_id, round_idx, json.loads(payload)["call"]))
+    return sorted(c for c in calls if (c[0], c[1]) in payout_rounds)
+
+
+def payout_calls_typed(conn):
+    return sorted(conn.execute(
+        "SELECT c.session_id, c.round_idx, c.call FROM events c "
+        "JOIN events r ON r.session_id = c.session_id AND r.round_idx = c.round_idx "
+        "AND r.action = 'round_start' AND r.payout = 1 "
+        "WHERE c.action = 'call'").fetchall())
+
+
+def bluff_winners_legacy(conn):
+    """ Gewinner je Rolle bei Bluff-Calls. """
+    counts = Counter()
+    for (payload,) in conn.execute("SELECT payload FROM events WHERE action = 'call'"):
+        data = json.loads(payload)
+        if data.get("call") == "bluff":
+            counts[data.get("winner")] += 1
+    return dict(counts)
+
+
+def bluff_winners_typed(conn):
+    return dict(conn.execute("SELECT winner, COUNT(*) FROM events WHERE action = 'call' "
+                             "AND call = 'bluff' GROUP BY winner").fetchall())
+
+
+QUERIES = [
+    ("Runde einer Session", round_events_legacy, round_events_typed, True),
+    ("Calls mit Stake", payout_calls_legacy, payout_calls_typed, False),
+    ("Gewinner bei Bluff", bluff_winners_legacy, bluff_winners_typed, False),
+]
+
+
+def timed(fn, *args, repeats: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Event-Schema: JSON-Scan vs. Typspalten + Indizes")
+    ap.add_argument("--events", type=int, default=1_000_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "legacy.sqlite3")
+        t0 = time.perf_counter()
+        sessions = build_legacy_db(legacy, args.events, args.seed)
+        n_events = sessions * ROUNDS * ROUND_EVENTS
+        print(f"{n_events} Events in {sessions} Sessions erzeugt ({time.perf_counter() - t0:.1f} s), "
+              f"{os.path.getsize(legacy) / 2**20:.0f} MB")
+
+        migrated = os.path.join(tmp, "migrated.sqlite3")
+        shutil.copy(legacy, migrated)
+        t0 = time.perf_counter()
+        before, backfilled = event_log.migrate(migrated)
+        print(f"Migration v{before} → v{event_log.SCHEMA_VERSION}: {backfilled} Zeilen nachgefüllt "
+              f"in {time.perf_counter() - t0:.1f} s, {os.path.getsize(migrated) / 2**20:.0f} MB")
+
+        payload = {"call": "bluff", "p1_truth": True, "winner": "P1", "scores": {"VP1": 3, "VP2": 2}}
+        t0 = time.perf_counter()
+        for _ in range(100_000):
+            event_log.typed_fields(payload)
+        print(f"typed_fields in log(): {(time.perf_counter() - t0) * 10:.2f} µs/Event")
+
+        old_conn = sqlite3.connect(legacy)
+        new_conn = sqlite3.connect(migrated)
+        probe = (f"S{sessions // 2:05d}", ROUNDS // 2)
+        print(f"\n{'Abfrage':<22}{'alt (ms)':>10}{'neu (ms)':>10}{'Faktor':>8}{'Zeilen':>9}")
+        try:
+            for label, old_fn, new_fn, per_round in QUERIES:
+                extra = probe if per_round else ()
+                t_old, r_old = timed(old_fn, old_conn, *extra)
+                t_new, r_new = timed(new_fn, new_conn, *extra)
+                if r_old != r_new:
+                    raise AssertionError(f"{label}: Ergebnisse unterscheiden sich.")
+                print(f"{label:<22}{t_old:>10.1f}{t_new:>10.1f}{t_old / t_new:>7.0f}x{len(r_new):>9}")
+        finally:
+            old_conn.close()
+            new_conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_game_sim.py  (Runden/Sekunde: GameEngine pro Event vs. game_sim vektorisiert)
+from __future__ import annotations
+import argparse
+import pathlib
+import tempfile
+import time
+
+import numpy as np
+
+import game_sim
+
+
+def bench_engine(csv_path: pathlib.Path, variant: str, sessions: int, start_points: int) -> float:
+    """ Runden/Sekunde über die echte GameEngine (SQLite + CSV pro Event). """
+    schedule = game_sim.load_schedule(csv_path, variant)
+    n_rounds = len(schedule.rounds)
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for _ in range(sessions):
+            signals = rng.integers(0, 3, size=n_rounds)
+            calls = rng.integers(0, 2, size=n_rounds)
+            game_sim.play_session_through_engine(
+                csv_path, variant, signals, calls, tmp, start_points=start_points
+            )
+        elapsed = time.perf_counter() - t0
+    return sessions * n_rounds / elapsed
+
+
+def bench_vectorized(csv_path: pathlib.Path, variant: str, sessions: int,
+                     start_points: int, repeats: int = 5) -> float:
+    """ Runden/Sekunde über game_sim.simulate (bestes von `repeats` Läufen). """
+    schedule = game_sim.load_schedule(csv_path, variant)
+    signaler = game_sim.bluffing_signaler(0.3)
+    judge = game_sim.threshold_judge()
+    best = float("inf")
+    for seed in range(repeats):
+        t0 = time.perf_counter()
+        game_sim.simulate(schedule, signaler, judge, sessions,
+                          scoring=variant, start_points=start_points, seed=seed)
+        best = min(best, time.perf_counter() - t0)
+    return sessions * len(schedule.rounds) / best
+
+
+def main():
+    base = pathlib.Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(description="Runden/Sekunde GameEngine vs. game_sim")
+    ap.add_argument("--csv", default=str(base / "Paare1.csv"))
+    ap.add_argument("--engine-sessions", type=int, default=20)
+    ap.add_argument("--sim-sessions", type=int, default=100_000)
+    args = ap.parse_args()
+    csv_path = pathlib.Path(args.csv)
+
+    print(f"Schedule: {csv_path.name}")
+    print(f"{'Engine':<8}{'Pfad':<14}{'Runden/s':>16}")
+    for variant, start_points in (("w", 0), ("wl", 16)):
+        schedule = game_sim.load_schedule(csv_path, variant)
+        check = game_sim.simulate(schedule, game_sim.random_signaler(), game_sim.random_judge(),
+                                  32, scoring=variant, start_points=start_points, seed=1)
+        checked = game_sim.cross_check(csv_path, variant, check, sessions=range(32),
+                                       start_points=start_points)
+        engine_rps = bench_engine(csv_path, variant, args.engine_sessions, start_points)
+        sim_rps = bench_vectorized(csv_path, variant, args.sim_sessions, start_points)
+        print(f"_{variant:<7}{'GameEngine':<14}{engine_rps:>16,.0f}")
+        print(f"_{variant:<7}{'game_sim':<14}{sim_rps:>16,.0f}"
+              f"   (x{sim_rps / engine_rps:,.0f}, {checked} Runden gegen Engine geprüft)")
+
+
+if __name__ == "__main__":
+    main()
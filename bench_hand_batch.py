@@ -0,0 +1,58 @@
+# bench_hand_batch.py  (Hände/Sekunde: skalare Regeln pro Kartenpaar vs. hand_batch vektorisiert)
+#
+# Klassifiziert --hands zufällige Kartenpaare (7–11) einmal mit den skalaren Funktionen der
+# Engine (hand_value, hand_category, hand_category_label) und einmal mit hand_batch.classify;
+# die Ergebnisse werden verglichen.
+from __future__ import annotations
+import argparse
+import time
+
+import numpy as np
+
+import game_engine_w as ge
+import hand_batch
+from outcome_table import CARD_VALUES
+
+
+def scalar(cards: np.ndarray):
+    values, labels, forced = [], [], []
+    for a, b in cards.tolist():
+        values.append(ge.hand_value(a, b))
+        labels.append(ge.hand_category_label(a, b))
+        forced.append(ge.hand_category(a, b) is None)
+    return values, labels, forced
+
+
+def batch(cards: np.ndarray):
+    hands = hand_batch.classify(cards)
+    return hands.values, hand_batch.category_labels(hands.categories), hands.forced_bluff
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Skalare vs. vektorisierte Handregeln")
+    ap.add_argument("--hands", type=int, default=1_000_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    cards = rng.choice(np.array(CARD_VALUES, dtype=np.int16), size=(args.hands, 2))
+
+    t0 = time.perf_counter()
+    s_values, s_labels, s_forced = scalar(cards)
+    t_scalar = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    b_values, b_labels, b_forced = batch(cards)
+    t_batch = time.perf_counter() - t0
+
+    if (b_values.tolist() != s_values or b_labels.tolist() != s_labels
+            or b_forced.tolist() != s_forced):
+        raise AssertionError("hand_batch weicht von den skalaren Regeln ab.")
+    print(f"{args.hands} Hände, Ergebnisse identisch")
+    print(f"{'Variante':<12}{'Zeit (s)':>10}{'Hände/s':>14}")
+    print(f"{'skalar':<12}{t_scalar:>10.3f}{args.hands / t_scalar:>14,.0f}")
+    print(f"{'hand_batch':<12}{t_batch:>10.3f}{args.hands / t_batch:>14,.0f}")
+    print(f"Faktor: {t_scalar / t_batch:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
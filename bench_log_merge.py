@@ -0,0 +1,99 @@
+# bench_log_merge.py  (Studien-Merge: --pcs synthetische Log-Ordner, seriell vs. Prozess-Pool, Wiederholung)
+#
+# Jeder Log-Ordner bekommt events.sqlite3 (Sessions wie bench_event_schema), events.csv mit
+# denselben Events (Duplikate für die Deduplizierung) sowie je Session eine session_*.csv
+# und round_log_*.csv. Gemessen: erster Merge mit einem bzw. --workers Prozessen, ein
+# unveränderter zweiter Lauf, ein Lauf nach `touch` aller Dateien (nur Hash) und einer mit
+# zusätzlichen Sessions auf einem PC. Geprüft wird, dass jedes Event genau einmal landet.
+from __future__ import annotations
+import argparse
+import csv
+import os
+import pathlib
+import random
+import sqlite3
+import tempfile
+
+import bench_event_schema
+import event_log
+import log_merge
+
+
+def build_log_dir(log_dir: pathlib.Path, pc: int, sessions: int, first: int, rng: random.Random) -> int:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(log_dir / "events.sqlite3")
+    try:
+        conn.execute(bench_event_schema.LEGACY_SCHEMA.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS"))
+        n_events = 0
+        for s in range(first, first + sessions):
+            session_id = f"PC{pc:02d}-S{s:03d}"
+            rows = list(bench_event_schema.session_rows(session_id, rng))
+            conn.executemany("INSERT INTO events VALUES (?,?,?,?,?,?,?,?)", rows)
+            n_events += len(rows)
+            with open(log_dir / f"session_{session_id}_bench.csv", "w", encoding="utf-8", newline="") as fp:
+                writer = csv.writer(fp)
+                writer.writerow(["Spiel", "Runde", "Spieler", "Taste", "Time"])
+                writer.writerows([session_id, r[1], r[3], r[4], r[7]] for r in rows if r[3] != "SYS")
+            with open(log_dir / f"round_log_{session_id}.csv", "w", encoding="utf-8", newline="") as fp:
+                writer = csv.writer(fp)
+                writer.writerow(["Session", "Runde im Block", "Aktion", "Zeit"])
+                writer.writerows([session_id, r[1], r[4], r[7]] for r in rows if r[4] == "call")
+        conn.commit()
+        with open(log_dir / "events.csv", "w", encoding="utf-8", newline="") as fp:
+            csv.writer(fp).writerows(conn.execute(
+                f"SELECT {', '.join(event_log.EVENT_COLUMNS)} FROM events ORDER BY rowid"))
+    finally:
+        conn.close()
+    return n_events
+
+
+def count_events(study_db: str) -> int:
+    conn = sqlite3.connect(study_db)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def run(label: str, study_db: str, log_dirs, workers, expected: int):
+    stats = log_merge.merge(study_db, [str(d) for d in log_dirs], workers)
+    if stats.errors:
+        raise AssertionError("; ".join(stats.errors))
+    total = count_events(study_db)
+    if total != expected:
+        raise AssertionError(f"{label}: {total} Events in der Studien-DB, erwartet {expected}")
+    print(f"{label:<28}{stats.seconds:>8.2f}{stats.ingested:>8}{stats.skipped:>10}{stats.unchanged:>8}"
+          f"{stats.events_inserted:>10}{stats.duplicates:>10}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Log-Ordner mehrerer PCs zusammenführen: Laufzeit und Idempotenz")
+    ap.add_argument("--pcs", type=int, default=8)
+    ap.add_argument("--sessions", type=int, default=24, help="Sessions je PC")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        log_dirs = [root / f"pc{pc:02d}" / "logs" for pc in range(args.pcs)]
+        expected = sum(build_log_dir(d, pc, args.sessions, 0, rng) for pc, d in enumerate(log_dirs))
+        n_files = sum(1 for _ in log_merge.discover([str(d) for d in log_dirs]))
+        print(f"{args.pcs} PCs, {args.pcs * args.sessions} Sessions, {expected} Events, {n_files} Dateien\n")
+        print(f"{'Lauf':<28}{'s':>8}{'neu':>8}{'überspr.':>10}{'gleich':>8}{'Events':>10}{'Duplikate':>10}")
+
+        run("seriell (1 Prozess)", str(root / "serial.sqlite3"), log_dirs, 1, expected)
+        study = str(root / "study.sqlite3")
+        run(f"Pool ({args.workers} Prozesse)", study, log_dirs, args.workers, expected)
+        run("Wiederholung", study, log_dirs, args.workers, expected)
+        for path in root.rglob("*"):
+            if path.is_file() and "study" not in path.name and "serial" not in path.name:
+                os.utime(path)
+        run("nach touch (nur Hash)", study, log_dirs, args.workers, expected)
+        expected += build_log_dir(log_dirs[0], 0, 2, args.sessions, rng)
+        run("PC 0 mit 2 neuen Sessions", study, log_dirs, args.workers, expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_public_state.py  (Allokationen/Zeit pro Abfrage: get_public_state vs. state_since/snapshot)
+from __future__ import annotations
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+import game_engine_w as ge
+
+
+def measure(poll, polls: int):
+    """ Rückgabe: (neu allokierte Blöcke pro Abfrage, µs pro Abfrage). """
+    results = []
+    blocks_before = sys.getallocatedblocks()
+    t0 = time.perf_counter()
+    for _ in range(polls):
+        results.append(poll())
+    elapsed = time.perf_counter() - t0
+    blocks = sys.getallocatedblocks() - blocks_before
+    return blocks / polls, elapsed / polls * 1e6
+
+
+def main():
+    base = pathlib.Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(description="Öffentlicher Zustand: Vollaufbau vs. versionierte Deltas")
+    ap.add_argument("--csv", default=str(base / "Paare1.csv"))
+    ap.add_argument("--polls", type=int, default=100_000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = ge.GameEngineConfig(
+            session_id="BENCH001", csv_path=args.csv,
+            db_path=str(pathlib.Path(tmp) / "events.sqlite3"), log_dir=tmp, payout=True,
+        )
+        eng = ge.GameEngine(cfg)
+        try:
+            eng.click_start(ge.Player.P1); eng.click_start(ge.Player.P2)
+            eng.click_reveal_card(ge.Player.P1, 0)
+            seen = eng.state_version
+            before_reveal = seen - 1
+            cases = [
+                ("get_public_state()", eng.get_public_state),
+                ("snapshot()", eng.snapshot),
+                ("state_since(aktuell)", lambda: eng.state_since(seen)),
+                ("state_since(1 Änderung)", lambda: eng.state_since(before_reveal)),
+                ("state_since(None)", lambda: eng.state_since(None)),
+            ]
+            print(f"{args.polls:,} Abfragen je Variante, Version {eng.state_version}")
+            print(f"{'Abfrage':<26}{'Blöcke/Abfrage':>16}{'µs/Abfrage':>14}")
+            for label, poll in cases:
+                blocks, micros = measure(poll, args.polls)
+                print(f"{label:<26}{blocks:>16.2f}{micros:>14.3f}")
+        finally:
+            eng.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# bench_schedule_cache.py  (Schedule laden: CSV parsen vs. kompilierter Binär-Cache)
+from __future__ import annotations
+import argparse
+import csv
+import pathlib
+import random
+import tempfile
+import time
+
+import schedule_cache
+from outcome_table import CARD_VALUES, hand_category, hand_value
+
+
+def write_schedule(path: pathlib.Path, n_rounds: int, seed: int):
+    """ Erzeugt einen Paare*.csv-kompatiblen Schedule mit n_rounds Runden. """
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as fp:
+        writer = csv.writer(fp)
+        writer.writerow(['', 'Kategorie1', 'Karte.11', 'Karte.21', 'Hand1', 'Wert1',
+                         'Kategorie2', 'Karte.12', 'Karte.22', 'Hand2', 'Wert2', 'Spw'])
+        for idx in range(n_rounds):
+            row = [idx + 1]
+            for _ in range(2):
+                a, b = rng.choice(CARD_VALUES), rng.choice(CARD_VALUES)
+                row += [hand_category(a, b) or 'über', a, b, a + b, hand_value(a, b)]
+            row.append(rng.choice((-1, 1)))
+            writer.writerow(row)
+
+
+def best_of(fn, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Schedule-Laden: CSV-Parser vs. Binär-Cache')
+    ap.add_argument('--rounds', type=int, nargs='+', default=[16, 1_000, 10_000, 100_000])
+    ap.add_argument('--repeats', type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'Runden':>10}{'CSV (ms)':>12}{'Cache (ms)':>12}{'Faktor':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rounds in args.rounds:
+            path = pathlib.Path(tmp) / f'Paare_{n_rounds}.csv'
+            write_schedule(path, n_rounds, seed=n_rounds)
+            parse = best_of(lambda: schedule_cache.compile_schedule(path, write=False), args.repeats)
+            schedule_cache.compile_schedule(path)
+            cached = best_of(lambda: schedule_cache.load(path), args.repeats)
+            print(f"{n_rounds:>10,}{parse * 1000:>12.2f}{cached * 1000:>12.2f}{parse / cached:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# bench_session_host.py  (viele Tische: ein EventLogger pro Engine vs. SessionHost)
+from __future__ import annotations
+import argparse
+import os
+import pathlib
+import tempfile
+import threading
+import time
+
+import game_engine_w as ge
+from session_host import SessionHost
+
+
+def open_files() -> int:
+    """ Offene Dateideskriptoren des Prozesses (Linux: /proc/self/fd). """
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return -1
+
+
+def session_commands(n_rounds: int):
+    """ Befehlsfolge einer vollständigen Session als (Befehl, Argumente). """
+    P = ge.Player
+    levels = list(ge.SignalLevel)
+    calls = list(ge.Call)
+    yield "click_start", (P.P1,)
+    yield "click_start", (P.P2,)
+    for i in range(n_rounds):
+        for player, idx in ((P.P1, 0), (P.P2, 0), (P.P1, 1), (P.P2, 1)):
+            yield "click_reveal_card", (player, idx)
+        yield "p1_signal", (levels[i % len(levels)],)
+        yield "p2_call", (calls[i % len(calls)], None)
+        yield "click_next_round", (P.P1,)
+        yield "click_next_round", (P.P2,)
+
+
+def table_config(log_dir: pathlib.Path, csv_path: pathlib.Path, idx: int, durability: str):
+    # Eigene DB je Tisch: mehrere Verbindungen mit offener Transaktion (Durability round)
+    # auf derselben DB blockieren sich gegenseitig ("database is locked")
+    return ge.GameEngineConfig(
+        session_id=f"T{idx:03d}",
+        csv_path=str(csv_path),
+        db_path=str(log_dir / f"events_T{idx:03d}.sqlite3"),
+        log_dir=str(log_dir),
+        payout=True,
+        durability=durability,
+    )
+
+
+def interleaved(n_tables: int, n_rounds: int):
+    """ Reihum je ein Befehl pro Tisch, wie bei parallel spielenden Tischen. """
+    sequences = [list(session_commands(n_rounds)) for _ in range(n_tables)]
+    for step in range(len(sequences[0])):
+        for idx, commands in enumerate(sequences):
+            yield idx, commands[step]
+
+
+def bench_separate(csv_path: pathlib.Path, n_tables: int, durability: str):
+    """ Heutiger Stand: jede Engine mit eigenem EventLogger (synchron, eigene DB-Verbindung). """
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = pathlib.Path(tmp)
+        fds_before, threads_before = open_files(), threading.active_count()
+        engines = [ge.GameEngine(table_config(log_dir, csv_path, idx, durability))
+                   for idx in range(n_tables)]
+        fds, threads = open_files() - fds_before, threading.active_count() - threads_before
+        n_rounds = len(engines[0].schedule.rounds)
+        t0 = time.perf_counter()
+        n_commands = 0
+        try:
+            for idx, (command, args) in interleaved(n_tables, n_rounds):
+                getattr(engines[idx], command)(*args)
+                n_commands += 1
+        finally:
+            for engine in engines:
+                engine.close()
+        elapsed = time.perf_counter() - t0
+    return n_commands / elapsed, fds, threads
+
+
+def bench_host(csv_path: pathlib.Path, n_tables: int, durability: str):
+    """ SessionHost: ein Logger, ein Dispatch-Thread; Befehle kommen aus einem Client-Thread. """
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = pathlib.Path(tmp)
+        fds_before, threads_before = open_files(), threading.active_count()
+        host = SessionHost(str(log_dir / "events_bench.sqlite3"), durability=durability)
+        host.start()
+        try:
+            engines = [host.open_table(table_config(log_dir, csv_path, idx, durability))
+                       for idx in range(n_tables)]
+            fds, threads = open_files() - fds_before, threading.active_count() - threads_before
+            n_rounds = len(engines[0].schedule.rounds)
+            t0 = time.perf_counter()
+            futures = [host.submit(f"T{idx:03d}", command, *args)
+                       for idx, (command, args) in interleaved(n_tables, n_rounds)]
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - t0
+            errors = sum(table["errors"] for table in host.stats())
+            if errors:
+                raise RuntimeError(f"{errors} Befehle sind fehlgeschlagen.")
+        finally:
+            host.close()
+    return len(futures) / elapsed, fds, threads
+
+
+def main():
+    base = pathlib.Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(description="Mehrere Tische: eigene Logger vs. SessionHost")
+    ap.add_argument("--csv", default=str(base / "Paare1.csv"))
+    ap.add_argument("--tables", type=int, nargs="+", default=[1, 8, 32, 64])
+    ap.add_argument("--durability", default="round")
+    args = ap.parse_args()
+    csv_path = pathlib.Path(args.csv)
+
+    print(f"Schedule: {csv_path.name}, Durability {args.durability}")
+    print(f"{'Tische':>7}{'Modus':>10}{'Befehle/s':>12}{'+Dateien':>10}{'+Threads':>10}")
+    for n_tables in args.tables:
+        for label, bench in (("einzeln", bench_separate), ("Host", bench_host)):
+            rate, fds, threads = bench(csv_path, n_tables, args.durability)
+            print(f"{n_tables:>7}{label:>10}{rate:>12,.0f}{fds:>10}{threads:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# bench_touch_latency.py  (Touch-Latenz mit synthetischen Berührungen, für Regressionstests)
+#
+# Startet eine Tabletop-UI mit eigener Session in einem Temp-Log-Ordner und tippt im Takt
+# --interval auf einen zufälligen live Button bzw. eine live Karte – über den normalen
+# Eingabeweg (kivy.tests.common.UnitTestTouch → Window → Button.on_release), so dass die
+# Stempel aus touch_latency genauso entstehen wie am Tisch. Danach die Perzentile je
+# Aktion; mit --max-p95 endet das Skript mit Code 1, wenn ein total-p95 darüber liegt.
+# Braucht Kivy und ein Fenster (ohne Display z. B. unter xvfb-run).
+#     python bench_touch_latency.py --ui tabletop_ux_kivy_base_w --touches 200 --max-p95 50
+from __future__ import annotations
+import argparse
+import importlib
+import pathlib
+import random
+import sys
+import tempfile
+
+import touch_latency
+from session_snapshot import SnapshotStore
+
+UIS = ["tabletop_ux_kivy_base_w", "tabletop_ux_kivy_base_wl", "tabletop_ux_kivy_aruco_w"]
+
+
+def live_targets(root, ui):
+    return [w for w in root.walk(restrict=True)
+            if isinstance(w, (ui.CardWidget, ui.IconButton)) and w.live and not w.disabled]
+
+
+def run(ui_name: str, touches: int, interval: float, session: int, db_path: pathlib.Path,
+        log_dir: pathlib.Path, seed: int) -> int:
+    from kivy.clock import Clock
+    from kivy.tests.common import UnitTestTouch
+
+    ui = importlib.import_module(ui_name)
+    rng = random.Random(seed)
+    sent = [0]
+
+    class BenchApp(ui.TabletopApp):
+        def build(self):
+            root = super().build()
+            # nichts in ./logs schreiben und keinen echten Snapshot fortsetzen
+            root.log_dir = log_dir
+            root.snapshots = SnapshotStore(log_dir / "snapshots")
+            if root.touch_latency is None:
+                raise RuntimeError("Touch-Latenz ist abgeschaltet (TOUCH_LATENCY=0).")
+            root.touch_latency.db_path = db_path
+            Clock.schedule_once(lambda *_: root.start_session(session), 0.3)
+            Clock.schedule_interval(self.touch_next, interval)
+            return root
+
+        def touch_next(self, _dt):
+            if sent[0] >= touches:
+                self.stop()
+                return False
+            targets = live_targets(self.root, ui)
+            if not targets:
+                return
+            widget = rng.choice(targets)
+            touch = UnitTestTouch(*widget.to_window(*widget.center))
+            touch.touch_down()
+            touch.touch_up()
+            sent[0] += 1
+
+    BenchApp().run()
+    return sent[0]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Touch-Latenz mit synthetischen Berührungen")
+    ap.add_argument("--ui", choices=UIS, default=UIS[0])
+    ap.add_argument("--touches", type=int, default=200)
+    ap.add_argument("--interval", type=float, default=0.3,
+                    help="Sekunden zwischen Berührungen (> 0.2, sonst läuft man den Phasenwechseln voraus)")
+    ap.add_argument("--session", type=int, default=900)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--db", default=None, help="Histogramme hier sammeln statt im Temp-Ordner")
+    ap.add_argument("--max-p95", type=float, default=None, help="Grenze für total-p95 in ms")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = pathlib.Path(tmp)
+        db_path = pathlib.Path(args.db) if args.db else log_dir / touch_latency.DB_NAME
+        sent = run(args.ui, args.touches, args.interval, args.session, db_path, log_dir, args.seed)
+        entries = []
+        if db_path.exists():   # ohne angenommene Berührung wird nichts geschrieben
+            entries = touch_latency.report(str(db_path), source=args.ui,
+                                           session_id=f"S{args.session:03d}")
+    print(f"{args.ui}: {sent} synthetische Berührungen, alle {args.interval * 1000:.0f} ms")
+    touch_latency.print_report(entries)
+    if args.max_p95 is not None:
+        slow = [e for e in entries if e["segment"] == "total" and e["p95_ms"] > args.max_p95]
+        for e in slow:
+            print(f"Regression: {e['action']} total-p95 ≤{e['p95_ms']:g} ms > {args.max_p95:g} ms")
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# bench_ux_assets.py  (Erstnutzungs-Stalls pro Grafik: Einzeldateien vs. vorgeladener Atlas)
+#
+# Jede Variante läuft in einem eigenen Prozess, damit der Kivy-Bildcache kalt startet.
+# Gemessen wird, wie lange das erste CoreImage(<Quelle>).texture je Grafik dauert – genau
+# das passiert beim ersten update_visual() eines Buttons bzw. einer Karte.
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def run_mode(mode: str) -> dict:
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    from kivy.core.window import Window  # noqa: F401  (GL-Kontext für Texturen)
+    from kivy.core.image import Image as CoreImage
+    import ux_assets
+
+    sources = ux_assets.source_files()
+    preload_s = 0.0
+    if mode == 'atlas':
+        if not ux_assets.uses_atlas():
+            raise RuntimeError('Kein aktueller Atlas – zuerst `python ux_assets.py build`.')
+        preload_s = ux_assets.preload()
+    first_use = {}
+    for key, path in sources.items():
+        src = ux_assets.asset(key) if mode == 'atlas' else path
+        t0 = time.perf_counter()
+        CoreImage(src).texture
+        first_use[key] = (time.perf_counter() - t0) * 1000.0
+    return {'preload_ms': preload_s * 1000.0, 'first_use_ms': first_use}
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Erstnutzungs-Stalls: Einzeldateien vs. Atlas')
+    ap.add_argument('--mode', choices=('files', 'atlas'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.mode:
+        print(json.dumps(run_mode(args.mode)))
+        return
+
+    results = {}
+    for mode in ('files', 'atlas'):
+        out = subprocess.run([sys.executable, __file__, '--mode', mode],
+                             capture_output=True, text=True, check=True)
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    files, atlas = results['files']['first_use_ms'], results['atlas']['first_use_ms']
+    print(f"Atlas-Preload beim Start: {results['atlas']['preload_ms']:.1f} ms")
+    print(f"{'Grafik':<14}{'Datei (ms)':>12}{'Atlas (ms)':>12}")
+    for key in files:
+        print(f"{key:<14}{files[key]:>12.2f}{atlas[key]:>12.3f}")
+    print(f"{'max':<14}{max(files.values()):>12.2f}{max(atlas.values()):>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
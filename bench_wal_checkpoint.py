@@ -0,0 +1,115 @@
+# bench_wal_checkpoint.py  (WAL-Größe, Checkpoints und Wiederanlauf einer Station über viele Sessions)
+#
+# Spielt --sessions Sessions nacheinander über einen gemeinsamen EventLogger (wie eine Station,
+# die den ganzen Tag läuft), einmal ohne Checkpoint-Verwaltung (wal_limit=None: nur SQLites
+# Auto-Checkpoint) und einmal verwaltet (wal_limit). Gemessen: größte -wal-Datei, Größe vor
+# close(), Dauer einer Leseabfrage aus einem zweiten Prozess-Blickwinkel (neue Verbindung),
+# Wiederanlauf nach simuliertem Absturz (DB + WAL kopieren, öffnen, erste Abfrage) und die
+# Checkpoints des Loggers – wie viele, wie lang, wie viele in Eingabephasen.
+from __future__ import annotations
+import argparse
+import os
+import pathlib
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import game_engine_w as ge
+from event_log import IDLE_PHASES, WAL_LIMIT, Durability, EventLogger
+from session_host import TableLogger
+
+
+def play_session(csv_path: pathlib.Path, log_dir: pathlib.Path, logger: EventLogger, idx: int):
+    cfg = ge.GameEngineConfig(session_id=f"WAL{idx:03d}", csv_path=str(csv_path),
+                              log_dir=str(log_dir), payout=True)
+    eng = ge.GameEngine(cfg, logger=TableLogger(logger))
+    levels = list(ge.SignalLevel)
+    calls = list(ge.Call)
+    try:
+        eng.click_start(ge.Player.P1); eng.click_start(ge.Player.P2)
+        for i in range(len(eng.schedule.rounds)):
+            eng.click_reveal_card(ge.Player.P1, 0)
+            eng.click_reveal_card(ge.Player.P2, 0)
+            eng.click_reveal_card(ge.Player.P1, 1)
+            eng.click_reveal_card(ge.Player.P2, 1)
+            eng.p1_signal(levels[i % len(levels)])
+            eng.p2_call(calls[i % len(calls)], p1_hat_wahrheit_gesagt=None)
+            eng.click_next_round(ge.Player.P1); eng.click_next_round(ge.Player.P2)
+    finally:
+        eng.close()
+
+
+def wal_size(db_path: pathlib.Path) -> int:
+    wal = pathlib.Path(f"{db_path}-wal")
+    return wal.stat().st_size if wal.exists() else 0
+
+
+def first_query_ms(db_path: pathlib.Path) -> float:
+    t0 = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("SELECT COUNT(*), MAX(t_mono_ns) FROM events").fetchone()
+    finally:
+        conn.close()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def crash_recovery_ms(db_path: pathlib.Path, tmp: pathlib.Path) -> float:
+    """ DB + WAL ohne close() kopieren (wie nach einem Absturz) und die Kopie öffnen. """
+    copy = tmp / "crash" / db_path.name
+    copy.parent.mkdir(exist_ok=True)
+    shutil.copy(db_path, copy)
+    if pathlib.Path(f"{db_path}-wal").exists():
+        shutil.copy(f"{db_path}-wal", f"{copy}-wal")
+    return first_query_ms(copy)
+
+
+def run(csv_path: pathlib.Path, sessions: int, log_async: bool, wal_limit):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = pathlib.Path(tmp)
+        db_path = tmp / "events.sqlite3"
+        logger = EventLogger(str(db_path), async_mode=log_async, durability=Durability.EVENT,
+                             wal_limit=wal_limit)
+        peak = 0
+        t0 = time.perf_counter()
+        for idx in range(sessions):
+            play_session(csv_path, tmp, logger, idx)
+            logger.flush()
+            peak = max(peak, wal_size(db_path))
+        seconds = time.perf_counter() - t0
+        before_close = wal_size(db_path)
+        read_ms = first_query_ms(db_path)
+        recovery_ms = crash_recovery_ms(db_path, tmp)
+        logger.close()
+        records = list(logger.checkpoints)
+        after_close = wal_size(db_path)
+    critical = sum(1 for r in records if r.reason != "close" and r.phase not in IDLE_PHASES)
+    max_ms = max((r.ms for r in records if r.reason != "close"), default=0.0)
+    return seconds, peak, before_close, after_close, read_ms, recovery_ms, len(records), max_ms, critical
+
+
+def main():
+    base = pathlib.Path(__file__).resolve().parent
+    ap = argparse.ArgumentParser(description="WAL-Verwaltung des EventLoggers über viele Sessions")
+    ap.add_argument("--csv", default=str(base / "Paare1.csv"))
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--wal-limit", type=int, default=WAL_LIMIT, help="Obergrenze in Bytes (verwaltet)")
+    args = ap.parse_args()
+    csv_path = pathlib.Path(args.csv)
+
+    print(f"Schedule: {csv_path.name}, {args.sessions} Sessions je Lauf, Durability event")
+    print(f"{'Modus':<7}{'WAL':<11}{'s':>7}{'WAL max KB':>11}{'vor close':>10}{'danach':>8}"
+          f"{'Lesen ms':>10}{'Absturz ms':>11}{'CPs':>6}{'max ms':>8}{'Eingabe':>8}")
+    for log_async in (False, True):
+        for label, wal_limit in (("auto", None), ("verwaltet", args.wal_limit)):
+            (seconds, peak, before, after, read_ms, recovery_ms,
+             n_checkpoints, max_ms, critical) = run(csv_path, args.sessions, log_async, wal_limit)
+            mode = "async" if log_async else "sync"
+            print(f"{mode:<7}{label:<11}{seconds:>7.2f}{peak / 1024:>11.0f}{before / 1024:>10.0f}"
+                  f"{after / 1024:>8.0f}{read_ms:>10.2f}{recovery_ms:>11.2f}{n_checkpoints:>6}"
+                  f"{max_ms:>8.2f}{critical:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+# engine_server.py  (GameEngine + Logging als eigener Prozess, UIs als dünne Clients)
+#
+# Der Server hält einen SessionHost (alle Engines, ein EventLogger) und spricht über TCP
+# oder einen Unix-Socket ein zeilenbasiertes JSON-Protokoll (eine Nachricht pro Zeile):
+#   Anfrage:  {"id": 7, "op": "call", "session": "S012", "cmd": "p1_signal", "args": ["hoch"]}
+#   Antwort:  {"id": 7, "ok": true, "result": null}
+#             {"id": 7, "ok": false, "error": "RuntimeError", "message": "Falsche Phase: ..."}
+#   Push:     {"push": "state", "session": "S012", "version": 12, "changed": [...], "engine": {...}}
+# Anfragen ohne "id" bekommen keine Antwort (z. B. "log" der Tabletop-UIs). Enums reisen als
+# ihr Wert ("P1", "hoch", "bluff"), "engine" ist GameEngine.export_state().
+#
+# Ops: ping, open (legt den Tisch an oder hängt sich an einen offenen an), call, subscribe,
+# unsubscribe, close_table, log, round_end, idle.
+#
+#     python engine_server.py --listen 127.0.0.1:8765        (oder --listen unix:/tmp/ma1.sock)
+#     ENGINE_SERVER=127.0.0.1:8765 python app_kivy2.py
+#
+# Ein Ruckler in der UI hält damit weder Engine noch Logging auf; mehrere Bildschirme
+# (z. B. ein Tablet pro Spieler) können denselben Tisch öffnen und rendern unabhängig.
+from __future__ import annotations
+from concurrent.futures import Future
+from dataclasses import asdict
+from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import os
+import socket
+import threading
+
+from event_log import Durability, NullEventLogger
+from game_engine_w import Phase
+from session_host import SessionHost
+
+PROTOCOL_VERSION = 1
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+ENV_ADDRESS = "ENGINE_SERVER"   # gesetzt → UIs verbinden sich mit dem Server statt lokal
+
+# Positionsargumente, die als Enum-Wert übertragen werden (Name der Enum-Klasse im Engine-Modul)
+ARG_ENUMS: Dict[str, Tuple[Optional[str], ...]] = {
+    "click_start": ("Player",),
+    "click_reveal_card": ("Player", None),
+    "p1_signal": ("SignalLevel",),
+    "p2_call": ("Call", None),
+    "click_next_round": ("Player",),
+}
+
+# Fehlerklassen, die der Client unverändert wieder wirft; alles andere als RuntimeError
+REMOTE_ERRORS = {"RuntimeError": RuntimeError, "ValueError": ValueError, "KeyError": KeyError}
+
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """ "unix:/pfad" → ("unix", "/pfad"), "host:port" → ("tcp", (host, port)). """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Ungültige Adresse: {address} (erwartet host:port oder unix:/pfad)")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Nicht serialisierbar: {type(value).__name__}")
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"),
+                      default=_json_default).encode("utf-8") + b"\n"
+
+
+def _set_nodelay(sock: Optional[socket.socket]):
+    # Kleine Nachrichten sofort senden (kein Nagle-Puffer) – Latenz vor Durchsatz
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+# -------------- Server --------------
+
+class EngineServer:
+    """ Übersetzt das Socket-Protokoll auf SessionHost-Befehle; eine Verbindung je Client. """
+    def __init__(self, host: SessionHost):
+        self.host = host
+        self.variants: Dict[str, str] = {}   # session_id → Engine-Variante
+
+    async def serve(self, address: str) -> asyncio.AbstractServer:
+        kind, where = parse_address(address)
+        if kind == "unix":
+            if os.path.exists(where):
+                os.unlink(where)   # verwaister Socket eines abgebrochenen Laufs
+            return await asyncio.start_unix_server(self._handle, path=where)
+        return await asyncio.start_server(self._handle, *where)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        _set_nodelay(writer.get_extra_info("socket"))
+        loop = asyncio.get_running_loop()
+        subscriptions: Dict[str, Callable] = {}
+
+        def write(data: bytes):
+            if not writer.is_closing():
+                writer.write(data)
+
+        def push(data: bytes):   # aus dem Dispatch-Thread des Hosts
+            loop.call_soon_threadsafe(write, data)
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    write(encode({"ok": False, "error": "ValueError", "message": "Ungültiges JSON."}))
+                    continue
+                response = await self._request(request, subscriptions, push)
+                if "id" in request:
+                    write(encode({"id": request["id"], **response}))
+        except ConnectionError:
+            pass
+        finally:
+            for session_id, callback in subscriptions.items():
+                try:
+                    self.host.submit(session_id, "unsubscribe", callback)
+                except RuntimeError:   # Host wird gerade geschlossen
+                    break
+            writer.close()
+
+    async def _call(self, session_id: Optional[str], command: str, *args) -> Any:
+        return await asyncio.wrap_future(self.host.submit(session_id, command, *args))
+
+    async def _request(self, request: Dict[str, Any], subscriptions: Dict[str, Callable],
+                       push: Callable[[bytes], None]) -> Dict[str, Any]:
+        op = request.get("op")
+        session_id = request.get("session")
+        try:
+            if op == "ping":
+                result = {"protocol": PROTOCOL_VERSION}
+            elif op == "open":
+                result = await self._open(request)
+            elif op == "call":
+                command = request["cmd"]
+                result = await self._call(session_id, command,
+                                          *self._decode_args(session_id, command, request.get("args", [])))
+            elif op == "subscribe":
+                if session_id not in subscriptions:
+                    engine = self.host.tables[session_id].engine
+                    subscriptions[session_id] = self._subscriber(session_id, engine, push)
+                    await self._call(session_id, "subscribe", subscriptions[session_id])
+                result = await self._call(session_id, "export_state")
+            elif op == "unsubscribe":
+                callback = subscriptions.pop(session_id, None)
+                if callback is not None:
+                    await self._call(session_id, "unsubscribe", callback)
+                result = None
+            elif op == "close_table":
+                result = await self._call(session_id, "close_table")
+                self.variants.pop(session_id, None)
+            elif op == "log":
+                result = await self._call(
+                    session_id, "log", request["round"], Phase[request["phase"]],
+                    request["actor"], request["action"], request.get("payload") or {},
+                )
+            elif op == "round_end":
+                result = await self._call(session_id, "round_end")
+            elif op == "idle":
+                result = await self._call(session_id, "idle", bool(request.get("truncate", True)))
+            else:
+                raise ValueError(f"Unbekannte Operation: {op}")
+        except Exception as exc:
+            return {"ok": False, "error": type(exc).__name__, "message": str(exc)}
+        return {"ok": True, "result": result}
+
+    async def _open(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """ Legt den Tisch an; ist er schon offen (zweiter Bildschirm), nur anhängen. """
+        variant = request.get("variant", "w")
+        config = request["config"]
+        session_id = config["session_id"]
+        created = session_id not in self.host.tables
+        if not created:
+            if self.variants.get(session_id) != variant:
+                raise ValueError(f"Tisch {session_id} läuft bereits mit Variante "
+                                 f"{self.variants.get(session_id)}.")
+        else:
+            cfg = importlib.import_module(f"game_engine_{variant}").GameEngineConfig(**config)
+            await self._call(None, "open_table", cfg, variant)
+            self.variants[session_id] = variant
+        engine = self.host.tables[session_id].engine
+        return {
+            "variant": variant,
+            "created": created,
+            # Schedule ist unveränderlich → einmal übertragen, Clients spiegeln daraus
+            "schedule": [[plan.vp1_cards, plan.vp2_cards] for plan in engine.schedule.rounds],
+        }
+
+    def _decode_args(self, session_id: str, command: str, args: List[Any]) -> List[Any]:
+        enums = ARG_ENUMS.get(command, ())
+        engine_mod = importlib.import_module(f"game_engine_{self.variants.get(session_id, 'w')}")
+        decoded = list(args)
+        for idx, enum_name in enumerate(enums[:len(decoded)]):
+            if enum_name and decoded[idx] is not None:
+                decoded[idx] = getattr(engine_mod, enum_name)(decoded[idx])
+        return decoded
+
+    @staticmethod
+    def _subscriber(session_id: str, engine, push: Callable[[bytes], None]):
+        def on_change(change):
+            push(encode({
+                "push": "state", "session": session_id, "version": change.version,
+                "changed": change.changed, "engine": engine.export_state(),
+            }))
+        return on_change
+
+
+async def serve_forever(address: str, host: SessionHost):
+    server = await EngineServer(host).serve(address)
+    print(f"Engine-Server lauscht auf {address}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+# -------------- Client --------------
+
+class EngineClient:
+    """
+    Blockierende Verbindung zum Engine-Server. Ein Lese-Thread ordnet Antworten ihren
+    Anfragen zu und reicht Pushes an die per on_push() registrierten Callbacks weiter
+    (im Lese-Thread – UIs reichen sie selbst an ihren Mainloop weiter).
+    """
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 5.0):
+        kind, where = parse_address(address)
+        if kind == "unix":
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(where)
+        else:
+            self.sock = socket.create_connection(where, timeout=timeout)
+            self.sock.settimeout(None)
+            _set_nodelay(self.sock)
+        self.timeout = timeout
+        self._rfile = self.sock.makefile("rb")
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="EngineClient-reader",
+                                        daemon=True)
+        self._reader.start()
+
+    def request(self, op: str, **fields) -> Any:
+        """ Sendet eine Anfrage und wartet auf die Antwort; Server-Fehler werden hier geworfen. """
+        request_id = next(self._ids)
+        future: Future = Future()
+        self._pending[request_id] = future
+        try:
+            self._send({"id": request_id, "op": op, **fields})
+            message = future.result(self.timeout)
+        finally:
+            self._pending.pop(request_id, None)   # nach Timeout: späte Antwort verwirft der Reader
+        if message["ok"]:
+            return message.get("result")
+        raise REMOTE_ERRORS.get(message.get("error"), RuntimeError)(message.get("message"))
+
+    def send(self, op: str, **fields):
+        """ Anfrage ohne Antwort (fire-and-forget, Reihenfolge bleibt erhalten). """
+        self._send({"op": op, **fields})
+
+    def on_push(self, session_id: str, callback: Callable[[Dict[str, Any]], None]):
+        self._handlers.setdefault(session_id, []).append(callback)
+
+    def remove_push(self, session_id: str, callback: Callable[[Dict[str, Any]], None]):
+        handlers = self._handlers.get(session_id, [])
+        if callback in handlers:
+            handlers.remove(callback)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._reader.join(self.timeout)
+        self._rfile.close()
+        self.sock.close()
+
+    def _send(self, message: Dict[str, Any]):
+        if self._closed:
+            raise ConnectionError("Verbindung zum Engine-Server ist geschlossen.")
+        data = encode(message)
+        with self._send_lock:
+            self.sock.sendall(data)
+
+    def _read_loop(self):
+        try:
+            for line in self._rfile:
+                message = json.loads(line)
+                if "push" in message:
+                    for callback in list(self._handlers.get(message.get("session"), ())):
+                        callback(message)
+                    continue
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None:
+                    future.set_result(message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                future.set_exception(ConnectionError("Verbindung zum Engine-Server getrennt."))
+            self._pending.clear()
+
+
+def connect_from_env(timeout: float = 5.0) -> Optional[EngineClient]:
+    """ EngineClient, falls ENGINE_SERVER gesetzt ist, sonst None (lokale Engine). """
+    address = os.environ.get(ENV_ADDRESS)
+    return EngineClient(address, timeout=timeout) if address else None
+
+
+class RemoteEngine:
+    """
+    GameEngine-Schnittstelle für UIs, deren Engine im Server läuft. Aktionen gehen als
+    Anfrage an den Server; der Zustand kommt per Push und wird in eine lokale Spiegel-
+    Engine (ohne Logging) übernommen, deren subscribe()/snapshot()/current die UI wie
+    gewohnt nutzt. `dispatch(fn)` führt Zustandsupdates im UI-Thread aus (Standard: sofort).
+    """
+    def __init__(self, cfg, client: EngineClient, variant: str = "w",
+                 dispatch: Optional[Callable[[Callable[[], None]], None]] = None):
+        self.cfg = cfg
+        self.client = client
+        self.session_id = cfg.session_id
+        self._dispatch = dispatch or (lambda fn: fn())
+        engine_mod = importlib.import_module(f"game_engine_{variant}")
+        opened = client.request("open", variant=variant, config=asdict(cfg))
+        self.owns_table = opened["created"]
+        plans = [engine_mod.RoundPlan(vp1_cards=tuple(vp1), vp2_cards=tuple(vp2))
+                 for vp1, vp2 in opened["schedule"]]
+        self.mirror = engine_mod.GameEngine(
+            cfg, schedule=engine_mod.RoundSchedule.from_plans(plans), logger=NullEventLogger()
+        )
+        self._version = -1
+        client.on_push(self.session_id, self._on_push)
+        state = client.request("subscribe", session=self.session_id)
+        self._dispatch(lambda: self.mirror.restore_state(state))
+
+    # --- Aktionen (laufen im Server) ---
+    def _call(self, command: str, *args):
+        return self.client.request("call", session=self.session_id, cmd=command, args=args)
+
+    def click_start(self, player):
+        self._call("click_start", player)
+
+    def click_reveal_card(self, player, card_idx: int):
+        self._call("click_reveal_card", player, card_idx)
+
+    def p1_signal(self, level):
+        self._call("p1_signal", level)
+
+    def p2_call(self, call, p1_hat_wahrheit_gesagt: Optional[bool]):
+        self._call("p2_call", call, p1_hat_wahrheit_gesagt)
+
+    def click_next_round(self, player):
+        self._call("click_next_round", player)
+
+    def restore_state(self, state: Dict[str, Any]):
+        self._call("restore_state", state)
+        # Spiegel sofort nachziehen: ein direkt folgender Snapshot darf nicht den alten Stand sichern
+        self.mirror.restore_state(state)
+
+    # --- Zustand (aus dem Spiegel) ---
+    @property
+    def current(self):
+        return self.mirror.current
+
+    @property
+    def scores(self):
+        return self.mirror.scores
+
+    @property
+    def round_idx(self) -> int:
+        return self.mirror.round_idx
+
+    @property
+    def schedule(self):
+        return self.mirror.schedule
+
+    def subscribe(self, callback):
+        self.mirror.subscribe(callback)
+
+    def unsubscribe(self, callback):
+        self.mirror.unsubscribe(callback)
+
+    def snapshot(self):
+        return self.mirror.snapshot()
+
+    def get_public_state(self):
+        return self.mirror.get_public_state()
+
+    def export_state(self):
+        return self.mirror.export_state()
+
+    def close(self):
+        """
+        Schließt den Tisch im Server, wenn dieser Client ihn angelegt hat; angehängte
+        Bildschirme lösen nur ihre Bindung.
+        """
+        self.client.remove_push(self.session_id, self._on_push)
+        try:
+            if self.owns_table:
+                self.client.request("close_table", session=self.session_id)
+            else:
+                self.client.request("unsubscribe", session=self.session_id)
+        except (ConnectionError, KeyError, RuntimeError):
+            pass
+
+    def _on_push(self, message: Dict[str, Any]):
+        if message["version"] <= self._version:
+            return
+        self._version = message["version"]
+        state = message["engine"]
+        self._dispatch(lambda: self.mirror.restore_state(state))
+
+
+class RemoteEventLogger:
+    """
+    EventLogger-Schnittstelle für UIs mit eigener Spiellogik (Tabletop): jedes Event geht
+    ohne auf eine Antwort zu warten an den Server, der es in seine Event-DB schreibt.
+    """
+    def __init__(self, client: EngineClient):
+        self.client = client
+        self._seq = 0
+
+    def log(self, session_id: str, round_idx: int, phase,
+            actor: str, action: str, payload: Dict[str, Any],
+            view_target: Optional[str] = None,
+            view_row: Optional[Callable[[str], Optional[List[Any]]]] = None):
+        self._seq += 1
+        self.client.send("log", session=session_id, round=round_idx, phase=phase.name,
+                         actor=actor, action=action, payload=payload)
+        return {"seq": self._seq, "session_id": session_id, "round_idx": round_idx,
+                "phase": phase.name, "actor": actor, "action": action,
+                "payload": payload, "t_utc_iso": None}
+
+    @property
+    def written_seq(self) -> int:
+        return self._seq
+
+    def add_view(self, target: str, header):
+        pass
+
+    def mark_round_end(self, wait: bool = True):
+        self.client.send("round_end")
+
+    def mark_idle(self, truncate: bool = True):
+        self.client.send("idle", truncate=truncate)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        self.client.request("ping")   # Antwort kommt erst nach allen vorher gesendeten Events
+        return True
+
+    def close(self):
+        """ Wartet, bis der Server alle Events angenommen hat, und trennt die Verbindung. """
+        try:
+            self.flush()
+        except (ConnectionError, RuntimeError):
+            pass
+        self.client.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="GameEngine-Server für Touch-/Tabletop-Clients")
+    ap.add_argument("--listen", default=os.environ.get(ENV_ADDRESS, DEFAULT_ADDRESS),
+                    help="host:port oder unix:/pfad")
+    ap.add_argument("--db", default="logs/events_server.sqlite3")
+    ap.add_argument("--csv-log", default=None, help="optional events.csv als View")
+    ap.add_argument("--durability", default=Durability.ROUND.value,
+                    choices=[d.value for d in Durability])
+    args = ap.parse_args()
+
+    host = SessionHost(args.db, args.csv_log, durability=args.durability)
+    # kein host.start(): die Event-Loop selbst ist die Dispatch-Schleife (kein Thread-Wechsel)
+    try:
+        asyncio.run(serve_forever(args.listen, host))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        host.close()
+
+
+if __name__ == "__main__":
+    main()
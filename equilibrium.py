@@ -0,0 +1,342 @@
+# equilibrium.py  (Gleichgewichts- und Best-Response-Strategien für das Signal-/Call-Spiel)
+#
+# Spielbaum einer Runde: Zufall verteilt die Hände (Handsumme 14–22 für Spieler 1 und 2),
+# Spieler 1 sieht seine Summe und signalisiert hoch/mittel/tief, Spieler 2 sieht seine Summe
+# und das Signal und ruft wahrheit/bluff; ausgezahlt wird nach _resolve_outcome (über
+# game_sim.resolve_outcomes) und outcome_table.SCORE_DELTAS:
+#     "w"   Sieger +1 (nicht nullsummig: ein Unentschieden bringt beiden 0)
+#     "wl"  Sieger +1, Verlierer −1 (Nullsumme)
+# Gelöst wird mit CFR+ (Regret-Matching+, abwechselnde Updates, linear gewichteter
+# Durchschnitt), vektorisiert über alle Informationsmengen und optional über einen Stapel
+# von Handverteilungen (führende Achsen von `joint`), z. B. alle Schedule-Varianten auf
+# einmal. Güte: NashConv = Summe der Best-Response-Gewinne beider Spieler (0 im
+# Gleichgewicht; gilt auch für "w"). Für "wl" rechnet solve_lp() zur Kontrolle das
+# Maximin-LP in Sequenzform (braucht scipy, wird erst dann importiert).
+# Handverteilung: Kombinationen.csv (Wkeit je Kartenpaar; Bed. Wkeit wird gegen die Spalte
+# Kategorie geprüft – die Kategorien selbst kommen aus den Engine-Regeln, in denen 16 als
+# mittel zählt) oder die Rundenpaare eines Paare*.csv.
+#     python equilibrium.py --scoring w wl --schedule Paare1.csv Paare2.csv --lp
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import argparse
+import csv
+import pathlib
+
+import numpy as np
+
+import game_sim
+import hand_batch
+from outcome_table import CARD_VALUES, SCORE_DELTAS, SIGNAL_LEVELS, CALLS
+
+TOTALS = tuple(sorted({a + b for a in CARD_VALUES for b in CARD_VALUES}))   # 14 … 22
+N_SIGNALS, N_CALLS = len(SIGNAL_LEVELS), len(CALLS)
+COMBINATION_COLUMNS = ("Kategorie", "Karte 1", "Karte 2", "Hand", "Wkeit", "Bed. Wkeit")
+PROBABILITY_TOLERANCE = 1e-6   # Wkeit-Spalten sind auf 9 Stellen gerundet
+
+
+# -------------- Handverteilungen --------------
+
+@dataclass(frozen=True)
+class Combination:
+    category: str
+    cards: Tuple[int, int]
+    total: int
+    probability: float
+    conditional: float
+
+
+def load_combinations(path: Union[str, pathlib.Path]) -> List[Combination]:
+    """ Kombinationen.csv (Semikolon, BOM); prüft Kartenwerte, Summen und Wahrscheinlichkeiten. """
+    with open(path, encoding="utf-8-sig", newline="") as fp:
+        rows = [row for row in csv.reader(fp, delimiter=";") if any(cell.strip() for cell in row)]
+    if not rows:
+        raise ValueError(f"{path}: leer.")
+    header = [cell.strip() for cell in rows[0]]
+    try:
+        cols = [header.index(name) for name in COMBINATION_COLUMNS]
+    except ValueError:
+        raise ValueError(f"{path}: Spalten {COMBINATION_COLUMNS} erwartet, gefunden {header}.") from None
+    combos = []
+    for line_no, row in enumerate(rows[1:], start=2):
+        category, a, b, total, prob, cond = (row[col].strip() for col in cols)
+        combo = Combination(category, (int(a), int(b)), int(total),
+                            float(prob.replace(",", ".")), float(cond.replace(",", ".")))
+        if combo.cards[0] not in CARD_VALUES or combo.cards[1] not in CARD_VALUES:
+            raise ValueError(f"{path}, Zeile {line_no}: ungültiger Kartenwert {combo.cards}.")
+        if sum(combo.cards) != combo.total:
+            raise ValueError(f"{path}, Zeile {line_no}: Hand {combo.total} ≠ {combo.cards}.")
+        combos.append(combo)
+    if abs(sum(c.probability for c in combos) - 1.0) > PROBABILITY_TOLERANCE * len(combos):
+        raise ValueError(f"{path}: Wkeit summiert sich nicht zu 1.")
+    by_category: Dict[str, float] = {}
+    for combo in combos:
+        by_category[combo.category] = by_category.get(combo.category, 0.0) + combo.probability
+    for combo in combos:
+        if abs(combo.probability / by_category[combo.category] - combo.conditional) > PROBABILITY_TOLERANCE:
+            raise ValueError(f"{path}: Bed. Wkeit von {combo.cards} passt nicht zu Wkeit/Kategorie.")
+    return combos
+
+
+def hand_distribution(combos: Sequence[Combination]) -> np.ndarray:
+    """ Wahrscheinlichkeit je Handsumme (Index wie TOTALS). """
+    probs = np.zeros(len(TOTALS))
+    for combo in combos:
+        probs[TOTALS.index(combo.total)] += combo.probability
+    return probs / probs.sum()
+
+
+def joint_independent(probs: np.ndarray) -> np.ndarray:
+    """ Hände von Spieler 1 und 2 unabhängig aus derselben Verteilung. """
+    return np.outer(probs, probs)
+
+
+def joint_from_schedule(schedule) -> np.ndarray:
+    """ Empirische Verteilung (Summe Spieler 1, Summe Spieler 2) mit dem Rollenwechsel der Engine. """
+    totals = hand_batch.classify_schedule(schedule).totals         # (n_runden, 2 [VP1/VP2])
+    p1_is_vp1 = (np.arange(len(totals)) % 2) == 0
+    p1 = np.where(p1_is_vp1, totals[:, 0], totals[:, 1]) - TOTALS[0]
+    p2 = np.where(p1_is_vp1, totals[:, 1], totals[:, 0]) - TOTALS[0]
+    joint = np.zeros((len(TOTALS), len(TOTALS)))
+    np.add.at(joint, (p1, p2), 1.0)
+    return joint / len(totals)
+
+
+# -------------- Auszahlungen --------------
+
+def payoff_tensors(scoring: str) -> Tuple[np.ndarray, np.ndarray]:
+    """ Punkte für Spieler 1 und 2, je Form (Summe 1, Summe 2, Signal, Call). """
+    if scoring not in SCORE_DELTAS:
+        raise ValueError(f"Unbekannte Wertung: {scoring!r}")
+    t1, t2, signals, calls = np.meshgrid(np.array(TOTALS), np.array(TOTALS),
+                                         np.arange(N_SIGNALS), np.arange(N_CALLS), indexing="ij")
+    winners, _ = game_sim.resolve_outcomes(t1, t2, signals, calls)
+    deltas = np.zeros((3, 2))
+    deltas[game_sim.WINNER_NONE] = SCORE_DELTAS[scoring][None]
+    deltas[game_sim.WINNER_P1] = SCORE_DELTAS[scoring]["P1"]
+    deltas[game_sim.WINNER_P2] = SCORE_DELTAS[scoring]["P2"]
+    return deltas[winners, 0], deltas[winners, 1]
+
+
+# -------------- Werte und Best Responses --------------
+# signaler: (..., Summe 1, Signal)   judge: (..., Summe 2, Signal, Call)   joint: (..., Summe 1, Summe 2)
+
+def signal_values(joint, judge, u1) -> np.ndarray:
+    """ Kontrafaktischer Wert je (Summe 1, Signal) für Spieler 1. """
+    return np.einsum("...ab,...bsc,absc->...as", joint, judge, u1)
+
+
+def call_values(joint, signaler, u2) -> np.ndarray:
+    """ Kontrafaktischer Wert je (Summe 2, Signal, Call) für Spieler 2. """
+    return np.einsum("...ab,...as,absc->...bsc", joint, signaler, u2)
+
+
+def expected_points(joint, signaler, judge, scoring: str) -> np.ndarray:
+    """ Erwartete Punkte pro Runde (..., 2) für Spieler 1 und 2. """
+    u1, u2 = payoff_tensors(scoring)
+    return np.stack([np.einsum("...ab,...as,...bsc,absc->...", joint, signaler, judge, u)
+                     for u in (u1, u2)], axis=-1)
+
+
+def _one_hot_argmax(values: np.ndarray) -> np.ndarray:
+    """ Reine beste Antwort; bei Gleichstand gleichmäßig auf die besten Aktionen verteilt. """
+    best = values == values.max(axis=-1, keepdims=True)
+    return best / best.sum(axis=-1, keepdims=True)
+
+
+def best_response_signaler(joint, judge, scoring: str) -> Tuple[np.ndarray, np.ndarray]:
+    """ Beste Antwort von Spieler 1 auf `judge`; Rückgabe (Strategie, erwartete Punkte). """
+    values = signal_values(joint, judge, payoff_tensors(scoring)[0])
+    return _one_hot_argmax(values), values.max(axis=-1).sum(axis=-1)
+
+
+def best_response_judge(joint, signaler, scoring: str) -> Tuple[np.ndarray, np.ndarray]:
+    """ Beste Antwort von Spieler 2 auf `signaler`; Rückgabe (Strategie, erwartete Punkte). """
+    values = call_values(joint, signaler, payoff_tensors(scoring)[1])
+    return _one_hot_argmax(values), values.max(axis=-1).sum(axis=(-2, -1))
+
+
+def nash_conv(joint, signaler, judge, scoring: str) -> np.ndarray:
+    """ Summe der Gewinne durch Abweichen auf die beste Antwort (0 im Gleichgewicht). """
+    points = expected_points(joint, signaler, judge, scoring)
+    _, br1 = best_response_signaler(joint, judge, scoring)
+    _, br2 = best_response_judge(joint, signaler, scoring)
+    return (br1 - points[..., 0]) + (br2 - points[..., 1])
+
+
+# -------------- CFR+ --------------
+
+def _regret_matching(regrets: np.ndarray) -> np.ndarray:
+    positive = np.maximum(regrets, 0.0)
+    total = positive.sum(axis=-1, keepdims=True)
+    uniform = np.full_like(positive, 1.0 / positive.shape[-1])
+    return np.where(total > 0, positive / np.where(total > 0, total, 1.0), uniform)
+
+
+@dataclass
+class Equilibrium:
+    scoring: str
+    signaler: np.ndarray        # (..., Summe 1, Signal): P(Signal | Summe)
+    judge: np.ndarray           # (..., Summe 2, Signal, Call): P(Call | Summe, Signal)
+    points: np.ndarray          # (..., 2) erwartete Punkte pro Runde
+    nash_conv: np.ndarray       # (...,)
+    iterations: int
+
+    def bluff_call_rate(self) -> np.ndarray:
+        """ P(bluff | Summe 2, Signal). """
+        return self.judge[..., game_sim.CALL_BLUFF]
+
+
+def solve(joint: np.ndarray, scoring: str = "wl", iterations: int = 5000,
+          tolerance: Optional[float] = None, check_every: int = 250) -> Equilibrium:
+    """
+    CFR+ über alle Informationsmengen; `joint` hat die Form (..., len(TOTALS), len(TOTALS)).
+    Mit `tolerance` wird abgebrochen, sobald NashConv aller Verteilungen darunter liegt.
+    """
+    joint = np.asarray(joint, dtype=float)
+    n = len(TOTALS)
+    if joint.shape[-2:] != (n, n):
+        raise ValueError(f"joint braucht die Form (..., {n}, {n}), bekommen {joint.shape}.")
+    u1, u2 = payoff_tensors(scoring)
+    batch = joint.shape[:-2]
+    regrets1 = np.zeros(batch + (n, N_SIGNALS))
+    regrets2 = np.zeros(batch + (n, N_SIGNALS, N_CALLS))
+    sum1 = np.zeros_like(regrets1)
+    sum2 = np.zeros_like(regrets2)
+    signaler = _regret_matching(regrets1)
+    judge = _regret_matching(regrets2)
+
+    def average():
+        return _regret_matching(sum1), _regret_matching(sum2)
+
+    done = 0
+    for t in range(1, iterations + 1):
+        values = signal_values(joint, judge, u1)
+        regrets1 = np.maximum(regrets1 + values - (signaler * values).sum(-1, keepdims=True), 0.0)
+        sum1 += t * signaler
+        signaler = _regret_matching(regrets1)
+
+        values = call_values(joint, signaler, u2)
+        regrets2 = np.maximum(regrets2 + values - (judge * values).sum(-1, keepdims=True), 0.0)
+        sum2 += t * judge
+        judge = _regret_matching(regrets2)
+        done = t
+        if tolerance is not None and t % check_every == 0:
+            if np.all(nash_conv(joint, *average(), scoring) < tolerance):
+                break
+
+    avg_signaler, avg_judge = average()
+    return Equilibrium(
+        scoring=scoring,
+        signaler=avg_signaler,
+        judge=avg_judge,
+        points=expected_points(joint, avg_signaler, avg_judge, scoring),
+        nash_conv=nash_conv(joint, avg_signaler, avg_judge, scoring),
+        iterations=done,
+    )
+
+
+# -------------- LP (Kontrolle, nur Nullsumme) --------------
+
+def solve_lp(joint: np.ndarray, scoring: str = "wl") -> Tuple[float, np.ndarray]:
+    """
+    Maximin-LP in Sequenzform für Spieler 1: Rückgabe (Spielwert pro Runde, Strategie).
+    Nur für nullsummige Wertung ("wl") und eine einzelne Verteilung.
+    """
+    try:
+        from scipy.optimize import linprog
+    except ImportError as exc:
+        raise RuntimeError("solve_lp braucht scipy (pip install scipy).") from exc
+    u1, u2 = payoff_tensors(scoring)
+    if not np.allclose(u1 + u2, 0.0):
+        raise ValueError(f"Wertung {scoring!r} ist nicht nullsummig – LP nicht anwendbar.")
+    joint = np.asarray(joint, dtype=float)
+    n = len(TOTALS)
+    n_x = n * N_SIGNALS                 # x[a, s] = P(Signal s | Summe a)
+    # z[b, s] ≤ Σ_a joint[a, b] · u1[a, b, s, c] · x[a, s]  für jeden Call c
+    weights = joint[:, :, None, None] * u1            # (a, b, s, c)
+    a_ub, b_ub = [], []
+    for b in range(n):
+        for s in range(N_SIGNALS):
+            for c in range(N_CALLS):
+                row = np.zeros(2 * n_x)
+                row[np.arange(n) * N_SIGNALS + s] = -weights[:, b, s, c]
+                row[n_x + b * N_SIGNALS + s] = 1.0
+                a_ub.append(row)
+                b_ub.append(0.0)
+    a_eq = np.zeros((n, 2 * n_x))
+    for a in range(n):
+        a_eq[a, a * N_SIGNALS:(a + 1) * N_SIGNALS] = 1.0
+    cost = np.concatenate([np.zeros(n_x), -np.ones(n_x)])
+    result = linprog(cost, A_ub=np.array(a_ub), b_ub=b_ub, A_eq=a_eq, b_eq=np.ones(n),
+                     bounds=[(0, 1)] * n_x + [(None, None)] * n_x, method="highs")
+    if not result.success:
+        raise RuntimeError(f"LP nicht gelöst: {result.message}")
+    return -result.fun, result.x[:n_x].reshape(n, N_SIGNALS)
+
+
+# -------------- Baselines für game_sim --------------
+
+def sim_strategies(eq: Equilibrium) -> Tuple[game_sim.SignalerStrategy, game_sim.JudgeStrategy]:
+    """ Gleichgewichtsstrategien (ohne Stapelachse) als game_sim-Strategien zum Simulieren. """
+    if eq.signaler.ndim != 2:
+        raise ValueError("sim_strategies braucht ein einzelnes Gleichgewicht (keine Stapelachse).")
+    signal_cdf = np.cumsum(eq.signaler, axis=-1)
+    bluff_prob = eq.bluff_call_rate()
+
+    def signaler(p1_totals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        cdf = signal_cdf[np.asarray(p1_totals) - TOTALS[0]]
+        draws = rng.random(np.shape(p1_totals))[..., None]
+        return np.minimum((draws > cdf).sum(axis=-1), N_SIGNALS - 1).astype(np.int8)
+
+    def judge(signals: np.ndarray, p2_totals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        probs = bluff_prob[np.asarray(p2_totals) - TOTALS[0], signals]
+        return (rng.random(np.shape(signals)) < probs).astype(np.int8)
+
+    return signaler, judge
+
+
+# -------------- CLI --------------
+
+def _print_equilibrium(label: str, eq: Equilibrium):
+    print(f"\n{label}: {eq.iterations} Iterationen, NashConv {float(eq.nash_conv):.2e}, "
+          f"Punkte/Runde Sp1 {eq.points[0]:+.4f}, Sp2 {eq.points[1]:+.4f}")
+    print(f"{'Summe':>6}  " + "".join(f"{lvl:>8}" for lvl in SIGNAL_LEVELS)
+          + "   P(bluff | Signal) " + "".join(f"{lvl:>8}" for lvl in SIGNAL_LEVELS))
+    for idx, total in enumerate(TOTALS):
+        signals = "".join(f"{p:>8.3f}" for p in eq.signaler[idx])
+        calls = "".join(f"{p:>8.3f}" for p in eq.bluff_call_rate()[idx])
+        print(f"{total:>6}  {signals}   {'':<19}{calls}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gleichgewicht des Signal-/Call-Spiels (CFR+)")
+    ap.add_argument("--combinations", default="Kombinationen.csv")
+    ap.add_argument("--schedule", nargs="*", default=[],
+                    help="Paare*.csv: empirische Verteilung je Schedule statt Kombinationen.csv")
+    ap.add_argument("--scoring", nargs="+", default=["w", "wl"], choices=sorted(SCORE_DELTAS))
+    ap.add_argument("--iterations", type=int, default=5000)
+    ap.add_argument("--tolerance", type=float, default=1e-4)
+    ap.add_argument("--lp", action="store_true", help="bei 'wl' zusätzlich das LP lösen (scipy)")
+    args = ap.parse_args()
+
+    if args.schedule:
+        labels = [pathlib.Path(path).name for path in args.schedule]
+        joint = np.stack([joint_from_schedule(game_sim.load_schedule(path)) for path in args.schedule])
+    else:
+        labels = [pathlib.Path(args.combinations).name]
+        joint = joint_independent(hand_distribution(load_combinations(args.combinations)))[None]
+
+    for scoring in args.scoring:
+        eq = solve(joint, scoring, args.iterations, args.tolerance)
+        for idx, label in enumerate(labels):
+            single = Equilibrium(scoring, eq.signaler[idx], eq.judge[idx], eq.points[idx],
+                                 eq.nash_conv[idx], eq.iterations)
+            _print_equilibrium(f"{label} [{scoring}]", single)
+            if args.lp and scoring == "wl":
+                value, _ = solve_lp(joint[idx], scoring)
+                print(f"LP-Spielwert Sp1: {value:+.4f} (CFR+ {single.points[0]:+.4f})")
+
+
+if __name__ == "__main__":
+    main()
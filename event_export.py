@@ -0,0 +1,452 @@
+# event_export.py  (Event-DBs spaltenweise für die Auswertung exportieren und per mmap laden)
+#
+# Wandelt die Tabelle `events` einer oder mehrerer events*.sqlite3 in Spaltendateien um:
+# je Export-Lauf ein Teil (part_00000, part_00001 …) mit einer .npy-Datei pro Spalte oder –
+# wenn pyarrow installiert ist bzw. --format parquet – einer events.parquet. Aufzählungen
+# (session_id, phase, actor, action, signal, call, winner, Quelle) sind wörterbuchkodiert:
+# int-Codes in den Spalten, die Wörterbücher stehen in manifest.json und bleiben über alle
+# Teile stabil (−1 = NULL; Codes sind nie negativ). Ganzzahlige Spalten (rowid, round_idx,
+# t_mono_ns, event_log.TYPED_COLUMNS) markieren NULL mit dem kleinsten Wert ihres Dtypes
+# (INT_NULL, z. B. −32768 für int16) – −1 ist dort ein echter Wert (Punkte im _wl-Spiel).
+# Parquet-Teile tragen echte NULLs; beim Laden werden sie ebenfalls zu INT_NULL. Der
+# Payload liegt als UTF-8-Bytes plus Offsets vor.
+# Inkrementell: manifest.json merkt sich je Quell-DB den letzten exportierten rowid und die
+# Events je Session; ein neuer Lauf übernimmt nur Zeilen dahinter, also neue Sessions (und
+# ggf. weitergelaufene). Die Quell-DBs werden nur gelesen, ältere Schemata ohne Typspalten
+# werden beim Export aus dem Payload ergänzt.
+#     python event_export.py export logs/events*.sqlite3 --out logs/columnar
+#     python event_export.py info logs/columnar
+# Laden (npy-Teile per mmap, Parquet mit memory_map):
+#     study = event_export.load("logs/columnar")
+#     calls = study.column("action") == study.code("action", "call")
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import pathlib
+import shutil
+import sqlite3
+
+import numpy as np
+
+from event_log import EVENT_COLUMNS, TYPED_NAMES, schema_version, typed_fields
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 2                  # 2: INT_NULL statt −1 in ganzzahligen Spalten
+PARQUET_NAME = "events.parquet"
+FETCH_BATCH = 50_000
+NULL_CODE = -1
+
+# Wörterbuchkodierte Spalten (Code-Dtype); "source" = Quell-DB, wie in manifest["sources"]
+ENUM_COLUMNS = {
+    "source": np.int16,
+    "session_id": np.int32,
+    "phase": np.int16,
+    "actor": np.int16,
+    "action": np.int16,
+    "signal": np.int8,
+    "call": np.int8,
+    "winner": np.int8,
+}
+# Ganzzahlige Spalten; NULL → INT_NULL[name] (kleinster Wert des Dtypes, nie ein echter Wert)
+INT_COLUMNS = {
+    "rowid": np.int64,
+    "round_idx": np.int32,
+    "t_mono_ns": np.int64,
+    "card_idx": np.int8,
+    "card_value": np.int8,
+    "p1_truth": np.int8,
+    "score_vp1": np.int16,
+    "score_vp2": np.int16,
+    "payout": np.int8,
+}
+INT_NULL = {name: int(np.iinfo(dtype).min) for name, dtype in INT_COLUMNS.items()}
+TIME_COLUMN = "t_utc"                 # datetime64[us] aus t_utc_iso (NaT bei fehlendem Wert)
+PAYLOAD_COLUMN = "payload"            # .npy-Teile: payload.bytes (uint8) + payload.offsets (int64)
+COLUMNS = tuple(ENUM_COLUMNS) + tuple(INT_COLUMNS) + (TIME_COLUMN, PAYLOAD_COLUMN)
+
+_SELECT = ("rowid", *EVENT_COLUMNS)   # Spalten aus der DB, Typspalten je nach Schema dahinter
+_PAYLOAD_IDX = _SELECT.index("payload")
+
+
+# -------------- Manifest --------------
+
+def _empty_manifest() -> Dict[str, Any]:
+    return {
+        "format_version": FORMAT_VERSION,
+        "dictionaries": {name: [] for name in ENUM_COLUMNS},
+        "sources": {},    # Pfad → {"last_rowid": int, "sessions": {session_id: events}}
+        "parts": [],      # {"name", "format", "rows", "sessions": [[source, session_id], ...]}
+    }
+
+
+def read_manifest(out_dir) -> Dict[str, Any]:
+    path = pathlib.Path(out_dir) / MANIFEST
+    if not path.exists():
+        return _empty_manifest()
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise RuntimeError(f"{path}: Formatversion {manifest.get('format_version')}, "
+                           f"erwartet {FORMAT_VERSION}.")
+    return manifest
+
+
+def _write_manifest(out_dir: pathlib.Path, manifest: Dict[str, Any]):
+    tmp = out_dir / f"{MANIFEST}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, out_dir / MANIFEST)
+
+
+# -------------- Export --------------
+
+def _has_typed_columns(conn: sqlite3.Connection) -> bool:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    return schema_version(conn) >= 2 and set(TYPED_NAMES) <= existing
+
+
+def _read_new_rows(db_path: str, last_rowid: int) -> List[tuple]:
+    """ Zeilen mit rowid > last_rowid als (rowid, EVENT_COLUMNS…, TYPED_NAMES…). """
+    conn = sqlite3.connect(f"file:{pathlib.Path(db_path).as_posix()}?mode=ro", uri=True)
+    try:
+        typed = _has_typed_columns(conn)
+        columns = _SELECT + (TYPED_NAMES if typed else ())
+        cursor = conn.execute(
+            f"SELECT {', '.join(columns)} FROM events WHERE rowid > ? ORDER BY rowid", (last_rowid,)
+        )
+        rows: List[tuple] = []
+        while True:
+            batch = cursor.fetchmany(FETCH_BATCH)
+            if not batch:
+                break
+            if not typed:
+                batch = [(*row, *_typed_from_payload(row[_PAYLOAD_IDX])) for row in batch]
+            rows.extend(batch)
+        return rows
+    finally:
+        conn.close()
+
+
+def _typed_from_payload(payload: Optional[str]) -> tuple:
+    try:
+        return typed_fields(json.loads(payload)) if payload else typed_fields({})
+    except (ValueError, AttributeError):
+        return typed_fields({})
+
+
+def _encode(values: Iterable[Optional[str]], dictionary: List[str], dtype) -> np.ndarray:
+    """ Werte → Codes; neue Werte werden an `dictionary` angehängt (stabile Codes). """
+    index = {value: code for code, value in enumerate(dictionary)}
+
+    def code(value):
+        if value is None:
+            return NULL_CODE
+        if value not in index:
+            index[value] = len(dictionary)
+            dictionary.append(value)
+        return index[value]
+
+    codes = np.fromiter(map(code, values), dtype=np.int64)
+    if len(dictionary) > np.iinfo(dtype).max:
+        raise RuntimeError(f"Wörterbuch mit {len(dictionary)} Einträgen passt nicht in {np.dtype(dtype)}.")
+    return codes.astype(dtype)
+
+
+def _ints(values: Iterable[Optional[int]], dtype) -> np.ndarray:
+    null = np.iinfo(dtype).min
+    return np.fromiter((null if v is None else int(v) for v in values), dtype=dtype)
+
+
+def _utc_micros(text: Optional[str]) -> int:
+    if not text:
+        return np.iinfo(np.int64).min          # == NaT
+    stamp = datetime.fromisoformat(text)
+    return round(stamp.timestamp() * 1_000_000)
+
+
+def _payload_arrays(payloads: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [(p or "").encode("utf-8") for p in payloads]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _build_columns(rows: List[tuple], sources: List[str], manifest: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """ rows: (rowid, EVENT_COLUMNS…, TYPED_NAMES…); sources: Quell-DB je Zeile. """
+    field = {name: i for i, name in enumerate(_SELECT + TYPED_NAMES)}
+    dictionaries = manifest["dictionaries"]
+    columns: Dict[str, np.ndarray] = {
+        "source": _encode(sources, dictionaries["source"], ENUM_COLUMNS["source"]),
+    }
+    for name in ENUM_COLUMNS:
+        if name != "source":
+            columns[name] = _encode((row[field[name]] for row in rows), dictionaries[name],
+                                    ENUM_COLUMNS[name])
+    for name, dtype in INT_COLUMNS.items():
+        columns[name] = _ints((row[field[name]] for row in rows), dtype)
+    columns[TIME_COLUMN] = np.fromiter(
+        (_utc_micros(row[field["t_utc_iso"]]) for row in rows), dtype=np.int64
+    ).view("datetime64[us]")
+    columns[PAYLOAD_COLUMN] = _payload_arrays([row[field["payload"]] for row in rows])
+    return columns
+
+
+def _write_npy(part_dir: pathlib.Path, columns: Dict[str, Any]):
+    for name, array in columns.items():
+        if name == PAYLOAD_COLUMN:
+            blob, offsets = array
+            np.save(part_dir / f"{name}.bytes.npy", blob)
+            np.save(part_dir / f"{name}.offsets.npy", offsets)
+        else:
+            np.save(part_dir / f"{name}.npy", array)
+
+
+def _write_parquet(part_dir: pathlib.Path, columns: Dict[str, Any], dictionaries: Dict[str, List[str]]):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrays, names = [], []
+    for name, array in columns.items():
+        if name in ENUM_COLUMNS:
+            indices = pa.array(array, mask=array == NULL_CODE)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(dictionaries[name],
+                                                                           pa.string())))
+        elif name in INT_COLUMNS:
+            arrays.append(pa.array(array, mask=array == INT_NULL[name]))
+        elif name == TIME_COLUMN:
+            arrays.append(pa.array(array, mask=np.isnat(array)))
+        else:
+            blob, offsets = array
+            arrays.append(pa.LargeStringArray.from_buffers(
+                len(offsets) - 1, pa.py_buffer(offsets), pa.py_buffer(blob)))
+        names.append(name)
+    pq.write_table(pa.Table.from_arrays(arrays, names=names), part_dir / PARQUET_NAME)
+
+
+def have_pyarrow() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class ExportResult:
+    part: Optional[str]          # None: nichts Neues
+    rows: int
+    new_sessions: int
+    continued_sessions: int
+
+
+def export(db_paths: Sequence[str], out_dir, fmt: str = "auto") -> ExportResult:
+    """
+    Exportiert alle Zeilen der Quell-DBs, die noch in keinem Teil stehen, als neuen Teil.
+    fmt: "npy", "parquet" oder "auto" (Parquet, wenn pyarrow installiert ist).
+    """
+    if fmt == "auto":
+        fmt = "parquet" if have_pyarrow() else "npy"
+    if fmt not in ("npy", "parquet"):
+        raise ValueError(f"Unbekanntes Format: {fmt}")
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(out_dir)
+
+    rows: List[tuple] = []
+    row_sources: List[str] = []
+    sessions: Dict[Tuple[str, str], int] = {}
+    last_rowids: Dict[str, int] = {}
+    for db_path in db_paths:
+        source = str(pathlib.Path(db_path).resolve())
+        state = manifest["sources"].setdefault(source, {"last_rowid": 0, "sessions": {}})
+        new_rows = _read_new_rows(source, state["last_rowid"])
+        for row in new_rows:
+            key = (source, row[1])
+            sessions[key] = sessions.get(key, 0) + 1
+        if new_rows:
+            last_rowids[source] = new_rows[-1][0]
+        rows.extend(new_rows)
+        row_sources.extend([source] * len(new_rows))
+    if not rows:
+        return ExportResult(None, 0, 0, 0)
+
+    continued = sum(1 for source, session_id in sessions
+                    if session_id in manifest["sources"][source]["sessions"])
+    columns = _build_columns(rows, row_sources, manifest)
+    name = f"part_{len(manifest['parts']):05d}"
+    tmp_dir = out_dir / f"{name}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+    if fmt == "parquet":
+        _write_parquet(tmp_dir, columns, manifest["dictionaries"])
+    else:
+        _write_npy(tmp_dir, columns)
+    shutil.rmtree(out_dir / name, ignore_errors=True)   # Rest eines Laufs ohne Manifest-Eintrag
+    os.replace(tmp_dir, out_dir / name)
+
+    # Manifest zuletzt: bricht der Export vorher ab, gilt der Teil als nie geschrieben
+    for (source, session_id), count in sessions.items():
+        state = manifest["sources"][source]
+        state["sessions"][session_id] = state["sessions"].get(session_id, 0) + count
+    for source, last_rowid in last_rowids.items():
+        manifest["sources"][source]["last_rowid"] = last_rowid
+    manifest["parts"].append({
+        "name": name,
+        "format": fmt,
+        "rows": len(rows),
+        "sessions": [list(key) for key in sessions],
+    })
+    _write_manifest(out_dir, manifest)
+    return ExportResult(name, len(rows), len(sessions) - continued, continued)
+
+
+# -------------- Loader --------------
+
+class Study:
+    """
+    Alle Teile eines Exports. column() liefert die Spalte als Array (bei einem Teil direkt
+    das mmap-Array, sonst zusammengefügt); Aufzählungen als Codes, labels() dekodiert sie.
+    """
+    def __init__(self, out_dir: pathlib.Path, manifest: Dict[str, Any], parts: List[Dict[str, Any]]):
+        self.out_dir = out_dir
+        self.manifest = manifest
+        self.parts = parts
+        self.dictionaries: Dict[str, List[str]] = manifest["dictionaries"]
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in self.dictionaries.items()}
+
+    def __len__(self) -> int:
+        return sum(part["rows"] for part in self.manifest["parts"])
+
+    @property
+    def sessions(self) -> List[str]:
+        return list(self.dictionaries["session_id"])
+
+    def column(self, name: str) -> np.ndarray:
+        if name == PAYLOAD_COLUMN:
+            raise ValueError("Payload über payload(i) bzw. payloads() lesen.")
+        arrays = [part[name] for part in self.parts]
+        if len(arrays) == 1:
+            return arrays[0]
+        if not arrays:
+            return np.empty(0, dtype=ENUM_COLUMNS.get(name) or INT_COLUMNS.get(name, "datetime64[us]"))
+        return np.concatenate(arrays)
+
+    def valid(self, name: str) -> np.ndarray:
+        """ Maske der Nicht-NULL-Werte einer ganzzahligen Spalte (NULL = INT_NULL[name]). """
+        return self.column(name) != INT_NULL[name]
+
+    def code(self, name: str, value: Optional[str]) -> int:
+        """ Code eines Werts (für Filter); unbekannte Werte → ein Code, der nie vorkommt. """
+        if value is None:
+            return NULL_CODE
+        return self._codes[name].get(value, np.iinfo(ENUM_COLUMNS[name]).min)
+
+    def labels(self, name: str, codes: Optional[np.ndarray] = None) -> np.ndarray:
+        """ Codes (Standard: ganze Spalte) → object-Array der Werte, None für NULL. """
+        table = np.array(self.dictionaries[name] + [None], dtype=object)   # Index −1 → None
+        return table[self.column(name) if codes is None else codes]
+
+    def payload(self, i: int) -> Dict[str, Any]:
+        for part in self.parts:
+            blob, offsets = part[PAYLOAD_COLUMN]
+            if i < len(offsets) - 1:
+                raw = bytes(blob[offsets[i]:offsets[i + 1]])
+                return json.loads(raw) if raw else {}
+            i -= len(offsets) - 1
+        raise IndexError(i)
+
+    def payloads(self, indices: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.payload(int(i)) for i in indices]
+
+    def to_pandas(self):
+        """ DataFrame mit Categoricals für die Aufzählungen (ohne Payload); braucht pandas. """
+        import pandas as pd
+
+        data = {}
+        for name in COLUMNS:
+            if name == PAYLOAD_COLUMN:
+                continue
+            if name in ENUM_COLUMNS:
+                data[name] = pd.Categorical.from_codes(self.column(name), self.dictionaries[name])
+            elif name in INT_COLUMNS:
+                column = np.asarray(self.column(name))
+                data[name] = pd.arrays.IntegerArray(column, column == INT_NULL[name])
+            else:
+                data[name] = self.column(name)
+        return pd.DataFrame(data)
+
+
+def _load_npy_part(part_dir: pathlib.Path, mmap_mode: Optional[str]) -> Dict[str, Any]:
+    part = {name: np.load(part_dir / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in COLUMNS if name != PAYLOAD_COLUMN}
+    part[PAYLOAD_COLUMN] = (np.load(part_dir / f"{PAYLOAD_COLUMN}.bytes.npy", mmap_mode=mmap_mode),
+                            np.load(part_dir / f"{PAYLOAD_COLUMN}.offsets.npy", mmap_mode=mmap_mode))
+    return part
+
+
+def _load_parquet_part(part_dir: pathlib.Path, memory_map: bool) -> Dict[str, Any]:
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(part_dir / PARQUET_NAME, memory_map=memory_map)
+    part: Dict[str, Any] = {}
+    for name in COLUMNS:
+        column = table.column(name).combine_chunks()
+        if name in ENUM_COLUMNS:
+            # Wörterbuch des Teils == globales Wörterbuch zum Exportzeitpunkt → Indizes sind Codes
+            part[name] = column.indices.fill_null(NULL_CODE).to_numpy().astype(ENUM_COLUMNS[name])
+        elif name in INT_COLUMNS:
+            part[name] = column.fill_null(INT_NULL[name]).to_numpy().astype(INT_COLUMNS[name])
+        elif name == TIME_COLUMN:
+            part[name] = column.to_numpy(zero_copy_only=False).astype("datetime64[us]")
+        else:
+            _, offsets, data = column.buffers()
+            offsets = np.frombuffer(offsets, dtype=np.int64)[column.offset:column.offset + len(column) + 1]
+            part[name] = (np.frombuffer(data or b"", dtype=np.uint8), offsets)
+    return part
+
+
+def load(out_dir, mmap: bool = True) -> Study:
+    """ Export laden; npy-Teile per np.load(mmap_mode="r"), Parquet mit memory_map. """
+    out_dir = pathlib.Path(out_dir)
+    manifest = read_manifest(out_dir)
+    parts = []
+    for entry in manifest["parts"]:
+        part_dir = out_dir / entry["name"]
+        if entry["format"] == "parquet":
+            parts.append(_load_parquet_part(part_dir, mmap))
+        else:
+            parts.append(_load_npy_part(part_dir, "r" if mmap else None))
+    return Study(out_dir, manifest, parts)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Event-DBs spaltenweise exportieren (npy/Parquet)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_export = sub.add_parser("export", help="neue Sessions als weiteren Teil exportieren")
+    p_export.add_argument("db", nargs="+", help="Pfad(e) zu events*.sqlite3")
+    p_export.add_argument("--out", default="logs/columnar")
+    p_export.add_argument("--format", choices=("auto", "npy", "parquet"), default="auto")
+    p_info = sub.add_parser("info", help="Teile, Zeilen und Sessions eines Exports")
+    p_info.add_argument("out", nargs="?", default="logs/columnar")
+    args = ap.parse_args()
+
+    if args.cmd == "export":
+        result = export(args.db, args.out, args.format)
+        if result.part is None:
+            print("Nichts Neues zu exportieren.")
+        else:
+            print(f"{result.part}: {result.rows} Events, {result.new_sessions} neue Sessions, "
+                  f"{result.continued_sessions} fortgesetzte")
+        return
+    manifest = read_manifest(args.out)
+    for part in manifest["parts"]:
+        print(f"{part['name']}  {part['format']:<8}{part['rows']:>10} Events{len(part['sessions']):>6} Sessions")
+    for source, state in manifest["sources"].items():
+        print(f"{source}: {len(state['sessions'])} Sessions bis rowid {state['last_rowid']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,768 @@
+# event_log.py  (gemeinsamer Event-Logger für game_engine_w/_wl und die Tabletop-UIs)
+#
+# SQLite ist der einzige Schreibpfad. Die CSV-Dateien (events.csv, session_<n>_<cond>.csv)
+# sind Views darauf: export_views() hängt neue Zeilen ab einem Wasserstand an – im
+# Async-Modus nach jedem Commit, sonst bei close(). Nach einem Absturz:
+#     python event_log.py export logs/events.sqlite3
+# Das Schema ist versioniert (PRAGMA user_version, siehe SCHEMA_VERSION): Beim Öffnen wird
+# eine ältere DB an Ort und Stelle migriert – Typspalten anlegen und aus dem JSON-Payload
+# nachfüllen, Indizes bauen. Manuell:
+#     python event_log.py migrate logs/events_*.sqlite3
+# WAL-Checkpoints übernimmt der Logger selbst (wal_limit): PASSIVE an jeder Rundengrenze,
+# TRUNCATE in Blockpausen (mark_idle) und bei close(), zusätzlich sobald das WAL die
+# Obergrenze überschreitet (im Sync-Modus erst in einer Ruhephase). Jeder Checkpoint
+# steht mit Phase und Dauer in `checkpoints`:
+#     python event_log.py checkpoints logs/events.sqlite3
+from __future__ import annotations
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+import argparse, csv, json, os, pathlib, queue, sqlite3, threading, time
+from datetime import datetime, timezone
+
+from outcome_table import UI_CALLS, UI_SIGNALS
+
+_FLUSH = object()   # Queue-Marker: offene Events sofort committen
+_STOP = object()    # Queue-Marker: restliche Events schreiben, Writer beenden
+PUT_POLL = 0.1    # s: Wartezeit je Versuch, wenn die Writer-Queue voll ist
+
+
+class _AddView(tuple):
+    """ Queue-Eintrag: View (absoluter Pfad, Header) im Writer-Thread registrieren. """
+
+
+class _Checkpoint(tuple):
+    """ Queue-Eintrag: (Anlass, Modus) – Offenes committen, dann WAL-Checkpoint im Writer-Thread. """
+
+
+class Durability(Enum):
+    EVENT = "event"   # jedes Event committen + fsync (absturzsicher pro Event)
+    PHASE = "phase"   # committen/flushen, sobald die Phase wechselt
+    ROUND = "round"   # committen/flushen an der Rundengrenze (mark_round_end)
+    CLOSE = "close"   # erst bei close() (Pilotläufe, maximale Geschwindigkeit)
+
+
+# Durability → (PRAGMA synchronous, PRAGMA wal_autocheckpoint in Seiten); der Auto-Checkpoint
+# gilt nur ohne wal_limit, sonst checkpointet der EventLogger selbst
+SQLITE_SETTINGS = {
+    Durability.EVENT: ("FULL", 1000),
+    Durability.PHASE: ("NORMAL", 1000),
+    Durability.ROUND: ("NORMAL", 1000),
+    Durability.CLOSE: ("OFF", 0),      # kein Auto-Checkpoint; Checkpoint erst bei close()
+}
+
+
+class FlushPolicy:
+    """ Entscheidet, wann der EventLogger committet (und ob CSV-Views mit fsync geschrieben werden). """
+    def __init__(self, durability: Union[Durability, str] = Durability.EVENT):
+        self.durability = Durability(durability)
+        self._last_phase: Optional[str] = None
+
+    @property
+    def fsync(self) -> bool:
+        return self.durability is Durability.EVENT
+
+    def on_event(self, phase_name: str) -> bool:
+        changed = self._last_phase is not None and phase_name != self._last_phase
+        self._last_phase = phase_name
+        if self.durability is Durability.EVENT:
+            return True
+        if self.durability is Durability.PHASE:
+            return changed
+        return False
+
+    def on_round_end(self) -> bool:
+        return self.durability is not Durability.CLOSE
+
+    @property
+    def last_phase(self) -> Optional[str]:
+        """ Phase des zuletzt geschriebenen Events. """
+        return self._last_phase
+
+
+# WAL-Verwaltung: Obergrenze in Bytes (PRAGMA journal_size_limit + Checkpoint bei Überschreitung)
+WAL_LIMIT = 4 * 2**20
+CHECKPOINT_RETRY = 1.0     # s zwischen zwei Checkpoints wegen der Obergrenze (Leser halten das WAL)
+# Phasen, in denen niemand auf eine Reaktion des Programms wartet (Engine-Phasennamen)
+IDLE_PHASES = frozenset({"WAITING_START", "REVEAL_SCORE", "ROUND_DONE", "FINISHED"})
+CHECKPOINT_HISTORY = 1000  # so viele CheckpointRecords hält EventLogger.checkpoints im Speicher
+
+
+class CheckpointRecord(NamedTuple):
+    t_utc_iso: str
+    reason: str            # "round" (Rundengrenze), "idle" (mark_idle), "limit", "close"
+    mode: str              # PASSIVE / TRUNCATE
+    phase: Optional[str]   # Phase des letzten Events davor
+    ms: float
+    wal_bytes: int         # Größe der -wal-Datei vorher
+    log_frames: int        # Rückgabe von PRAGMA wal_checkpoint
+    checkpointed: int
+    busy: int
+
+
+def flush_file(fp, fsync: bool):
+    fp.flush()
+    if fsync:
+        os.fsync(fp.fileno())
+
+
+EVENT_COLUMNS = ("session_id", "round_idx", "phase", "actor", "action",
+                 "payload", "t_mono_ns", "t_utc_iso")
+
+# Version 0/1: nur EVENT_COLUMNS, keine Indizes. Version 2: Typspalten + Indizes.
+SCHEMA_VERSION = 2
+
+# Heiße Felder aus dem Payload als eigene Spalten (Engine-Vokabular, siehe typed_fields);
+# der Payload bleibt vollständig erhalten, events.csv behält seine Spalten.
+TYPED_COLUMNS = (
+    ("card_idx", "INTEGER"),     # reveal_card: 0/1 (UI reveal_inner/_outer: card − 1)
+    ("card_value", "INTEGER"),   # reveal_card: Kartenwert
+    ("signal", "TEXT"),          # hoch/mittel/tief (UI high/mid/low umgesetzt)
+    ("call", "TEXT"),            # wahrheit/bluff (UI wahr umgesetzt)
+    ("winner", "TEXT"),          # P1/P2 (nur Rollen; UI-Showdown nennt physische Spieler)
+    ("p1_truth", "INTEGER"),     # 0/1
+    ("score_vp1", "INTEGER"),
+    ("score_vp2", "INTEGER"),
+    ("payout", "INTEGER"),       # 0/1, wo der Payload es trägt (UI round_start/showdown)
+)
+TYPED_NAMES = tuple(name for name, _ in TYPED_COLUMNS)
+EVENT_INDEXES = {
+    "events_session_round": "events(session_id, round_idx)",
+    "events_action": "events(action)",
+}
+_INSERT_EVENT = (f"INSERT INTO events({', '.join(EVENT_COLUMNS + TYPED_NAMES)}) "
+                 f"VALUES ({','.join('?' * (len(EVENT_COLUMNS) + len(TYPED_NAMES)))})")
+_NO_TYPED = (None,) * len(TYPED_NAMES)
+MIGRATE_BATCH = 10_000
+
+
+def _flag(value) -> Optional[int]:
+    return None if value is None else int(bool(value))
+
+
+def typed_fields(payload: Dict[str, Any]) -> tuple:
+    """ Werte der TYPED_COLUMNS aus einem Payload (Engine und Tabletop-UIs). """
+    if not payload:
+        return _NO_TYPED
+    card_idx = payload.get("card_idx")
+    if card_idx is None and type(payload.get("card")) is int:
+        card_idx = payload["card"] - 1
+    signal = payload.get("level", payload.get("signal_choice"))
+    call = payload.get("call", payload.get("decision", payload.get("judge_choice")))
+    winner = payload.get("winner")
+    scores = payload.get("scores")
+    if not isinstance(scores, dict):
+        scores = {}
+    return (
+        card_idx,
+        payload.get("value"),
+        UI_SIGNALS.get(signal, signal),
+        UI_CALLS.get(call, call),
+        winner if isinstance(winner, str) else None,
+        _flag(payload.get("p1_truth", payload.get("truthful"))),
+        scores.get("VP1"),
+        scores.get("VP2"),
+        _flag(payload.get("payout")),
+    )
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _migrate_events(conn: sqlite3.Connection) -> int:
+    """ Fehlende Typspalten anlegen und aus dem Payload füllen; Rückgabe: nachgefüllte Zeilen. """
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    missing = [(name, sql_type) for name, sql_type in TYPED_COLUMNS if name not in existing]
+    for name, sql_type in missing:
+        conn.execute(f"ALTER TABLE events ADD COLUMN {name} {sql_type}")
+    backfilled = 0
+    if missing:
+        assignments = ", ".join(f"{name} = ?" for name in TYPED_NAMES)
+        last_rowid = 0
+        while True:
+            # Batch vollständig lesen, bevor aktualisiert wird: kein offener SELECT-Cursor
+            # auf `events` während der UPDATEs
+            batch = conn.execute("SELECT rowid, payload FROM events WHERE rowid > ? AND payload IS NOT NULL "
+                                 "ORDER BY rowid LIMIT ?", (last_rowid, MIGRATE_BATCH)).fetchall()
+            if not batch:
+                break
+            last_rowid = batch[-1][0]
+            updates = []
+            for rowid, payload in batch:
+                try:
+                    fields = typed_fields(json.loads(payload))
+                except (ValueError, AttributeError):
+                    continue   # kaputter oder nicht-dict Payload: Typspalten bleiben NULL
+                if fields != _NO_TYPED:
+                    updates.append((*fields, rowid))
+            conn.executemany(f"UPDATE events SET {assignments} WHERE rowid = ?", updates)
+            backfilled += len(updates)
+    for name, target in EVENT_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    return backfilled
+
+
+def _create_schema(conn: sqlite3.Connection) -> int:
+    """ Legt das Schema an bzw. migriert es auf SCHEMA_VERSION; Rückgabe: nachgefüllte Zeilen. """
+    version = schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(f"Event-DB hat Schema-Version {version}, unterstützt bis {SCHEMA_VERSION}.")
+    backfilled = 0
+    if version < SCHEMA_VERSION:
+        # Migration in einer Schreibtransaktion; ein zweiter Prozess wartet und findet sie fertig vor
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        if schema_version(conn) < SCHEMA_VERSION:
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS events(
+              session_id TEXT, round_idx INT, phase TEXT, actor TEXT, action TEXT,
+              payload TEXT, t_mono_ns INTEGER, t_utc_iso TEXT,
+              {', '.join(f'{name} {sql_type}' for name, sql_type in TYPED_COLUMNS)}
+            )""")
+            backfilled = _migrate_events(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    # Zeilen abgeleiteter CSV-Views (z. B. Session-CSV), je Ziel-Datei als JSON-Liste
+    conn.execute("CREATE TABLE IF NOT EXISTS view_rows(target TEXT, row TEXT)")
+    conn.execute("CREATE INDEX IF NOT EXISTS view_rows_target ON view_rows(target)")
+    # Registrierte Views samt Wasserstand (letzte exportierte rowid, Dateigröße danach)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS views(
+      target TEXT PRIMARY KEY, source TEXT, header TEXT,
+      first_rowid INTEGER, last_rowid INTEGER, file_size INTEGER
+    )""")
+    # Protokoll der WAL-Checkpoints (CheckpointRecord)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS checkpoints(
+      t_utc_iso TEXT, reason TEXT, mode TEXT, phase TEXT, ms REAL,
+      wal_bytes INTEGER, log_frames INTEGER, checkpointed INTEGER, busy INTEGER
+    )""")
+    return backfilled
+
+
+def _register_view(conn: sqlite3.Connection, target: str, source: str,
+                   header: Optional[Sequence[str]] = None):
+    """ Legt den View an; eine bestehende Datei wird fortgesetzt, nicht überschrieben. """
+    path = pathlib.Path(target)
+    size = path.stat().st_size if path.exists() else 0
+    first = 0
+    if source == "events":
+        first = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM events").fetchone()[0]
+    conn.execute(
+        "INSERT OR IGNORE INTO views VALUES (?,?,?,?,?,?)",
+        (target, source, None if header is None else json.dumps(list(header), ensure_ascii=False),
+         first, first, size),
+    )
+
+
+def _export_view(conn: sqlite3.Connection, target: str, source: str, header: Optional[str],
+                 first_rowid: int, last_rowid: int, file_size: int, fsync: bool) -> int:
+    path = pathlib.Path(target)
+    actual = path.stat().st_size if path.exists() else None
+    if actual is None or actual < file_size:
+        # View fehlt oder wurde gekürzt → komplett neu aufbauen
+        last_rowid, file_size, mode = first_rowid, 0, "w"
+    else:
+        mode = "a"
+    if source == "events":
+        rows = conn.execute(
+            f"SELECT rowid, {', '.join(EVENT_COLUMNS)} FROM events WHERE rowid > ? ORDER BY rowid",
+            (last_rowid,),
+        ).fetchall()
+    else:
+        rows = [(rowid, *json.loads(row)) for rowid, row in conn.execute(
+            "SELECT rowid, row FROM view_rows WHERE target = ? AND rowid > ? ORDER BY rowid",
+            (target, last_rowid),
+        )]
+    if mode == "a":
+        if actual == file_size and not rows and (actual > 0 or not header):
+            return 0
+        if actual > file_size:
+            # halb geschriebene Zeilen eines abgebrochenen Exports verwerfen
+            with open(path, "r+b") as fp:
+                fp.truncate(file_size)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, mode, encoding="utf-8", newline="") as fp:
+        writer = csv.writer(fp)
+        if header and file_size == 0:
+            writer.writerow(json.loads(header))
+        writer.writerows(row[1:] for row in rows)
+        flush_file(fp, fsync)
+    if rows:
+        last_rowid = rows[-1][0]
+    conn.execute("UPDATE views SET last_rowid = ?, file_size = ? WHERE target = ?",
+                 (last_rowid, path.stat().st_size, target))
+    return len(rows)
+
+
+def _export_all(conn: sqlite3.Connection, fsync: bool = False,
+                targets: Optional[Set[str]] = None) -> int:
+    """ `targets`: nur diese view_rows-Views (plus events.csv) fortschreiben, sonst alle. """
+    views = conn.execute(
+        "SELECT target, source, header, first_rowid, last_rowid, file_size FROM views"
+    ).fetchall()
+    written = sum(_export_view(conn, *view, fsync=fsync) for view in views
+                  if targets is None or view[1] == "events" or view[0] in targets)
+    conn.commit()
+    return written
+
+
+def export_views(db_path: str, fsync: bool = True) -> int:
+    """ Schreibt alle CSV-Views einer Event-DB fort (z. B. nach einem Absturz). """
+    conn = sqlite3.connect(db_path)
+    try:
+        _create_schema(conn)
+        return _export_all(conn, fsync)
+    finally:
+        conn.close()
+
+
+class EventLogger:
+    """
+    Schreibt jedes Event nach SQLite (Tabelle `events`); events.csv und weitere CSV-Views
+    (`views`: Zielpfad → Header, Zeilen über log(view_target=..., view_row=...)) werden
+    daraus exportiert.
+
+    Standard ist synchron: log() schreibt im aufrufenden Thread. Mit async_mode=True legt
+    log() die Zeile nur in eine begrenzte Queue und kehrt direkt zurück; ein Writer-Thread
+    schreibt und committet gebündelt, sobald `batch_size` Events anliegen oder das älteste
+    offene Event `batch_interval` Sekunden wartet; von der Durability verlangte Commits
+    fassen alles zusammen, was bereits in der Queue steht. flush() ist eine Barriere,
+    close() schreibt alles Ausstehende, bevor die Dateien geschlossen werden.
+    Jedes Event bekommt eine fortlaufende Sequenznummer ("seq" im Rückgabewert).
+
+    `durability` legt fest, wann spätestens committet wird (siehe Durability und
+    SQLITE_SETTINGS); mark_round_end() markiert die Rundengrenze.
+
+    Mit `wal_limit` (Bytes, Standard WAL_LIMIT) checkpointet der Logger selbst statt
+    SQLites Auto-Checkpoint, der mitten in einer Eingabephase beim Commit anfiele: PASSIVE
+    an der Rundengrenze, per mark_idle() in Pausen, TRUNCATE bei close() und PASSIVE, sobald
+    die -wal-Datei nach einem Commit größer als `wal_limit` ist. Im Async-Modus laufen alle
+    Checkpoints im Writer-Thread; im Sync-Modus wartet der Checkpoint wegen der Obergrenze
+    auf einen Commit in einer Phase aus IDLE_PHASES bzw. auf mark_round_end()/mark_idle(). wal_limit=None: altes Verhalten (nur Auto-Checkpoint).
+    """
+    def __init__(self, db_path: str, csv_path: Optional[str] = None, *,
+                 views: Optional[Dict[str, Sequence[str]]] = None,
+                 async_mode: bool = False, batch_size: int = 64,
+                 batch_interval: float = 0.05, queue_size: int = 10_000,
+                 durability: Union[Durability, str] = Durability.EVENT,
+                 wal_limit: Optional[int] = WAL_LIMIT):
+        pathlib.Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.policy = FlushPolicy(durability)
+        self.wal_path = f"{db_path}-wal"
+        self.wal_limit = wal_limit
+        self.checkpoints: deque = deque(maxlen=CHECKPOINT_HISTORY)
+        self._last_limit_checkpoint = float("-inf")
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        synchronous, autocheckpoint = SQLITE_SETTINGS[self.policy.durability]
+        self.conn.execute(f"PRAGMA synchronous={synchronous};")
+        if wal_limit:
+            autocheckpoint = 0
+            # nach einem Checkpoint kürzt SQLite die -wal-Datei auf höchstens diese Größe
+            self.conn.execute(f"PRAGMA journal_size_limit={int(wal_limit)};")
+        self.conn.execute(f"PRAGMA wal_autocheckpoint={autocheckpoint};")
+        _create_schema(self.conn)
+        if csv_path:
+            _register_view(self.conn, str(pathlib.Path(csv_path).resolve()), "events")
+        self._view_targets: Dict[str, str] = {}   # Pfad wie übergeben → absoluter Pfad
+        self._dirty_views: Set[str] = set()       # Views mit neuen, noch nicht exportierten Zeilen
+        for target, header in (views or {}).items():
+            self._view_targets[target] = str(pathlib.Path(target).resolve())
+            _register_view(self.conn, self._view_targets[target], "view_rows", header)
+        self.conn.commit()
+
+        self.async_mode = async_mode
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = batch_interval
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+        self._pending_seq = 0
+        self._written_seq = 0
+        self._written = threading.Condition()
+        self._writer_error: Optional[BaseException] = None
+        self._closed = False
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if async_mode:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(
+                target=self._writer_loop, name="EventLogger-writer", daemon=True
+            )
+            self._thread.start()
+
+    def log(self, session_id: str, round_idx: int, phase,
+            actor: str, action: str, payload: Dict[str, Any],
+            view_target: Optional[str] = None,
+            view_row: Optional[Callable[[str], Optional[List[Any]]]] = None):
+        """
+        `view_row(t_utc_iso)` liefert optional die Zeile für den (in `views` registrierten)
+        View `view_target`; sie wird im selben Commit wie das Event gespeichert.
+        """
+        t_mono_ns = time.perf_counter_ns()
+        t_utc_iso = datetime.now(timezone.utc).isoformat()
+        row = (session_id, round_idx, phase.name, actor, action,
+               json.dumps(payload, ensure_ascii=False), t_mono_ns, t_utc_iso,
+               *typed_fields(payload))
+        view = None
+        if view_row is not None:
+            values = view_row(t_utc_iso)
+            if values is not None:
+                view = (self._view_targets[view_target],
+                        json.dumps(values, ensure_ascii=False))
+        with self._seq_lock:
+            self._seq += 1
+            seq = self._seq
+            if self._queue is not None:
+                # Einreihen noch unter dem Lock: der Writer sieht die Events in seq-Reihenfolge,
+                # sonst könnte _pending_seq hinter einen schon committeten seq zurückfallen
+                self._put((seq, row, view))   # blockiert nur, wenn die Queue voll ist
+        if self._queue is None:
+            self._insert(seq, row, view)
+            if self.policy.on_event(row[2]):
+                self._commit()
+        return {
+            "seq": seq,
+            "session_id": session_id,
+            "round_idx": round_idx,
+            "phase": phase.name,
+            "actor": actor,
+            "action": action,
+            "payload": payload,
+            "t_utc_iso": t_utc_iso,
+        }
+
+    @property
+    def written_seq(self) -> int:
+        """ Höchste Sequenznummer, die bereits committet ist. """
+        return self._written_seq
+
+    def add_view(self, target: str, header: Sequence[str]):
+        """
+        Registriert nachträglich einen CSV-View (z. B. die Session-CSV eines weiteren
+        Tisches im SessionHost). Nur aus dem Thread aufrufen, der auch log() aufruft.
+        """
+        if target in self._view_targets:
+            return
+        self._view_targets[target] = str(pathlib.Path(target).resolve())
+        if self._queue is not None:
+            # Die Verbindung gehört dem Writer-Thread → dort registrieren, vor späteren Events
+            self._raise_writer_error()
+            self._put(_AddView((self._view_targets[target], header)))
+        else:
+            _register_view(self.conn, self._view_targets[target], "view_rows", header)
+
+    def export_views(self, targets: Optional[Set[str]] = None) -> int:
+        """ Schreibt die CSV-Views fort (nur aus dem Thread, der gerade schreibt). """
+        return _export_all(self.conn, self.policy.fsync, targets)
+
+    def mark_round_end(self, wait: bool = True):
+        """
+        Rundengrenze: committet, sofern die Durability das verlangt (nicht bei CLOSE), und
+        checkpointet das WAL (PASSIVE). Mit wait=False wird der Commit im Async-Modus nur
+        angestoßen, nicht abgewartet; der Checkpoint wird dort nie abgewartet.
+        """
+        if not self.policy.on_round_end():
+            return
+        if wait or self._queue is None:
+            self.flush()
+        elif not self._closed:
+            self._raise_writer_error()
+            self._put(_FLUSH)
+        self._request_checkpoint("round", "PASSIVE")
+
+    def mark_idle(self, truncate: bool = True):
+        """
+        Längere Pause ohne Eingaben (z. B. Blockpause): Offenes committen und das WAL
+        zurückschreiben, mit truncate=True auch die -wal-Datei auf 0 Bytes kürzen.
+        Im Async-Modus nur angestoßen. Ohne Wirkung bei wal_limit=None und bei CLOSE.
+        """
+        if self.policy.on_round_end():
+            self._request_checkpoint("idle", "TRUNCATE" if truncate else "PASSIVE")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Barriere: wartet, bis alle bis jetzt geloggten Events committet sind.
+        Rückgabe False, falls `timeout` abläuft.
+        """
+        if self._closed:
+            return True
+        if self._queue is None:
+            self._commit()
+            return True
+        target = self._seq
+        with self._written:
+            if self._written_seq >= target:
+                return True
+        self._put(_FLUSH)
+        with self._written:
+            done = self._written.wait_for(
+                lambda: self._written_seq >= target or self._writer_error is not None,
+                timeout,
+            )
+        self._raise_writer_error()
+        return done
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            if self._writer_error is None and self._thread.is_alive():
+                try:
+                    self._put(_STOP)
+                except RuntimeError:
+                    pass   # Writer inzwischen gestorben: Fehler kommt unten
+            self._thread.join()
+        elif self._writer_error is None:
+            self._commit()
+        if self._writer_error is None:
+            self.export_views()
+        if self._writer_error is None and (self.wal_limit or self.policy.durability is Durability.CLOSE):
+            self._checkpoint("close", "TRUNCATE")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")   # Protokollzeile wieder aus dem WAL
+        self.conn.close()
+        self._raise_writer_error()
+
+    # --- Interna ---
+
+    def _insert(self, seq: int, row: tuple, view: Optional[tuple]):
+        self.conn.execute(_INSERT_EVENT, row)
+        if view is not None:
+            self.conn.execute("INSERT INTO view_rows VALUES (?,?)", view)
+            self._dirty_views.add(view[0])
+        self._pending_seq = seq
+
+    def _commit(self):
+        if self._pending_seq <= self._written_seq:
+            return
+        self.conn.commit()
+        with self._written:
+            self._written_seq = self._pending_seq
+            self._written.notify_all()
+        if self.async_mode:
+            # Writer-Thread: CSV-Views laufend fortschreiben, nur die mit neuen Zeilen
+            self.export_views(self._dirty_views)
+            self._dirty_views.clear()
+        if (self.wal_limit and self._limit_checkpoint_allowed() and self._wal_size() > self.wal_limit
+                and time.monotonic() - self._last_limit_checkpoint >= CHECKPOINT_RETRY):
+            self._checkpoint("limit", "PASSIVE")
+
+    def _limit_checkpoint_allowed(self) -> bool:
+        # Sync-Modus: _commit() läuft im Thread des Aufrufers (UI), dort nur in Ruhephasen;
+        # sonst übernimmt der nächste Commit in einer Ruhephase bzw. mark_round_end()/mark_idle()
+        if self._queue is not None:
+            return True
+        phase = self.policy.last_phase
+        return phase is None or phase in IDLE_PHASES
+
+    def _wal_size(self) -> int:
+        try:
+            return os.stat(self.wal_path).st_size
+        except OSError:
+            return 0
+
+    def _request_checkpoint(self, reason: str, mode: str):
+        if not self.wal_limit or self._closed:
+            return
+        if self._queue is None:
+            self._checkpoint(reason, mode)
+        else:
+            self._raise_writer_error()
+            self._put(_Checkpoint((reason, mode)))
+
+    def _checkpoint(self, reason: str, mode: str) -> CheckpointRecord:
+        """ Nur im schreibenden Thread. Offene Events werden vorher committet. """
+        self._last_limit_checkpoint = time.monotonic()   # kein zweiter Checkpoint aus _commit()
+        self._commit()
+        wal_bytes = self._wal_size()
+        t0 = time.perf_counter()
+        busy, log_frames, checkpointed = self.conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+        record = CheckpointRecord(
+            datetime.now(timezone.utc).isoformat(), reason, mode, self.policy.last_phase,
+            (time.perf_counter() - t0) * 1000.0, wal_bytes, log_frames, checkpointed, busy,
+        )
+        self.checkpoints.append(record)
+        self.conn.execute("INSERT INTO checkpoints VALUES (?,?,?,?,?,?,?,?,?)", record)
+        self.conn.commit()   # sofort: eine offene Schreibtransaktion hielte die Schreibsperre
+        return record
+
+    def _writer_loop(self):
+        pending = 0
+        commit_due = False
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None   # Intervall abgelaufen
+            try:
+                if item is None or item is _FLUSH or item is _STOP:
+                    commit_now = pending > 0
+                elif isinstance(item, _AddView):
+                    target, header = item
+                    _register_view(self.conn, target, "view_rows", header)
+                    commit_now = False
+                elif isinstance(item, _Checkpoint):
+                    self._checkpoint(*item)   # committet Offenes mit
+                    pending = 0
+                    deadline = None
+                    commit_due = False
+                    commit_now = False
+                else:
+                    seq, row, view = item
+                    self._insert(seq, row, view)
+                    pending += 1
+                    if deadline is None:
+                        deadline = time.monotonic() + self.batch_interval
+                    # Durability-Commit erst, wenn die Queue leer ist: alles, was schon
+                    # ansteht, landet im selben Commit (Gruppen-Commit)
+                    commit_due = self.policy.on_event(row[2]) or commit_due
+                    commit_now = (commit_due and self._queue.empty()) or pending >= self.batch_size
+                if commit_now:
+                    self._commit()
+                    pending = 0
+                    deadline = None
+                    commit_due = False
+            except BaseException as exc:   # Fehler an log()/flush()/close() weiterreichen
+                with self._written:
+                    self._writer_error = exc
+                    self._written.notify_all()
+                return
+            if item is _STOP:
+                return
+
+    def _put(self, item):
+        """ queue.put, das nicht ewig blockiert, wenn der Writer bei voller Queue gestorben ist. """
+        while True:
+            self._raise_writer_error()
+            if not self._thread.is_alive():
+                raise RuntimeError("EventLogger-Writer läuft nicht mehr.")
+            try:
+                self._queue.put(item, timeout=PUT_POLL)
+                return
+            except queue.Full:
+                continue
+
+    def _raise_writer_error(self):
+        if self._writer_error is not None:
+            raise RuntimeError(f"EventLogger-Writer fehlgeschlagen: {self._writer_error}")
+
+
+class NullEventLogger:
+    """
+    Gleiche Schnittstelle wie EventLogger, schreibt aber nichts (Replay, Simulation).
+    `sink` bekommt optional jedes Event als dict wie der Rückgabewert von EventLogger.log().
+    """
+    def __init__(self, sink: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.sink = sink
+        self._seq = 0
+
+    def log(self, session_id: str, round_idx: int, phase,
+            actor: str, action: str, payload: Dict[str, Any],
+            view_target: Optional[str] = None,
+            view_row: Optional[Callable[[str], Optional[List[Any]]]] = None):
+        self._seq += 1
+        data = {
+            "seq": self._seq,
+            "session_id": session_id,
+            "round_idx": round_idx,
+            "phase": phase.name,
+            "actor": actor,
+            "action": action,
+            "payload": payload,
+            "t_utc_iso": None,
+        }
+        if self.sink is not None:
+            self.sink(data)
+        return data
+
+    @property
+    def written_seq(self) -> int:
+        return self._seq
+
+    def add_view(self, target: str, header: Sequence[str]):
+        pass
+
+    def export_views(self, targets: Optional[Set[str]] = None) -> int:
+        return 0
+
+    def mark_round_end(self, wait: bool = True):
+        pass
+
+    def mark_idle(self, truncate: bool = True):
+        pass
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+def migrate(db_path: str) -> Tuple[int, int]:
+    """ Bringt eine Event-DB auf SCHEMA_VERSION; Rückgabe: (alte Version, nachgefüllte Zeilen). """
+    conn = sqlite3.connect(db_path)
+    try:
+        before = schema_version(conn)
+        return before, _create_schema(conn)
+    finally:
+        conn.close()
+
+
+def checkpoint_report(db_path: str) -> List[Tuple[str, str, int, float, float, int]]:
+    """ Je (Anlass, Phase): Anzahl, mittlere und maximale Dauer in ms, davon busy. """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'checkpoints'").fetchone() is None:
+            return []
+        return conn.execute(
+            "SELECT reason, COALESCE(phase, '-'), COUNT(*), AVG(ms), MAX(ms), SUM(busy) "
+            "FROM checkpoints GROUP BY reason, phase ORDER BY reason, phase"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def print_checkpoint_report(db_path: str) -> int:
+    """ Rückgabe: Anzahl Checkpoints außerhalb von IDLE_PHASES (außer bei close()). """
+    print(f"{db_path}")
+    print(f"  {'Anlass':<8}{'Phase':<16}{'Anzahl':>7}{'Ø ms':>9}{'max ms':>9}{'busy':>6}")
+    critical = 0
+    for reason, phase, count, avg_ms, max_ms, busy in checkpoint_report(db_path):
+        flag = ""
+        if reason != "close" and phase not in IDLE_PHASES:
+            critical += count
+            flag = "  ← Eingabephase"
+        print(f"  {reason:<8}{phase:<16}{count:>7}{avg_ms:>9.2f}{max_ms:>9.2f}{busy:>6}{flag}")
+    return critical
+
+
+def main():
+    ap = argparse.ArgumentParser(description="CSV-Views exportieren bzw. Schema einer Event-DB migrieren")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    exp = sub.add_parser("export", help="events.csv/Session-CSVs fortschreiben")
+    exp.add_argument("db", nargs="+", help="Pfad(e) zu events*.sqlite3")
+    mig = sub.add_parser("migrate", help=f"auf Schema-Version {SCHEMA_VERSION} bringen (in place)")
+    mig.add_argument("db", nargs="+", help="Pfad(e) zu events*.sqlite3")
+    chk = sub.add_parser("checkpoints", help="WAL-Checkpoints je Anlass und Phase auswerten")
+    chk.add_argument("db", nargs="+", help="Pfad(e) zu events*.sqlite3")
+    args = ap.parse_args()
+    if args.cmd == "checkpoints":
+        critical = sum(print_checkpoint_report(db) for db in args.db)
+        if critical:
+            print(f"{critical} Checkpoint(s) in Eingabephasen")
+            raise SystemExit(1)
+        return
+    for db in args.db:
+        if args.cmd == "migrate":
+            before, backfilled = migrate(db)
+            print(f"{db}: Version {before} → {SCHEMA_VERSION}, {backfilled} Zeilen nachgefüllt")
+        else:
+            print(f"{db}: {export_views(db)} Zeilen exportiert")
+
+
+if __name__ == "__main__":
+    main()
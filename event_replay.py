@@ -0,0 +1,344 @@
+# event_replay.py  (Sessions aus events.sqlite3 durch die GameEngine nachspielen und prüfen)
+#
+# Liest die Tabelle `events` streamend (nach rowid), teilt sie je session_id in Läufe
+# (ein Lauf endet mit phase_change → FINISHED oder einem neuen start_click) und spielt jeden
+# Lauf über die öffentliche API der Engine nach – mit NullEventLogger, also ohne Schreiben.
+# Jedes Event, das die Engine dabei erzeugt (Phasenwechsel, reveal_and_score, Punkte …),
+# muss dem geloggten Event entsprechen; Abweichungen landen im ReplayResult.
+# Abgeschlossene Läufe werden sofort an einen Prozess-Pool gegeben. Nachspielbar sind
+# Sessions der GameEngine (game_engine_w/_wl); Tabletop-Events (reveal_inner, showdown …)
+# werden als unbekannte Aktion gemeldet.
+#     python event_replay.py logs/events.sqlite3 --workers 8
+#     python event_replay.py logs/events.sqlite3 --session 12 --time-scale 10
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+import argparse
+import importlib
+import json
+import multiprocessing
+import sqlite3
+import sys
+import time
+
+from event_log import NullEventLogger
+from outcome_table import CARD_VALUES
+
+PLAYER_ACTIONS = ("start_click", "reveal_card", "signal", "call", "next_round_click")
+RESUME_ACTION = "session_resumed"    # SYS-Event von GameEngine.restore_state (Absturz-Fortsetzung)
+CONFIG_ACTION = "session_config"     # SYS-Event beim Start: Block, Bedingung, Payout der Session
+VARIANTS = ("w", "wl")
+MAX_MISMATCHES = 20          # weitere Abweichungen eines Laufs werden nur gezählt
+
+
+@dataclass
+class LoggedEvent:
+    rowid: int
+    session_id: str
+    round_idx: int
+    phase: str
+    actor: str
+    action: str
+    payload: Dict[str, Any]
+    t_mono_ns: int
+
+    def key(self):
+        return (self.round_idx, self.phase, self.actor, self.action, self.payload)
+
+
+@dataclass
+class ReplayResult:
+    session_id: str
+    run: int                              # laufende Nummer des Laufs innerhalb der session_id
+    variant: str
+    first_rowid: int
+    n_events: int = 0
+    n_rounds: int = 0
+    finished: bool = False
+    seconds: float = 0.0
+    n_mismatches: int = 0
+    mismatches: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.n_mismatches == 0
+
+    def add_mismatch(self, text: str):
+        self.n_mismatches += 1
+        if len(self.mismatches) < MAX_MISMATCHES:
+            self.mismatches.append(text)
+
+
+# -------------- Lesen --------------
+
+def connect_readonly(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def iter_events(db_path: str, sessions: Optional[Sequence[str]] = None) -> Iterator[LoggedEvent]:
+    """ Streamt die Events in Schreibreihenfolge (Cursor, kein fetchall). """
+    conn = connect_readonly(db_path)
+    try:
+        sql = ("SELECT rowid, session_id, round_idx, phase, actor, action, payload, t_mono_ns "
+               "FROM events")
+        params: Sequence[Any] = ()
+        if sessions:
+            sql += f" WHERE session_id IN ({','.join('?' * len(sessions))})"
+            params = list(sessions)
+        for rowid, sid, round_idx, phase, actor, action, payload, t_ns in conn.execute(
+                sql + " ORDER BY rowid", params):
+            yield LoggedEvent(rowid, sid, round_idx, phase, actor, action,
+                              json.loads(payload) if payload else {}, t_ns or 0)
+    finally:
+        conn.close()
+
+
+def _starts_new_run(run: List[LoggedEvent], event: LoggedEvent) -> bool:
+    if not run:
+        return False
+    last = run[-1]
+    if last.action == "phase_change" and last.payload.get("to") == "FINISHED":
+        return True
+    # Neustart derselben session_id (z. B. nach Abbruch): start_click, obwohl schon gespielt
+    return (event.action == "start_click" and event.phase == "WAITING_START"
+            and any(e.phase != "WAITING_START" for e in run))
+
+
+def split_runs(events: Iterable[LoggedEvent]) -> Iterator[List[LoggedEvent]]:
+    """
+    Gruppiert den Event-Strom je session_id in Läufe. Ein Lauf wird geliefert, sobald er
+    abgeschlossen ist; unvollständige Läufe am Ende des Stroms.
+    """
+    open_runs: Dict[str, List[LoggedEvent]] = {}
+    for event in events:
+        run = open_runs.setdefault(event.session_id, [])
+        if _starts_new_run(run, event):
+            yield run
+            run = open_runs[event.session_id] = []
+        run.append(event)
+    yield from (run for run in open_runs.values() if run)
+
+
+# -------------- Rekonstruktion --------------
+
+def detect_variant(events: Sequence[LoggedEvent]) -> str:
+    """
+    _wl: Punkte ändern sich um ±1 für beide (Summe konstant) und next_round_click trägt
+    bereits den Index der nächsten Runde. Ohne Hinweise: "w".
+    """
+    for event in events:
+        if event.action == "call" and event.payload.get("winner") and "scores" in event.payload:
+            scores = list(event.payload["scores"].values())
+            return "wl" if abs(scores[0] - scores[1]) % 2 == 0 else "w"
+    reveal_round = None
+    for event in events:
+        if event.action == "reveal_and_score":
+            reveal_round = event.round_idx
+        elif event.action == "next_round_click" and reveal_round is not None:
+            return "wl" if event.round_idx > reveal_round else "w"
+    return "w"
+
+
+def start_points(events: Sequence[LoggedEvent], variant: str) -> int:
+    """ _wl: Summe der Punkte bleibt 2 × Startwert; _w startet immer bei 0. """
+    if variant != "wl":
+        return 0
+    for event in events:
+        if event.action == "call" and "scores" in event.payload:
+            return sum(event.payload["scores"].values()) // 2
+    return 0
+
+
+def rebuild_plans(engine_mod, events: Sequence[LoggedEvent]):
+    """ Karten je Runde aus reveal_and_score (bzw. reveal_card für angebrochene Runden). """
+    cards: Dict[int, Dict[str, List[Optional[int]]]] = {}
+    for event in events:
+        if event.action == "reveal_and_score":
+            cards[event.round_idx] = {"VP1": list(event.payload["vp1_cards"]),
+                                      "VP2": list(event.payload["vp2_cards"])}
+        elif event.action == "reveal_card":
+            vp = event.payload.get("role_vp")
+            hand = cards.setdefault(event.round_idx, {"VP1": [None, None], "VP2": [None, None]})
+            if vp in hand and hand[vp][event.payload["card_idx"]] is None:
+                hand[vp][event.payload["card_idx"]] = event.payload["value"]
+    n_rounds = max(e.round_idx for e in events) + 1
+    fallback = CARD_VALUES[0]     # nie aufgedeckte Karte: Wert spielt keine Rolle
+
+    def hand(idx, vp):
+        values = cards.get(idx, {}).get(vp, [None, None])
+        return tuple(fallback if v is None else v for v in values)
+
+    return [engine_mod.RoundPlan(vp1_cards=hand(i, "VP1"), vp2_cards=hand(i, "VP2"))
+            for i in range(n_rounds)]
+
+
+# -------------- Replay --------------
+
+def _drive(engine_mod, engine, event: LoggedEvent):
+    if event.action == RESUME_ACTION:
+        engine.restore_state(event.payload["state"])
+        return
+    player = engine_mod.Player(event.actor)
+    if event.action == "start_click":
+        engine.click_start(player)
+    elif event.action == "reveal_card":
+        engine.click_reveal_card(player, event.payload["card_idx"])
+    elif event.action == "signal":
+        engine.p1_signal(engine_mod.SignalLevel(event.payload["level"]))
+    elif event.action == "call":
+        engine.p2_call(engine_mod.Call(event.payload["call"]), event.payload.get("p1_truth_ui"))
+    elif event.action == "next_round_click":
+        engine.click_next_round(player)
+
+
+def _describe(event) -> str:
+    if event is None:
+        return "—"
+    if isinstance(event, LoggedEvent):
+        return (f"#{event.rowid} R{event.round_idx} {event.phase} {event.actor}/{event.action} "
+                f"{json.dumps(event.payload, ensure_ascii=False)}")
+    return (f"R{event['round_idx']} {event['phase']} {event['actor']}/{event['action']} "
+            f"{json.dumps(event['payload'], ensure_ascii=False)}")
+
+
+def replay_run(events: Sequence[LoggedEvent], *, run: int = 0, variant: Optional[str] = None,
+               time_scale: Optional[float] = None, schedule_csv: Optional[str] = None) -> ReplayResult:
+    """
+    Spielt einen Lauf nach. `variant` None = automatisch erkennen. `time_scale` None/0 =
+    so schnell wie möglich, sonst Wartezeiten aus t_mono_ns geteilt durch time_scale.
+    `schedule_csv` prüft zusätzlich gegen den echten Schedule statt ihn aus den Events
+    zu rekonstruieren.
+    """
+    variant = variant or detect_variant(events)
+    if variant not in VARIANTS:
+        raise ValueError(f"Unbekannte Variante: {variant!r}")
+    engine_mod = importlib.import_module(f"game_engine_{variant}")
+    result = ReplayResult(events[0].session_id, run, variant, events[0].rowid)
+    t_start = time.perf_counter()
+
+    emitted: deque = deque()
+    expected: deque = deque()
+    config = next((e.payload for e in events if e.action == CONFIG_ACTION), None)
+    cfg = engine_mod.GameEngineConfig(
+        session_id=events[0].session_id, csv_path=schedule_csv or "",
+        payout=any("scores" in e.payload for e in events if e.action == "call"),
+        payout_start_points=start_points(events, variant),
+    )
+    if config is not None:
+        cfg.session_number = config.get("session_number")
+        cfg.block = config.get("block", cfg.block)
+        cfg.condition = config.get("condition", cfg.condition)
+        cfg.payout = bool(config.get("payout", cfg.payout))
+    if schedule_csv:
+        schedule = engine_mod.RoundSchedule(schedule_csv)
+    else:
+        schedule = engine_mod.RoundSchedule.from_plans(rebuild_plans(engine_mod, events))
+    sink = lambda data: emitted.append(  # noqa: E731
+        dict(data, payload=json.loads(json.dumps(data["payload"], ensure_ascii=False))))
+    engine = engine_mod.GameEngine(cfg, schedule=schedule, logger=NullEventLogger(sink))
+
+    wall0, mono0 = time.perf_counter(), events[0].t_mono_ns
+    try:
+        for event in events:
+            expected.append(event)
+            if event.actor in ("P1", "P2") or event.action == RESUME_ACTION:
+                if event.action not in PLAYER_ACTIONS + (RESUME_ACTION,):
+                    result.add_mismatch(f"Unbekannte Aktion: {_describe(event)}")
+                    break
+                if time_scale:
+                    delay = (event.t_mono_ns - mono0) / 1e9 / time_scale
+                    remaining = wall0 + delay - time.perf_counter()
+                    if remaining > 0:
+                        time.sleep(remaining)
+                try:
+                    _drive(engine_mod, engine, event)
+                except (RuntimeError, ValueError) as exc:
+                    result.add_mismatch(f"Engine lehnt ab ({exc}): {_describe(event)}")
+                    break
+            while emitted and expected:
+                if config is None and emitted[0]["action"] == CONFIG_ACTION:
+                    emitted.popleft()     # ältere Logs ohne session_config
+                    continue
+                got, want = emitted.popleft(), expected.popleft()
+                if (got["round_idx"], got["phase"], got["actor"], got["action"],
+                        got["payload"]) != want.key():
+                    result.add_mismatch(f"erwartet {_describe(want)} | Engine {_describe(got)}")
+        for want in expected:
+            result.add_mismatch(f"nicht reproduziert: {_describe(want)}")
+        for got in emitted:
+            if config is None and got["action"] == CONFIG_ACTION:
+                continue
+            result.add_mismatch(f"zusätzlich von der Engine: {_describe(got)}")
+    finally:
+        engine.close()
+
+    result.n_events = len(events)
+    result.n_rounds = engine.current.index + 1
+    result.finished = engine.current.phase is engine_mod.Phase.FINISHED
+    result.seconds = time.perf_counter() - t_start
+    return result
+
+
+def _replay_job(args) -> ReplayResult:
+    events, run, variant, time_scale, schedule_csv = args
+    return replay_run(events, run=run, variant=variant, time_scale=time_scale,
+                      schedule_csv=schedule_csv)
+
+
+def replay_database(db_path: str, *, sessions: Optional[Sequence[str]] = None,
+                    variant: Optional[str] = None, time_scale: Optional[float] = None,
+                    schedule_csv: Optional[str] = None,
+                    workers: Optional[int] = None) -> Iterator[ReplayResult]:
+    """
+    Alle Läufe der DB nachspielen; Ergebnisse in Abschlussreihenfolge.
+    workers=1 spielt im aufrufenden Prozess, None = ein Prozess pro CPU.
+    """
+    run_numbers: Dict[str, int] = {}
+
+    def jobs():
+        for events in split_runs(iter_events(db_path, sessions)):
+            sid = events[0].session_id
+            run_numbers[sid] = run_numbers.get(sid, -1) + 1
+            yield events, run_numbers[sid], variant, time_scale, schedule_csv
+
+    if workers == 1:
+        yield from map(_replay_job, jobs())
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_replay_job, jobs())
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Sessions aus einer Event-DB nachspielen und prüfen")
+    ap.add_argument("db", help="Pfad zu events*.sqlite3")
+    ap.add_argument("--session", action="append", help="nur diese session_id (mehrfach möglich)")
+    ap.add_argument("--variant", choices=VARIANTS, help="Engine-Variante (Standard: erkennen)")
+    ap.add_argument("--time-scale", type=float, default=0.0,
+                    help="0 = maximale Geschwindigkeit, 1 = Echtzeit, 10 = zehnfach")
+    ap.add_argument("--csv", help="Schedule-CSV zum Abgleich (sonst aus den Events rekonstruiert)")
+    ap.add_argument("--workers", type=int, default=None, help="Prozesse (Standard: CPU-Anzahl)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    n_runs = n_bad = n_events = 0
+    for result in replay_database(args.db, sessions=args.session, variant=args.variant,
+                                  time_scale=args.time_scale, schedule_csv=args.csv,
+                                  workers=args.workers):
+        n_runs += 1
+        n_events += result.n_events
+        state = "OK" if result.ok else f"{result.n_mismatches} Abweichung(en)"
+        done = "beendet" if result.finished else "unvollständig"
+        print(f"{result.session_id} Lauf {result.run} [{result.variant}] "
+              f"{result.n_rounds} Runden, {result.n_events} Events, {done}: {state}")
+        if not result.ok:
+            n_bad += 1
+            for text in result.mismatches:
+                print(f"    {text}")
+    elapsed = time.perf_counter() - t0
+    print(f"{n_runs} Läufe, {n_events} Events in {elapsed:.2f} s; {n_bad} mit Abweichungen")
+    sys.exit(1 if n_bad else 0)
+
+
+if __name__ == "__main__":
+    main()
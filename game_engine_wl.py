@@ -2,9 +2,14 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional, Dict, Any, Tuple
-import csv, time, json, sqlite3, pathlib
-from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple, Callable, FrozenSet, Mapping
+import pathlib, functools
+from types import MappingProxyType
+
+import outcome_table
+import phase_profiler
+import schedule_cache
+from event_log import EventLogger
 
 # ---------------- Enums ----------------
 
@@ -76,138 +81,52 @@ class RoundSchedule:
     CSV: pro Zeile eine Runde. Für VP1 werden die Spalten 2–5 (Index 1–4) ausgewertet,
     für VP2 die Spalten 8–11 (Index 7–10). Aus dem jeweiligen Bereich werden die ersten
     beiden nicht-leeren Integer-Werte als Karten interpretiert.
+    Geparst und validiert wird einmal durch schedule_cache; danach kommt der Schedule
+    ohne Parsen aus dem Binär-Cache.
     """
     def __init__(self, csv_path: str):
         self.rounds: List[RoundPlan] = self._load(csv_path)
 
-    def _parse_two(self, row: List[str], start: int, end: int) -> Tuple[int,int]:
-        vals = []
-        for i in range(start, min(end, len(row))):
-            cell = (row[i] or "").strip()
-            if not cell: continue
-            try:
-                vals.append(int(cell))
-            except ValueError:
-                continue
-            if len(vals) == 2: break
-        if len(vals) < 2:
-            raise ValueError(f"Zu wenige Karten in Spalten {start+1}–{end}.")
-        return vals[0], vals[1]
+    @classmethod
+    def from_plans(cls, plans: List[RoundPlan]) -> "RoundSchedule":
+        """ Schedule ohne CSV, z. B. aus geloggten Karten rekonstruiert (event_replay). """
+        if not plans:
+            raise ValueError("Keine Runden im Schedule.")
+        schedule = cls.__new__(cls)
+        schedule.rounds = list(plans)
+        return schedule
 
     def _load(self, path: str) -> List[RoundPlan]:
-        with open(path, newline="", encoding="utf-8") as f:
-            rows = list(csv.reader(f))
-        start = 0
-        try:
-            self._parse_two(rows[0], 1, 5); self._parse_two(rows[0], 7, 11)
-        except Exception:
-            start = 1
-        out = []
-        for r in rows[start:]:
-            if not r or all((c or "").strip()=="" for c in r): continue
-            vp1 = self._parse_two(r, 1, 5)
-            vp2 = self._parse_two(r, 7, 11)
-            out.append(RoundPlan(vp1_cards=vp1, vp2_cards=vp2))
-        if not out: raise ValueError("Keine Runden in CSV gefunden.")
-        return out
+        return [RoundPlan(vp1_cards=vp1, vp2_cards=vp2)
+                for vp1, vp2 in schedule_cache.load(path).card_pairs()]
 
 # -------------- Logger --------------
 
-class EventLogger:
-    def __init__(self, db_path: str, csv_path: Optional[str] = None):
-        pathlib.Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.execute("PRAGMA journal_mode=WAL;")
-        self.conn.execute("""
-        CREATE TABLE IF NOT EXISTS events(
-          session_id TEXT, round_idx INT, phase TEXT, actor TEXT, action TEXT,
-          payload TEXT, t_mono_ns INTEGER, t_utc_iso TEXT
-        )""")
-        self.conn.commit()
-        self.csv_fp = None
-        if csv_path:
-            pathlib.Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
-            self.csv_fp = open(csv_path, "a", encoding="utf-8", newline="")
-
-    def log(self, session_id: str, round_idx: int, phase: Phase,
-            actor: str, action: str, payload: Dict[str, Any]):
-        t_mono_ns = time.perf_counter_ns()
-        t_utc_iso = datetime.now(timezone.utc).isoformat()
-        row = (session_id, round_idx, phase.name, actor, action,
-               json.dumps(payload, ensure_ascii=False), t_mono_ns, t_utc_iso)
-        cur = self.conn.cursor()
-        cur.execute("INSERT INTO events VALUES (?,?,?,?,?,?,?,?)", row)
-        self.conn.commit()
-        if self.csv_fp:
-            csv.writer(self.csv_fp).writerow(row); self.csv_fp.flush()
-        return {
-            "session_id": session_id,
-            "round_idx": round_idx,
-            "phase": phase.name,
-            "actor": actor,
-            "action": action,
-            "payload": payload,
-            "t_utc_iso": t_utc_iso,
-        }
-
-    def close(self):
-        if self.csv_fp: self.csv_fp.close()
-        self.conn.close()
+# EventLogger liegt in event_log.py (gemeinsam für beide Engines und die UIs).
 
 # -------------- Engine --------------
 
-def hand_value(a: int, b: int) -> int:
-    s = a + b
-    return 0 if s in (20, 21, 22) else s
-
+# Handregeln stehen nur in outcome_table; hier wird lediglich auf SignalLevel abgebildet.
+hand_value = outcome_table.hand_value
 
 FORCED_BLUFF_LABEL = "erzwungener_bluff"
 
+_LEVELS = {level.value: level for level in SignalLevel}
+
 
 def hand_category(a: int, b: int) -> Optional[SignalLevel]:
-    total = a + b
-    if total == 19:
-        return SignalLevel.HOCH
-    if total in (16, 17, 18):
-        return SignalLevel.MITTEL
-    if total in (14, 15):
-        return SignalLevel.TIEF
-    if total in (20, 21, 22):
-        return None
-    # Falls Werte außerhalb des erwarteten Bereichs auftauchen, ordnen wir sie dem
-    # nächsten sinnvollen Bereich zu, statt einen Laufzeitfehler zu riskieren.
-    if total > 22:
-        return None
-    if total >= 16:
-        return SignalLevel.MITTEL
-    return SignalLevel.TIEF
+    """ SignalLevel der Hand; None bei erzwungenem Bluff (Summe 20–22 bzw. über 22). """
+    category = outcome_table.hand_category(a, b)
+    return None if category is None else _LEVELS[category]
 
 
 def hand_category_label(a: int, b: int) -> str:
-    level = hand_category(a, b)
-    return FORCED_BLUFF_LABEL if level is None else level.value
-
-
-def hand_category(a: int, b: int) -> SignalLevel:
-    total = a + b
-    if total in (20, 21, 22):
-        return SignalLevel.UEBERSPIEL
-    if total == 19:
-        return SignalLevel.HOCH
-    if total in (17, 18):
-        return SignalLevel.MITTEL
-    if total in (14, 15, 16):
-        return SignalLevel.TIEF
-    # Falls Werte außerhalb des erwarteten Bereichs auftauchen, ordnen wir sie dem
-    # nächsten sinnvollen Bereich zu, statt einen Laufzeitfehler zu riskieren.
-    if total > 22:
-        return SignalLevel.UEBERSPIEL
-    if total >= 17:
-        return SignalLevel.MITTEL
-    return SignalLevel.TIEF
+    return outcome_table.hand_category(a, b) or FORCED_BLUFF_LABEL
+
 
 @dataclass
 class SessionCsvLogger:
+    """ Baut die Zeilen der Session-CSV; die Datei selbst ist ein View der Event-DB (event_log). """
     HEADER = [
         "Spiel", "Block", "Bedingung", "Runde", "Spieler", "VP",
         "Karte1 VP1", "Karte2 VP1", "Karte1 VP2", "Karte2 VP2",
@@ -215,13 +134,7 @@ class SessionCsvLogger:
     ]
 
     def __init__(self, path: pathlib.Path):
-        path.parent.mkdir(parents=True, exist_ok=True)
-        new_file = not path.exists()
-        self._fp = open(path, "a", encoding="utf-8", newline="")
-        self._writer = csv.writer(self._fp)
-        if new_file:
-            self._writer.writerow(self.HEADER)
-            self._fp.flush()
+        self.path = path
 
     def _action_label(self, actor: str, action: str, payload: Dict[str, Any]) -> str:
         if action == "start_click":
@@ -242,12 +155,12 @@ class SessionCsvLogger:
             return "Reveal/Score"
         return action
 
-    def log(self, cfg: "GameEngineConfig", rs: RoundState,
+    def row(self, cfg: "GameEngineConfig", rs: RoundState,
             actor: str, action: str, payload: Dict[str, Any], timestamp_iso: str,
             round_index_override: Optional[int] = None,
-            scores: Optional[Dict[VP, int]] = None):
+            scores: Optional[Dict[VP, int]] = None) -> Optional[List[Any]]:
         if actor == "SYS":
-            return
+            return None
         if cfg.session_number is None:
             session_value = cfg.session_id
         else:
@@ -291,11 +204,7 @@ class SessionCsvLogger:
             score_vp1,
             score_vp2,
         ]
-        self._writer.writerow(row)
-        self._fp.flush()
-
-    def close(self):
-        self._fp.close()
+        return row
 
 
 @dataclass
@@ -310,12 +219,54 @@ class GameEngineConfig:
     log_dir: str = "logs"
     payout: bool = False
     payout_start_points: int = 0
+    log_async: bool = False          # EventLogger: Writer-Thread mit Gruppen-Commit
+    log_batch_size: int = 64
+    log_batch_interval: float = 0.05
+    durability: str = "event"        # event | phase | round | close (siehe event_log.Durability)
 
     def __post_init__(self):
         if self.session_number is None:
             digits = "".join(ch for ch in self.session_id if ch.isdigit())
             self.session_number = int(digits) if digits else None
 
+
+@dataclass(frozen=True)
+class StateChange:
+    """ Benachrichtigung an Abonnenten: welche Schlüssel von get_public_state() sich geändert haben. """
+    version: int                 # pro Engine streng monoton steigend
+    changed: FrozenSet[str]
+    state: Mapping[str, Any]     # unveränderlicher Snapshot nach der Änderung
+
+    def touches(self, keys) -> bool:
+        return not self.changed.isdisjoint(keys)
+
+
+_EMPTY_STATE: Mapping[str, Any] = MappingProxyType({})
+
+
+def _freeze(value: Any) -> Any:
+    """ Verschachtelte dicts/Listen des öffentlichen Zustands schreibgeschützt machen. """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _publishes(method):
+    """ Öffentliche Aktionen melden ihre Zustandsänderungen danach an alle Abonnenten. """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._publish()
+    return wrapper
+
+# Mit PHASE_PROFILE gemessene Methoden: jede Aktion (= Phasenwechsel) und jeder Log-Aufruf
+PROFILE_STEPS = ("click_start", "click_reveal_card", "p1_signal", "p2_call",
+                 "click_next_round", "restore_state", "_log")
+
 class GameEngine:
     """
     - Runde 1: beide drücken "Runde beginnen" (WAITING_START -> DEALING).
@@ -324,10 +275,14 @@ class GameEngine:
     - Beide drücken "Nächste Runde" -> Rollen werden getauscht, nächste Runde startet in DEALING.
     - CSV ist VP-bezogen; Karten pro Runde werden via aktueller Rollen-zu-VP-Mapping gezogen.
     """
-    def __init__(self, cfg: GameEngineConfig):
+    def __init__(self, cfg: GameEngineConfig, *, schedule: Optional[RoundSchedule] = None,
+                 logger: Optional[EventLogger] = None):
+        """
+        `schedule` ersetzt das Laden von cfg.csv_path, `logger` den EventLogger aus cfg
+        (z. B. event_log.NullEventLogger beim Replay).
+        """
         self.cfg = cfg
-        self.schedule = RoundSchedule(cfg.csv_path)
-        self.logger = EventLogger(cfg.db_path, cfg.csv_log_path)
+        self.schedule = schedule if schedule is not None else RoundSchedule(cfg.csv_path)
         session_identifier = (
             cfg.session_number if cfg.session_number is not None else cfg.session_id
         )
@@ -337,6 +292,16 @@ class GameEngine:
             f"session_{session_identifier}_{condition_slug}.csv"
         )
         self.session_csv = SessionCsvLogger(session_csv_path)
+        # Einziger Schreibpfad ist die Event-DB; events.csv und Session-CSV sind Views
+        if logger is not None:
+            logger.add_view(str(session_csv_path), SessionCsvLogger.HEADER)
+        self.logger = logger if logger is not None else EventLogger(
+            cfg.db_path, cfg.csv_log_path,
+            views={str(session_csv_path): SessionCsvLogger.HEADER},
+            async_mode=cfg.log_async,
+            batch_size=cfg.log_batch_size, batch_interval=cfg.log_batch_interval,
+            durability=cfg.durability,
+        )
         self.scores: Optional[Dict[VP, int]] = None
         if cfg.payout:
             start_points = cfg.payout_start_points
@@ -345,6 +310,16 @@ class GameEngine:
         roles = RoleMap(p1_is=VP.VP1, p2_is=VP.VP2)
         self.round_idx = 0
         self.current = RoundState(index=0, plan=self.schedule.rounds[0], roles=roles)
+        # Versionierter Zustand: Snapshot + Version der letzten Änderung je Feld
+        self.state_version = 0
+        self._subscribers: List[Callable[[StateChange], None]] = []
+        self._snapshot: Mapping[str, Any] = _freeze(self.get_public_state())
+        self._field_versions: Dict[str, int] = dict.fromkeys(self._snapshot, 0)
+        # None, solange PHASE_PROFILE nicht gesetzt ist (dann bleiben die Methoden unverändert)
+        self.profiler = phase_profiler.attach(
+            self, PROFILE_STEPS, pathlib.Path(__file__).stem,
+            lambda: (self.cfg.session_id, self.current.index, self.current.phase.name),
+        )
 
     # --- Hilfen ---
     def _ensure(self, allowed: List[Phase]):
@@ -359,12 +334,13 @@ class GameEngine:
     def _log(self, actor: str, action: str, payload: Dict[str, Any],
              round_index_override: Optional[int] = None):
         round_idx = self.current.index if round_index_override is None else round_index_override
-        data = self.logger.log(
-            self.cfg.session_id, round_idx, self.current.phase, actor, action, payload
-        )
-        self.session_csv.log(
-            self.cfg, self.current, actor, action, payload, data["t_utc_iso"],
-            round_index_override=round_idx, scores=self._score_snapshot()
+        self.logger.log(
+            self.cfg.session_id, round_idx, self.current.phase, actor, action, payload,
+            view_target=str(self.session_csv.path),
+            view_row=lambda timestamp_iso: self.session_csv.row(
+                self.cfg, self.current, actor, action, payload, timestamp_iso,
+                round_index_override=round_idx, scores=self._score_snapshot()
+            ),
         )
 
     def _cards_of(self, player: Player) -> Tuple[int,int]:
@@ -386,6 +362,7 @@ class GameEngine:
 
     # --- Öffentliche API (UI) ---
 
+    @_publishes
     def click_start(self, player: Player):
         """ Beide drücken 'Runde beginnen' (nur in Runde 1 relevant). """
         self._ensure([Phase.WAITING_START])
@@ -394,9 +371,15 @@ class GameEngine:
         if player == Player.P2 and not self.current.p2_ready:
             self.current.p2_ready = True; self._log("P2", "start_click", {})
         if self.current.p1_ready and self.current.p2_ready:
+            # Einmal pro Session: Bedingungen für die Auswertung (Block, Payout) im Event-Log
+            self._log("SYS", "session_config", {
+                "session_number": self.cfg.session_number, "block": self.cfg.block,
+                "condition": self.cfg.condition, "payout": self.cfg.payout,
+            })
             self.current.phase = Phase.DEALING
             self._log("SYS", "phase_change", {"to": "DEALING"})
 
+    @_publishes
     def click_reveal_card(self, player: Player, card_idx: int):
         """ Rollenbezogenes Aufdecken in fixer Reihenfolge. """
         self._ensure([Phase.DEALING])
@@ -433,6 +416,7 @@ class GameEngine:
             "role_vp": (self.current.roles.p1_is.value if player==Player.P1 else self.current.roles.p2_is.value)
         })
 
+    @_publishes
     def p1_signal(self, level: SignalLevel):
         self._ensure([Phase.SIGNAL_WAIT])
         if self.current.p1_signal is not None:
@@ -442,6 +426,7 @@ class GameEngine:
         self.current.phase = Phase.CALL_WAIT
         self._log("SYS", "phase_change", {"to": "CALL_WAIT"})
 
+    @_publishes
     def p2_call(self, call: Call, p1_hat_wahrheit_gesagt: Optional[bool]):
         self._ensure([Phase.CALL_WAIT])
         if self.current.p2_call is not None:
@@ -488,6 +473,7 @@ class GameEngine:
         self.current.phase = Phase.ROUND_DONE
         self._log("SYS", "phase_change", {"to": "ROUND_DONE"})
 
+    @_publishes
     def click_next_round(self, player: Player):
         """ Beide drücken 'Nächste Runde'. Danach: Rollen tauschen, nächste Runde → DEALING. """
         self._ensure([Phase.ROUND_DONE])
@@ -506,6 +492,32 @@ class GameEngine:
 
     # --- State-Exposure ---
 
+    def subscribe(self, callback: Callable[[StateChange], None]):
+        """ callback(StateChange) läuft synchron nach jeder Aktion, die den Zustand ändert. """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[StateChange], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """ Unveränderlicher öffentlicher Zustand (wird nur bei Änderungen neu gebaut). """
+        return self._snapshot
+
+    def state_since(self, version: Optional[int] = None) -> Tuple[int, Mapping[str, Any]]:
+        """
+        (aktuelle Version, seit `version` geänderte Felder). Ohne bzw. mit fremder
+        (zu hoher) Version kommt der komplette Snapshot zurück.
+        """
+        if version is None or version > self.state_version:
+            return self.state_version, self._snapshot
+        if version == self.state_version:
+            return self.state_version, _EMPTY_STATE
+        return self.state_version, MappingProxyType({
+            key: self._snapshot[key]
+            for key, changed_at in self._field_versions.items() if changed_at > version
+        })
+
     def get_public_state(self) -> Dict[str, Any]:
         rs = self.current
         return {
@@ -525,94 +537,107 @@ class GameEngine:
             },
         }
 
+    # --- Snapshot / Fortsetzen nach Absturz ---
+
+    def export_state(self) -> Dict[str, Any]:
+        """ Kompletter Fortschritt als JSON-fähiges dict (für session_snapshot). """
+        rs = self.current
+        return {
+            "round_idx": self.round_idx,
+            "scores": None if self.scores is None else {
+                VP.VP1.value: self.scores[VP.VP1],
+                VP.VP2.value: self.scores[VP.VP2],
+            },
+            "current": {
+                "index": rs.index,
+                "phase": rs.phase.name,
+                "roles": {"P1": rs.roles.p1_is.value, "P2": rs.roles.p2_is.value},
+                "p1_ready": rs.p1_ready, "p2_ready": rs.p2_ready,
+                "next_ready_p1": rs.next_ready_p1, "next_ready_p2": rs.next_ready_p2,
+                "p1_revealed": list(rs.vis.p1_revealed), "p2_revealed": list(rs.vis.p2_revealed),
+                "p1_signal": None if rs.p1_signal is None else rs.p1_signal.value,
+                "p2_call": None if rs.p2_call is None else rs.p2_call.value,
+                "winner": None if rs.winner is None else rs.winner.value,
+                "outcome_reason": rs.outcome_reason,
+            },
+        }
+
+    @_publishes
+    def restore_state(self, state: Dict[str, Any]):
+        """
+        Setzt den mit export_state() gesicherten Fortschritt fort (gleiche Phase, gleiche
+        Rollen, gleiche Punkte). Wird als SYS/session_resumed geloggt, damit event_replay
+        den Sprung nachvollziehen kann.
+        """
+        cur = state["current"]
+        if not 0 <= cur["index"] < len(self.schedule.rounds):
+            raise ValueError(f"Runde {cur['index']} liegt außerhalb des Schedules.")
+        if (state["scores"] is None) != (self.scores is None):
+            raise ValueError("Snapshot passt nicht zur Auszahlungsbedingung.")
+        self.round_idx = state["round_idx"]
+        if self.scores is not None:
+            self.scores = {VP.VP1: state["scores"][VP.VP1.value],
+                           VP.VP2: state["scores"][VP.VP2.value]}
+        self.current = RoundState(
+            index=cur["index"],
+            plan=self.schedule.rounds[cur["index"]],
+            roles=RoleMap(p1_is=VP(cur["roles"]["P1"]), p2_is=VP(cur["roles"]["P2"])),
+            phase=Phase[cur["phase"]],
+            p1_ready=cur["p1_ready"], p2_ready=cur["p2_ready"],
+            next_ready_p1=cur["next_ready_p1"], next_ready_p2=cur["next_ready_p2"],
+            vis=VisibleCardState(p1_revealed=tuple(cur["p1_revealed"]),
+                                 p2_revealed=tuple(cur["p2_revealed"])),
+            p1_signal=None if cur["p1_signal"] is None else SignalLevel(cur["p1_signal"]),
+            p2_call=None if cur["p2_call"] is None else Call(cur["p2_call"]),
+            winner=None if cur["winner"] is None else Player(cur["winner"]),
+            outcome_reason=cur["outcome_reason"],
+        )
+        self._log("SYS", "session_resumed", {"state": state})
+
     # --- Interna ---
 
-    def _determine_truth(self) -> Tuple[Optional[bool], Optional[SignalLevel], Optional[SignalLevel]]:
+    def _publish(self):
+        state = self.get_public_state()
+        changed = frozenset(k for k, v in state.items() if self._snapshot.get(k) != v)
+        if not changed:
+            return
+        self.state_version += 1
+        snapshot = dict(self._snapshot)
+        for key in changed:
+            snapshot[key] = _freeze(state[key])
+            self._field_versions[key] = self.state_version
+        self._snapshot = MappingProxyType(snapshot)
+        change = StateChange(self.state_version, changed, self._snapshot)
+        for callback in list(self._subscribers):
+            callback(change)
+
+    def _lookup_outcome(self, call: Call) -> Optional[outcome_table.Outcome]:
         signal = self.current.p1_signal
         if signal is None:
+            return None
+        return outcome_table.lookup(
+            self._cards_of(Player.P1), self._cards_of(Player.P2), signal.value, call.value
+        )
+
+    def _determine_truth(self) -> Tuple[Optional[bool], Optional[SignalLevel], Optional[SignalLevel]]:
+        outcome = self._lookup_outcome(self.current.p2_call or Call.WAHRHEIT)
+        if outcome is None:
             return (None, None, None)
-        p1_cards = self._cards_of(Player.P1)
-        p2_cards = self._cards_of(Player.P2)
-        p1_category = hand_category(*p1_cards)
-        p2_category = hand_category(*p2_cards)
-        return (signal == p1_category, p1_category, p2_category)
+        p1_category = None if outcome.p1_category is None else SignalLevel(outcome.p1_category)
+        p2_category = None if outcome.p2_category is None else SignalLevel(outcome.p2_category)
+        return (outcome.truth, p1_category, p2_category)
 
     def _resolve_outcome(self, call: Call) -> Tuple[Optional[Player], str, Optional[bool]]:
-        actual_truth, p1_category, _ = self._determine_truth()
-        forced_bluff = (p1_category is None)
-
-        if actual_truth is None:
-            return (
-                None,
-                "Unbestimmt: Kein Signal gesetzt, Ergebnis kann nicht berechnet werden.",
-                None,
-            )
-
-        # Werte für Vergleich (20/21/22 werden als 0 behandelt)
-        p1_cards = self._cards_of(Player.P1)
-        p2_cards = self._cards_of(Player.P2)
-        p1_val = hand_value(*p1_cards)
-        p2_val = hand_value(*p2_cards)
-
-        if call == Call.BLUFF:
-            if actual_truth:
-                return (
-                    Player.P1,
-                    "P1 sagte die richtige Kategorie, P2 erwartete Bluff → P1 gewinnt.",
-                    actual_truth,
-                )
-            if forced_bluff:
-                return (
-                    Player.P2,
-                    "P1 musste bluffen (20–22), P2 erwartete den Bluff → P2 gewinnt.",
-                    actual_truth,
-                )
-            return (
-                Player.P2,
-                "P1 bluffte über die Kategorie, P2 erkannte den Bluff → P2 gewinnt.",
-                actual_truth,
-            )
-
-        # call == Wahrheit
-        if actual_truth:
-            if p1_val > p2_val:
-                return (
-                    Player.P1,
-                    (
-                        f"P1 sagte {p1_category.value} (korrekt), P2 glaubte → "
-                        f"{p1_val} vs {p2_val} → P1 gewinnt."
-                    ),
-                    actual_truth,
-                )
-            if p2_val > p1_val:
-                return (
-                    Player.P2,
-                    (
-                        f"P1 sagte {p1_category.value} (korrekt), P2 glaubte → "
-                        f"{p1_val} vs {p2_val} → P2 gewinnt."
-                    ),
-                    actual_truth,
-                )
-            return (
-                None,
-                (
-                    f"P1 sagte {p1_category.value} (korrekt), P2 glaubte → "
-                    f"{p1_val} vs {p2_val} → Unentschieden."
-                ),
-                actual_truth,
-            )
-
-        return (
-            Player.P1,
-            (
-                "P1 musste bluffen (20–22) und P2 glaubte → P1 gewinnt."
-                if forced_bluff
-                else "P1 bluffte über die Kategorie, P2 glaubte → P1 gewinnt."
-            ),
-            actual_truth,
-        )
+        # Gewinner/Wahrheit/Begründung kommen aus der vorberechneten Tabelle (outcome_table)
+        outcome = self._lookup_outcome(call)
+        if outcome is None:
+            return (None, outcome_table.reason_text(None), None)
+        winner = None if outcome.winner is None else Player(outcome.winner)
+        return (winner, outcome_table.reason_text(outcome), outcome.truth)
 
     def _advance_and_swap_roles(self):
+        # Rundengrenze: je nach Durability committen bzw. flushen
+        self.logger.mark_round_end()
         self.round_idx += 1
         if self.round_idx >= len(self.schedule.rounds):
             self.current.phase = Phase.FINISHED
@@ -635,8 +660,9 @@ class GameEngine:
     # --- Cleanup ---
 
     def close(self):
+        if self.profiler is not None:
+            self.profiler.close()
         self.logger.close()
-        self.session_csv.close()
 
 
 
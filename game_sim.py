@@ -0,0 +1,263 @@
+# game_sim.py  (headless Batch-Simulation ganzer RoundSchedules, NumPy-vektorisiert)
+#
+# Spielt komplette Sessions eines RoundSchedule ohne UI, ohne SQLite und ohne CSV:
+# alle Runden aller Sessions werden als Arrays (n_sessions x n_runden) berechnet.
+# Die Regeln entsprechen exakt GameEngine._resolve_outcome (game_engine_w/_wl);
+# cross_check() spielt dieselben Entscheidungen zur Kontrolle durch die echte Engine.
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Union
+import importlib
+import pathlib
+import tempfile
+
+import numpy as np
+
+# Handregeln als Batch (hand_value/hand_category vektorisiert, erschöpfend geprüft)
+from hand_batch import (CAT_FORCED_BLUFF, SIG_HOCH, SIGNAL_LEVELS, classify_schedule,
+                        hand_category_codes, hand_values)
+
+# ---------------- Codes ----------------
+
+CALLS = ("wahrheit", "bluff")                # Call-Code 0/1 (== Call.value)
+CALL_WAHRHEIT, CALL_BLUFF = 0, 1
+WINNER_NONE, WINNER_P1, WINNER_P2 = 0, 1, 2
+
+SCORING_VARIANTS = ("w", "wl")               # w: Sieger +1 | wl: Sieger +1, Verlierer −1
+
+# Strategien bekommen die Handsummen der aktuellen Rolle als Array (n_sessions, n_runden)
+# und liefern Codes in derselben Form.
+SignalerStrategy = Callable[[np.ndarray, np.random.Generator], np.ndarray]
+JudgeStrategy = Callable[[np.ndarray, np.ndarray, np.random.Generator], np.ndarray]
+
+
+# -------------- Regeln (vektorisiert) --------------
+
+def resolve_outcomes(p1_totals: np.ndarray, p2_totals: np.ndarray,
+                     signals: np.ndarray, calls: np.ndarray):
+    """
+    Entspricht GameEngine._resolve_outcome für jede Zelle der Arrays.
+    Rückgabe: (winner-Codes, p1_truth als bool-Array).
+    """
+    truth = hand_category_codes(p1_totals) == signals
+    v1 = hand_values(p1_totals)
+    v2 = hand_values(p2_totals)
+    showdown = np.where(v1 > v2, WINNER_P1, np.where(v2 > v1, WINNER_P2, WINNER_NONE))
+    believed = np.where(truth, showdown, WINNER_P1)
+    doubted = np.where(truth, WINNER_P1, WINNER_P2)
+    winners = np.where(calls == CALL_BLUFF, doubted, believed).astype(np.int8)
+    return winners, truth
+
+
+# -------------- Strategien --------------
+
+def truthful_signaler(forced_level: int = SIG_HOCH) -> SignalerStrategy:
+    """ Signalisiert immer die echte Kategorie; bei 20–22 wird forced_level gesetzt. """
+    def strategy(p1_totals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        codes = hand_category_codes(p1_totals)
+        return np.where(codes == CAT_FORCED_BLUFF, forced_level, codes).astype(np.int8)
+    return strategy
+
+
+def bluffing_signaler(bluff_rate: float) -> SignalerStrategy:
+    """ Mit Wahrscheinlichkeit bluff_rate (und immer bei 20–22) eine falsche Stufe. """
+    def strategy(p1_totals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        codes = hand_category_codes(p1_totals)
+        forced = codes == CAT_FORCED_BLUFF
+        bluff = forced | (rng.random(codes.shape) < bluff_rate)
+        # falsche Stufe: Verschiebung um 1 oder 2 (mod 3) trifft nie die echte Kategorie
+        shifted = (np.maximum(codes, 0) + rng.integers(1, 3, size=codes.shape)) % 3
+        random_level = rng.integers(0, 3, size=codes.shape)
+        lie = np.where(forced, random_level, shifted)
+        return np.where(bluff, lie, codes).astype(np.int8)
+    return strategy
+
+
+def random_signaler() -> SignalerStrategy:
+    def strategy(p1_totals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return rng.integers(0, 3, size=np.shape(p1_totals)).astype(np.int8)
+    return strategy
+
+
+def constant_judge(call: int) -> JudgeStrategy:
+    """ Ruft immer denselben Call (CALL_WAHRHEIT oder CALL_BLUFF). """
+    def strategy(signals: np.ndarray, p2_totals: np.ndarray,
+                 rng: np.random.Generator) -> np.ndarray:
+        return np.full(np.shape(signals), call, dtype=np.int8)
+    return strategy
+
+
+def random_judge(bluff_rate: float = 0.5) -> JudgeStrategy:
+    def strategy(signals: np.ndarray, p2_totals: np.ndarray,
+                 rng: np.random.Generator) -> np.ndarray:
+        return (rng.random(np.shape(signals)) < bluff_rate).astype(np.int8)
+    return strategy
+
+
+def threshold_judge(bluff_rates: Sequence[float] = (0.6, 0.35, 0.2)) -> JudgeStrategy:
+    """ Bluff-Wahrscheinlichkeit je signalisierter Stufe (hoch, mittel, tief). """
+    rates = np.asarray(bluff_rates, dtype=float)
+
+    def strategy(signals: np.ndarray, p2_totals: np.ndarray,
+                 rng: np.random.Generator) -> np.ndarray:
+        return (rng.random(np.shape(signals)) < rates[signals]).astype(np.int8)
+    return strategy
+
+
+# -------------- Simulation --------------
+
+@dataclass
+class SimulationResult:
+    """ Alle Arrays haben die Form (n_sessions, n_runden); scores ist (n_sessions, 2) für VP1/VP2. """
+    scoring: str
+    p1_is_vp1: np.ndarray
+    p1_totals: np.ndarray
+    p2_totals: np.ndarray
+    signals: np.ndarray
+    calls: np.ndarray
+    truth: np.ndarray
+    winners: np.ndarray
+    scores: np.ndarray
+
+    @property
+    def n_sessions(self) -> int:
+        return self.winners.shape[0]
+
+    @property
+    def n_rounds(self) -> int:
+        return self.winners.shape[1]
+
+    def win_rate(self, role: int = WINNER_P1) -> float:
+        return float(np.mean(self.winners == role))
+
+    def bluff_rate(self) -> float:
+        return float(np.mean(~self.truth))
+
+
+def load_schedule(csv_path: Union[str, pathlib.Path], variant: str = "w"):
+    """ Lädt einen Paare*.csv über den RoundSchedule der gewählten Engine-Variante. """
+    engine_mod = importlib.import_module(f"game_engine_{variant}")
+    return engine_mod.RoundSchedule(str(csv_path))
+
+
+def simulate(schedule, signaler: SignalerStrategy, judge: JudgeStrategy,
+             n_sessions: int, *, scoring: str = "w", start_points: int = 0,
+             seed: Optional[int] = None) -> SimulationResult:
+    """
+    Spielt n_sessions komplette Durchläufe des Schedules.
+    Runde 1: VP1 ist Spieler 1; danach wechseln die Rollen jede Runde (wie GameEngine).
+    start_points gilt nur für "wl" (die _w-Engine startet immer bei 0).
+    """
+    if scoring not in SCORING_VARIANTS:
+        raise ValueError(f"Unbekannte Wertung: {scoring!r}")
+    rng = np.random.default_rng(seed)
+    totals = classify_schedule(schedule).totals         # (n_runden, 2)
+    n_rounds = totals.shape[0]
+    p1_is_vp1 = (np.arange(n_rounds) % 2) == 0
+    p1_row = np.where(p1_is_vp1, totals[:, 0], totals[:, 1])
+    p2_row = np.where(p1_is_vp1, totals[:, 1], totals[:, 0])
+    p1_totals = np.broadcast_to(p1_row, (n_sessions, n_rounds))
+    p2_totals = np.broadcast_to(p2_row, (n_sessions, n_rounds))
+
+    signals = np.asarray(signaler(p1_totals, rng), dtype=np.int8)
+    calls = np.asarray(judge(signals, p2_totals, rng), dtype=np.int8)
+    winners, truth = resolve_outcomes(p1_totals, p2_totals, signals, calls)
+
+    # Punkte VP-bezogen: Sieger-VP hängt vom Rollen-Mapping der Runde ab
+    p1_won = winners == WINNER_P1
+    p2_won = winners == WINNER_P2
+    vp1_won = np.where(p1_is_vp1, p1_won, p2_won)
+    vp2_won = np.where(p1_is_vp1, p2_won, p1_won)
+    gain_vp1 = vp1_won.sum(axis=1)
+    gain_vp2 = vp2_won.sum(axis=1)
+    if scoring == "wl":
+        base = start_points
+        score_vp1 = base + gain_vp1 - gain_vp2
+        score_vp2 = base + gain_vp2 - gain_vp1
+    else:
+        score_vp1, score_vp2 = gain_vp1, gain_vp2
+    scores = np.stack([score_vp1, score_vp2], axis=1).astype(np.int32)
+
+    return SimulationResult(
+        scoring=scoring,
+        p1_is_vp1=p1_is_vp1,
+        p1_totals=np.ascontiguousarray(p1_totals),
+        p2_totals=np.ascontiguousarray(p2_totals),
+        signals=signals,
+        calls=calls,
+        truth=truth,
+        winners=winners,
+        scores=scores,
+    )
+
+
+# -------------- Abgleich mit der echten Engine --------------
+
+def play_session_through_engine(csv_path: Union[str, pathlib.Path], variant: str,
+                                signals: Sequence[int], calls: Sequence[int],
+                                log_dir: Union[str, pathlib.Path],
+                                start_points: int = 0):
+    """
+    Spielt eine Session mit festen Signal-/Call-Codes über die öffentliche API der
+    GameEngine (inkl. Logging). Rückgabe: (winner-Codes, truth-Liste, Punkte VP1/VP2).
+    """
+    engine_mod = importlib.import_module(f"game_engine_{variant}")
+    log_dir = pathlib.Path(log_dir)
+    cfg = engine_mod.GameEngineConfig(
+        session_id="SIM001",
+        csv_path=str(csv_path),
+        db_path=str(log_dir / "events_sim.sqlite3"),
+        log_dir=str(log_dir),
+        payout=True,
+        payout_start_points=start_points,
+    )
+    P = engine_mod.Player
+    levels = [engine_mod.SignalLevel(v) for v in SIGNAL_LEVELS]
+    call_enums = [engine_mod.Call(v) for v in CALLS]
+    winner_codes = {None: WINNER_NONE, P.P1: WINNER_P1, P.P2: WINNER_P2}
+
+    eng = engine_mod.GameEngine(cfg)
+    winners, truth = [], []
+    try:
+        eng.click_start(P.P1); eng.click_start(P.P2)
+        for sig, call in zip(signals, calls):
+            eng.click_reveal_card(P.P1, 0)
+            eng.click_reveal_card(P.P2, 0)
+            eng.click_reveal_card(P.P1, 1)
+            eng.click_reveal_card(P.P2, 1)
+            eng.p1_signal(levels[int(sig)])
+            eng.p2_call(call_enums[int(call)], p1_hat_wahrheit_gesagt=None)
+            winners.append(winner_codes[eng.current.winner])
+            truth.append(eng.current.p1_signal == engine_mod.hand_category(*eng._cards_of(P.P1)))
+            eng.click_next_round(P.P1); eng.click_next_round(P.P2)
+        scores = (eng.scores[engine_mod.VP.VP1], eng.scores[engine_mod.VP.VP2])
+    finally:
+        eng.close()
+    return winners, truth, scores
+
+
+def cross_check(csv_path: Union[str, pathlib.Path], variant: str, result: SimulationResult,
+                sessions: Optional[Sequence[int]] = None, start_points: int = 0) -> int:
+    """
+    Vergleicht ausgewählte Sessions eines SimulationResult mit der echten GameEngine.
+    Wirft AssertionError bei der ersten Abweichung; Rückgabe: Anzahl geprüfter Runden.
+    """
+    if sessions is None:
+        sessions = range(min(result.n_sessions, 8))
+    checked = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for s in sessions:
+            winners, truth, scores = play_session_through_engine(
+                csv_path, variant, result.signals[s], result.calls[s], tmp,
+                start_points=start_points,
+            )
+            if list(result.winners[s]) != winners:
+                raise AssertionError(f"Session {s}: Gewinner weichen von der Engine ab.")
+            if list(result.truth[s]) != truth:
+                raise AssertionError(f"Session {s}: Wahrheitswerte weichen von der Engine ab.")
+            if tuple(int(x) for x in result.scores[s]) != tuple(scores):
+                raise AssertionError(
+                    f"Session {s}: Punkte {tuple(result.scores[s])} ≠ Engine {scores}."
+                )
+            checked += len(winners)
+    return checked
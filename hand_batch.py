@@ -0,0 +1,174 @@
+# hand_batch.py  (hand_value / hand_category / signal_level_from_value für ganze Arrays)
+#
+# Engine, outcome_table und die Tabletop-UIs werten immer ein Kartenpaar aus. Hier stehen
+# dieselben Regeln als je ein NumPy-Aufruf für beliebig viele Hände: Karten-Array der Form
+# (..., 2) oder ein ganzer RoundSchedule → Handsumme, Wert, Kategorie-Code und Maske
+# "erzwungener Bluff". Die Kategorie kommt per Lookup-Tabelle über die geklemmte Summe;
+# die Tabelle wird aus outcome_table.hand_category aufgebaut, nicht abgeschrieben.
+# Gleichwertigkeit mit den skalaren Versionen prüft `python hand_batch.py verify`
+# erschöpfend: gegen outcome_table, beide Engines und – wenn Kivy installiert ist – gegen
+# signal_level_from_value der Tabletop-UIs.
+from __future__ import annotations
+from typing import Iterable, NamedTuple
+import argparse
+import importlib
+import types
+
+import numpy as np
+
+import outcome_table
+
+# ---------------- Codes ----------------
+
+SIGNAL_LEVELS = outcome_table.SIGNAL_LEVELS   # Code 0/1/2 == SignalLevel.value
+SIG_HOCH, SIG_MITTEL, SIG_TIEF = 0, 1, 2
+CAT_FORCED_BLUFF = -1                         # Summe 20–22 (und > 22): keine ehrliche Kategorie
+FORCED_BLUFF_LABEL = "erzwungener_bluff"      # == game_engine_*.FORCED_BLUFF_LABEL
+UI_LEVELS = ("high", "mid", "low")            # Code 0/1/2 im Vokabular der Tabletop-UIs
+
+# Außerhalb [_LUT_LOW, _LUT_HIGH] ändert sich die Kategorie nicht mehr (von verify_rules geprüft)
+_LUT_LOW, _LUT_HIGH = 13, 23
+_CATEGORY_LUT = np.array(
+    [CAT_FORCED_BLUFF if outcome_table.hand_category(total, 0) is None
+     else SIGNAL_LEVELS.index(outcome_table.hand_category(total, 0))
+     for total in range(_LUT_LOW, _LUT_HIGH + 1)],
+    dtype=np.int8,
+)
+_LABELS = np.array(SIGNAL_LEVELS + (FORCED_BLUFF_LABEL,))     # Index −1 → Label des Bluffs
+_UI_LABELS = np.array(UI_LEVELS + ("",))
+
+# Kartenbereich der erschöpfenden Prüfung: Spielkarten 7–11 und alle Randfälle darum herum
+VERIFY_CARDS = range(-2, 26)
+
+
+class Hands(NamedTuple):
+    """ Alle Arrays in der Form der Eingabe ohne die letzte Achse (das Kartenpaar). """
+    totals: np.ndarray
+    values: np.ndarray          # hand_value
+    categories: np.ndarray      # int8: SIG_HOCH/SIG_MITTEL/SIG_TIEF oder CAT_FORCED_BLUFF
+    forced_bluff: np.ndarray    # bool: hand_category(...) is None
+
+
+# -------------- Regeln (vektorisiert) --------------
+
+def hand_values(totals: np.ndarray) -> np.ndarray:
+    """ hand_value über Handsummen: 20/21/22 zählen als 0. """
+    totals = np.asarray(totals)
+    return np.where((totals >= 20) & (totals <= 22), 0, totals)
+
+
+def hand_category_codes(totals: np.ndarray) -> np.ndarray:
+    """ hand_category über Handsummen als int8-Codes (inkl. Randfälle außerhalb 14–22). """
+    return _CATEGORY_LUT[np.clip(totals, _LUT_LOW, _LUT_HIGH) - _LUT_LOW]
+
+
+def classify(cards: np.ndarray) -> Hands:
+    """ Karten-Array der Form (..., 2) → Summe, Wert, Kategorie, erzwungener Bluff. """
+    cards = np.asarray(cards)
+    if cards.shape[-1:] != (2,):
+        raise ValueError(f"Kartenpaare erwartet (letzte Achse 2), bekommen: {cards.shape}")
+    totals = cards.sum(axis=-1, dtype=np.int16)
+    categories = hand_category_codes(totals)
+    return Hands(totals, hand_values(totals), categories, categories == CAT_FORCED_BLUFF)
+
+
+def schedule_cards(schedule) -> np.ndarray:
+    """ Karten eines RoundSchedule als int16-Array der Form (n_runden, 2 [VP1/VP2], 2). """
+    return np.array([(plan.vp1_cards, plan.vp2_cards) for plan in schedule.rounds],
+                    dtype=np.int16)
+
+
+def classify_schedule(schedule) -> Hands:
+    """ classify für alle Runden eines RoundSchedule; Form (n_runden, 2 [VP1/VP2]). """
+    return classify(schedule_cards(schedule))
+
+
+def category_labels(categories: np.ndarray) -> np.ndarray:
+    """ hand_category_label zu Kategorie-Codes ("hoch" … oder FORCED_BLUFF_LABEL). """
+    return _LABELS[np.asarray(categories)]
+
+
+def signal_level_codes(values: np.ndarray) -> np.ndarray:
+    """
+    signal_level_from_value der Tabletop-UIs über Handwerten (nicht Summen): Wert ≤ 0 oder
+    20–22/über 22 → CAT_FORCED_BLUFF, sonst dieselben Stufen wie hand_category.
+    """
+    values = np.asarray(values)
+    return np.where(values <= 0, CAT_FORCED_BLUFF, hand_category_codes(values)).astype(np.int8)
+
+
+def ui_level_labels(codes: np.ndarray) -> np.ndarray:
+    """ Codes → 'high'/'mid'/'low'; "" steht für None. """
+    return _UI_LABELS[np.asarray(codes)]
+
+
+# -------------- Erschöpfende Prüfung gegen die skalaren Regeln --------------
+
+def _domain():
+    cards = np.array([(a, b) for a in VERIFY_CARDS for b in VERIFY_CARDS], dtype=np.int16)
+    return cards, classify(cards)
+
+
+def verify_rules() -> int:
+    """ Gegen outcome_table.hand_value/hand_category; AssertionError bei Abweichung. """
+    cards, hands = _domain()
+    for (a, b), value, code in zip(cards.tolist(), hands.values.tolist(), hands.categories.tolist()):
+        category = outcome_table.hand_category(a, b)
+        if value != outcome_table.hand_value(a, b):
+            raise AssertionError(f"hand_values weicht bei ({a}, {b}) von hand_value ab.")
+        if code != (CAT_FORCED_BLUFF if category is None else SIGNAL_LEVELS.index(category)):
+            raise AssertionError(f"hand_category_codes weicht bei ({a}, {b}) von hand_category ab.")
+    return len(cards)
+
+
+def verify_engine(engine_mod: types.ModuleType) -> int:
+    """ Gegen hand_value/hand_category/hand_category_label eines Engine-Moduls. """
+    cards, hands = _domain()
+    labels = category_labels(hands.categories).tolist()
+    for (a, b), value, forced, label in zip(cards.tolist(), hands.values.tolist(),
+                                            hands.forced_bluff.tolist(), labels):
+        if value != engine_mod.hand_value(a, b):
+            raise AssertionError(f"{engine_mod.__name__}: hand_value({a}, {b}) weicht ab.")
+        if forced != (engine_mod.hand_category(a, b) is None):
+            raise AssertionError(f"{engine_mod.__name__}: Bluff-Maske bei ({a}, {b}) weicht ab.")
+        if label != engine_mod.hand_category_label(a, b):
+            raise AssertionError(f"{engine_mod.__name__}: hand_category_label({a}, {b}) weicht ab.")
+    return len(cards)
+
+
+def verify_ui(ui_mod: types.ModuleType, values: Iterable[int] = range(-5, 50)) -> int:
+    """ Gegen TabletopRoot.signal_level_from_value (ohne Widget: nur _parse_value wird gebraucht). """
+    values = list(values)
+    root = types.SimpleNamespace(_parse_value=ui_mod.TabletopRoot._parse_value)
+    expected = [ui_mod.TabletopRoot.signal_level_from_value(root, v) or "" for v in values]
+    got = ui_level_labels(signal_level_codes(np.array(values))).tolist()
+    for value, want, have in zip(values, expected, got):
+        if want != have:
+            raise AssertionError(f"{ui_mod.__name__}: signal_level_from_value({value}) = "
+                                 f"{want or None!r}, vektorisiert {have or None!r}.")
+    return len(values)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Vektorisierte Handregeln gegen die skalaren prüfen")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_verify = sub.add_parser("verify", help="erschöpfend gegen Engines und (mit Kivy) UIs")
+    p_verify.add_argument("--ui", nargs="*", default=["tabletop_ux_kivy_base_w",
+                                                       "tabletop_ux_kivy_base_wl",
+                                                       "tabletop_ux_kivy_aruco_w"])
+    args = ap.parse_args()
+
+    print(f"outcome_table: {verify_rules()} Kartenpaare gleich")
+    for name in ("game_engine_w", "game_engine_wl"):
+        print(f"{name}: {verify_engine(importlib.import_module(name))} Kartenpaare gleich")
+    for name in args.ui:
+        try:
+            ui_mod = importlib.import_module(name)
+        except ImportError as exc:
+            print(f"{name}: übersprungen ({exc})")
+            continue
+        print(f"{name}: {verify_ui(ui_mod)} Handwerte gleich")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+# log_merge.py  (Log-Ordner vieler Tabletop-PCs zu einer Studien-DB zusammenführen)
+#
+# Jeder PC legt in logs/ ab: events*.sqlite3 (Engine bzw. events_S###.sqlite3 der UIs),
+# events.csv, session_*.csv und round_log_*.csv. merge() sammelt diese Dateien aus beliebig
+# vielen Log-Ordnern, liest sie parallel in einem Prozess-Pool und schreibt alles in eine
+# Studien-DB:
+#   events    – Schema wie event_log (inkl. Typspalten, Indizes, SCHEMA_VERSION) plus
+#               source_id; dedupliziert über (session_id, t_mono_ns, action), d. h. dasselbe
+#               Event aus events.sqlite3 und events.csv landet einmal (erste Quelle gewinnt)
+#   csv_rows  – Zeilen von session_*.csv / round_log_*.csv als JSON-Liste, je Quelldatei
+#   sources   – Herkunft: Log-Ordner, relativer Pfad, Art, Größe, mtime, SHA-256, Zeilen
+# Wiederholte Läufe sind idempotent: Dateien mit gleicher Größe und mtime werden gar nicht
+# gelesen, bei gleichem SHA-256 (z. B. neu kopiert) nicht neu übernommen. Geänderte CSVs
+# ersetzen ihre Zeilen; geänderte Event-Quellen liefern nur neue Events (Deduplizierung).
+# Die Studien-DB lässt sich direkt mit event_replay.py und event_export.py weiterverarbeiten.
+#     python log_merge.py merge study.sqlite3 pc01/logs pc02/logs pc03/logs --workers 8
+#     python log_merge.py sources study.sqlite3
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import pathlib
+import sqlite3
+import time
+
+from event_log import (EVENT_COLUMNS, EVENT_INDEXES, SCHEMA_VERSION, TYPED_COLUMNS, TYPED_NAMES,
+                       schema_version, typed_fields)
+
+# Art → Dateimuster (rekursiv je Log-Ordner)
+KINDS = {
+    "events_db": "*.sqlite3",
+    "events_csv": "events*.csv",
+    "session_csv": "session_*.csv",
+    "round_log": "round_log_*.csv",
+}
+DEDUPE_KEY = ("session_id", "t_mono_ns", "action")
+HASH_CHUNK = 1 << 20
+_MERGED_COLUMNS = EVENT_COLUMNS + TYPED_NAMES + ("source_id",)
+_INSERT_EVENT = (f"INSERT OR IGNORE INTO events({', '.join(_MERGED_COLUMNS)}) "
+                 f"VALUES ({','.join('?' * len(_MERGED_COLUMNS))})")
+
+
+# -------------- Studien-DB --------------
+
+def create_study_db(conn: sqlite3.Connection):
+    version = schema_version(conn)
+    if version not in (0, SCHEMA_VERSION):
+        raise RuntimeError(f"Studien-DB hat Schema-Version {version}, erwartet {SCHEMA_VERSION}.")
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS events(
+      session_id TEXT, round_idx INT, phase TEXT, actor TEXT, action TEXT,
+      payload TEXT, t_mono_ns INTEGER, t_utc_iso TEXT,
+      {', '.join(f'{name} {sql_type}' for name, sql_type in TYPED_COLUMNS)},
+      source_id INTEGER
+    )""")
+    for name, target in EVENT_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS events_dedupe ON events({', '.join(DEDUPE_KEY)})")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sources(
+      source_id INTEGER PRIMARY KEY, log_dir TEXT, rel_path TEXT, kind TEXT,
+      size INTEGER, mtime_ns INTEGER, sha256 TEXT, header TEXT,
+      rows INTEGER, inserted INTEGER, merged_utc TEXT,
+      UNIQUE(log_dir, rel_path)
+    )""")
+    conn.execute("CREATE TABLE IF NOT EXISTS csv_rows(source_id INTEGER, line_no INTEGER, row TEXT)")
+    conn.execute("CREATE INDEX IF NOT EXISTS csv_rows_source ON csv_rows(source_id)")
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+
+
+# -------------- Quelldateien --------------
+
+@dataclass
+class SourceFile:
+    log_dir: str
+    rel_path: str
+    kind: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def path(self) -> pathlib.Path:
+        return pathlib.Path(self.log_dir) / self.rel_path
+
+
+def _db_files(path: pathlib.Path) -> List[pathlib.Path]:
+    """ Eine SQLite-DB samt WAL: Inhalt und Signatur hängen an beiden. """
+    wal = path.with_name(path.name + "-wal")
+    return [path, wal] if wal.exists() else [path]
+
+
+def discover(log_dirs: Sequence[str]) -> Iterator[SourceFile]:
+    for log_dir in log_dirs:
+        root = pathlib.Path(log_dir).resolve()
+        if not root.is_dir():
+            raise ValueError(f"Kein Log-Ordner: {log_dir}")
+        seen = set()
+        for kind, pattern in KINDS.items():
+            for path in sorted(root.rglob(pattern)):
+                if path in seen or not path.is_file():
+                    continue
+                seen.add(path)
+                files = _db_files(path) if kind == "events_db" else [path]
+                stats = [f.stat() for f in files]
+                yield SourceFile(str(root), path.relative_to(root).as_posix(), kind,
+                                 sum(st.st_size for st in stats), max(st.st_mtime_ns for st in stats))
+
+
+def file_hash(source: SourceFile) -> str:
+    digest = hashlib.sha256()
+    for path in (_db_files(source.path) if source.kind == "events_db" else [source.path]):
+        with open(path, "rb") as fp:
+            while chunk := fp.read(HASH_CHUNK):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+# -------------- Lesen (Worker-Prozesse) --------------
+
+def _event_row(session_id, round_idx, phase, actor, action, payload, t_mono_ns, t_utc_iso) -> tuple:
+    try:
+        typed = typed_fields(json.loads(payload)) if payload else typed_fields({})
+    except (ValueError, AttributeError):
+        typed = typed_fields({})
+    return (session_id, round_idx, phase, actor, action, payload, t_mono_ns, t_utc_iso, *typed)
+
+
+def _read_events_db(path: pathlib.Path) -> Optional[List[tuple]]:
+    """ None: keine Event-DB (z. B. touch_latency.sqlite3). """
+    conn = sqlite3.connect(f"file:{path.as_posix()}?mode=ro", uri=True)
+    try:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events'").fetchone() is None:
+            return None
+        return [_event_row(*row) for row in conn.execute(
+            f"SELECT {', '.join(EVENT_COLUMNS)} FROM events ORDER BY rowid")]
+    finally:
+        conn.close()
+
+
+def _read_events_csv(path: pathlib.Path) -> List[tuple]:
+    """ events.csv von event_log: ohne Kopfzeile, Spalten wie EVENT_COLUMNS. """
+    with open(path, encoding="utf-8", newline="") as fp:
+        rows = []
+        for row in csv.reader(fp):
+            if len(row) != len(EVENT_COLUMNS) or tuple(row) == EVENT_COLUMNS:
+                continue        # Kopfzeile (ältere Dateien) oder halb geschriebene letzte Zeile
+            session_id, round_idx, phase, actor, action, payload, t_mono_ns, t_utc_iso = row
+            rows.append(_event_row(session_id, int(round_idx), phase, actor, action, payload,
+                                   int(t_mono_ns), t_utc_iso))
+        return rows
+
+
+def _read_csv(path: pathlib.Path) -> Tuple[Optional[List[str]], List[tuple]]:
+    with open(path, encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp)
+        header = next(reader, None)
+        return header, [(line_no, json.dumps(row, ensure_ascii=False))
+                        for line_no, row in enumerate(reader, start=2) if row]
+
+
+@dataclass
+class ReadResult:
+    source: SourceFile
+    sha256: str
+    unchanged: bool = False
+    rows: Optional[List[tuple]] = None       # None: keine Event-DB
+    header: Optional[List[str]] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def read_source(job: Tuple[SourceFile, Optional[str]]) -> ReadResult:
+    """ Worker: Hash bilden; nur bei neuem Inhalt die Datei parsen. """
+    source, known_sha = job
+    t0 = time.perf_counter()
+    result = ReadResult(source, "")
+    try:
+        result.sha256 = file_hash(source)
+        if result.sha256 == known_sha:
+            result.unchanged = True
+        elif source.kind == "events_db":
+            result.rows = _read_events_db(source.path)
+        elif source.kind == "events_csv":
+            result.rows = _read_events_csv(source.path)
+        else:
+            result.header, result.rows = _read_csv(source.path)
+    except (OSError, ValueError, sqlite3.DatabaseError) as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+# -------------- Zusammenführen (Hauptprozess) --------------
+
+@dataclass
+class MergeStats:
+    files: int = 0
+    skipped: int = 0          # Größe + mtime unverändert
+    unchanged: int = 0        # neu gelesen, aber gleicher SHA-256
+    ingested: int = 0
+    events_read: int = 0
+    events_inserted: int = 0
+    csv_rows: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def duplicates(self) -> int:
+        return self.events_read - self.events_inserted
+
+
+def _write_result(conn: sqlite3.Connection, result: ReadResult, stats: MergeStats):
+    """ Eine Quelldatei in einer Transaktion: Zeilen + sources-Eintrag gemeinsam. """
+    source = result.source
+    now = datetime.now(timezone.utc).isoformat()
+    conn.execute("BEGIN")
+    conn.execute(
+        "INSERT INTO sources(log_dir, rel_path, kind) VALUES (?,?,?) "
+        "ON CONFLICT(log_dir, rel_path) DO NOTHING", (source.log_dir, source.rel_path, source.kind))
+    source_id = conn.execute("SELECT source_id FROM sources WHERE log_dir = ? AND rel_path = ?",
+                             (source.log_dir, source.rel_path)).fetchone()[0]
+    inserted = 0
+    if result.unchanged:
+        conn.execute("UPDATE sources SET size = ?, mtime_ns = ? WHERE source_id = ?",
+                     (source.size, source.mtime_ns, source_id))
+        conn.commit()
+        stats.unchanged += 1
+        return
+    rows = result.rows or []
+    if source.kind in ("events_db", "events_csv"):
+        before = conn.total_changes
+        conn.executemany(_INSERT_EVENT, [(*row, source_id) for row in rows])
+        inserted = conn.total_changes - before
+        stats.events_read += len(rows)
+        stats.events_inserted += inserted
+    else:
+        conn.execute("DELETE FROM csv_rows WHERE source_id = ?", (source_id,))
+        conn.executemany("INSERT INTO csv_rows VALUES (?,?,?)",
+                         [(source_id, line_no, row) for line_no, row in rows])
+        inserted = len(rows)
+        stats.csv_rows += inserted
+    conn.execute(
+        "UPDATE sources SET kind = ?, size = ?, mtime_ns = ?, sha256 = ?, header = ?, rows = ?, "
+        "inserted = ?, merged_utc = ? WHERE source_id = ?",
+        (source.kind if result.rows is not None else "ignored", source.size, source.mtime_ns,
+         result.sha256, None if result.header is None else json.dumps(result.header, ensure_ascii=False),
+         len(rows), inserted, now, source_id))
+    conn.commit()
+    stats.ingested += 1
+
+
+def merge(study_db: str, log_dirs: Sequence[str], workers: Optional[int] = None,
+          progress=None) -> MergeStats:
+    """
+    Führt alle Log-Ordner in `study_db` zusammen. workers=1 liest im aufrufenden Prozess,
+    None = ein Prozess pro CPU. `progress(ReadResult)` wird je gelesener Datei aufgerufen.
+    """
+    t0 = time.perf_counter()
+    stats = MergeStats()
+    pathlib.Path(study_db).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(study_db, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        create_study_db(conn)
+        known = {(log_dir, rel_path): (size, mtime_ns, sha256)
+                 for log_dir, rel_path, size, mtime_ns, sha256 in conn.execute(
+                     "SELECT log_dir, rel_path, size, mtime_ns, sha256 FROM sources")}
+        jobs = []
+        for source in discover(log_dirs):
+            stats.files += 1
+            size, mtime_ns, sha256 = known.get((source.log_dir, source.rel_path), (None, None, None))
+            if (size, mtime_ns) == (source.size, source.mtime_ns) and sha256:
+                stats.skipped += 1
+            else:
+                jobs.append((source, sha256))
+        # events.csv erst nach allen DBs: bei Duplikaten bleibt die DB als Herkunft stehen.
+        # Innerhalb einer Runde große Dateien zuerst, damit der Pool nicht auf Nachzügler wartet.
+        jobs.sort(key=lambda job: job[0].size, reverse=True)
+        rounds = [[job for job in jobs if job[0].kind != "events_csv"],
+                  [job for job in jobs if job[0].kind == "events_csv"]]
+
+        def handle(result: ReadResult):
+            if progress is not None:
+                progress(result)
+            if result.error:
+                stats.errors.append(f"{result.source.path}: {result.error}")
+            else:
+                _write_result(conn, result, stats)
+
+        if workers == 1 or len(jobs) <= 1:
+            for job in rounds[0] + rounds[1]:
+                handle(read_source(job))
+        elif jobs:
+            with multiprocessing.Pool(min(workers or os.cpu_count() or 1, len(jobs))) as pool:
+                for batch in rounds:
+                    for result in pool.imap_unordered(read_source, batch):
+                        handle(result)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Log-Ordner mehrerer Tabletop-PCs zu einer Studien-DB zusammenführen")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_merge = sub.add_parser("merge", help="Log-Ordner einlesen (idempotent)")
+    p_merge.add_argument("study_db")
+    p_merge.add_argument("log_dir", nargs="+")
+    p_merge.add_argument("--workers", type=int, default=None, help="Prozesse (Standard: CPU-Anzahl)")
+    p_merge.add_argument("-v", "--verbose", action="store_true", help="jede gelesene Datei ausgeben")
+    p_sources = sub.add_parser("sources", help="Quelldateien der Studien-DB auflisten")
+    p_sources.add_argument("study_db")
+    args = ap.parse_args()
+
+    if args.cmd == "sources":
+        conn = sqlite3.connect(f"file:{args.study_db}?mode=ro", uri=True)
+        try:
+            print(f"{'Art':<12}{'Zeilen':>9}{'neu':>9}  Datei")
+            for log_dir, rel_path, kind, rows, inserted in conn.execute(
+                    "SELECT log_dir, rel_path, kind, rows, inserted FROM sources ORDER BY log_dir, rel_path"):
+                print(f"{kind:<12}{rows or 0:>9}{inserted or 0:>9}  {log_dir}/{rel_path}")
+        finally:
+            conn.close()
+        return
+
+    def progress(result: ReadResult):
+        state = "unverändert" if result.unchanged else result.error or f"{len(result.rows or [])} Zeilen"
+        print(f"  {result.source.path}: {state} ({result.seconds:.2f} s)")
+
+    stats = merge(args.study_db, args.log_dir, args.workers, progress if args.verbose else None)
+    print(f"{stats.files} Dateien: {stats.ingested} übernommen, {stats.skipped} übersprungen, "
+          f"{stats.unchanged} inhaltlich gleich; {stats.events_inserted} neue Events "
+          f"({stats.duplicates} Duplikate), {stats.csv_rows} CSV-Zeilen in {stats.seconds:.2f} s")
+    for error in stats.errors:
+        print(f"  Fehler: {error}")
+    if stats.errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
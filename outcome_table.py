@@ -0,0 +1,163 @@
+# outcome_table.py  (vorberechnete Outcome-Tabelle: P1-Hand × P2-Hand × Signal × Call)
+#
+# Der Kartenraum ist winzig (Karten 7–11, drei Signalstufen, zwei Calls). Beim Import
+# wird jede Kombination genau einmal ausgewertet; GameEngine (_w/_wl) und die Tabletop-UIs
+# holen Gewinner, Wahrheitswert und Begründungs-ID danach per Indexzugriff.
+# Begründungstexte werden erst beim Anzeigen/Loggen formatiert (und dann gecacht).
+from __future__ import annotations
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+CARD_VALUES = (7, 8, 9, 10, 11)
+SIGNAL_LEVELS = ("hoch", "mittel", "tief")   # == SignalLevel.value
+CALLS = ("wahrheit", "bluff")                # == Call.value
+FORCED_BLUFF_TOTALS = (20, 21, 22)
+
+SIGNAL_CODES = {level: code for code, level in enumerate(SIGNAL_LEVELS)}
+CALL_CODES = {call: code for code, call in enumerate(CALLS)}
+
+# Vokabular der Tabletop-UIs → Engine-Vokabular
+UI_SIGNALS = {"high": "hoch", "mid": "mittel", "low": "tief"}
+UI_CALLS = {"wahr": "wahrheit", "bluff": "bluff"}
+
+# ---------------- Begründungen ----------------
+
+REASON_NO_SIGNAL = 0
+REASON_TRUTH_DOUBTED = 1
+REASON_FORCED_DOUBTED = 2
+REASON_BLUFF_DOUBTED = 3
+REASON_SHOWDOWN_P1 = 4
+REASON_SHOWDOWN_P2 = 5
+REASON_SHOWDOWN_DRAW = 6
+REASON_FORCED_BELIEVED = 7
+REASON_BLUFF_BELIEVED = 8
+
+_REASON_TEMPLATES = {
+    REASON_NO_SIGNAL: "Unbestimmt: Kein Signal gesetzt, Ergebnis kann nicht berechnet werden.",
+    REASON_TRUTH_DOUBTED: "P1 sagte die richtige Kategorie, P2 erwartete Bluff → P1 gewinnt.",
+    REASON_FORCED_DOUBTED: "P1 musste bluffen (20–22), P2 erwartete den Bluff → P2 gewinnt.",
+    REASON_BLUFF_DOUBTED: "P1 bluffte über die Kategorie, P2 erkannte den Bluff → P2 gewinnt.",
+    REASON_SHOWDOWN_P1: "P1 sagte {category} (korrekt), P2 glaubte → {p1_val} vs {p2_val} → P1 gewinnt.",
+    REASON_SHOWDOWN_P2: "P1 sagte {category} (korrekt), P2 glaubte → {p1_val} vs {p2_val} → P2 gewinnt.",
+    REASON_SHOWDOWN_DRAW: "P1 sagte {category} (korrekt), P2 glaubte → {p1_val} vs {p2_val} → Unentschieden.",
+    REASON_FORCED_BELIEVED: "P1 musste bluffen (20–22) und P2 glaubte → P1 gewinnt.",
+    REASON_BLUFF_BELIEVED: "P1 bluffte über die Kategorie, P2 glaubte → P1 gewinnt.",
+}
+
+# Punkteänderung (P1, P2) je Gewinner und Wertungsvariante
+SCORE_DELTAS: Dict[str, Dict[Optional[str], Tuple[int, int]]] = {
+    "w": {"P1": (1, 0), "P2": (0, 1), None: (0, 0)},
+    "wl": {"P1": (1, -1), "P2": (-1, 1), None: (0, 0)},
+}
+
+
+class Outcome(NamedTuple):
+    winner: Optional[str]          # "P1", "P2" oder None (Unentschieden)
+    truth: bool                    # hat P1 die echte Kategorie signalisiert?
+    reason_id: int
+    p1_category: Optional[str]     # SignalLevel.value oder None (erzwungener Bluff)
+    p2_category: Optional[str]
+    p1_value: int
+    p2_value: int
+
+    def score_delta(self, scoring: str) -> Tuple[int, int]:
+        return SCORE_DELTAS[scoring][self.winner]
+
+
+# -------------- Regeln (einzige Quelle, auch für hand_value/hand_category der Engines) --------------
+
+def hand_value(a: int, b: int) -> int:
+    s = a + b
+    return 0 if s in FORCED_BLUFF_TOTALS else s
+
+
+def hand_category(a: int, b: int) -> Optional[str]:
+    total = a + b
+    if total == 19:
+        return "hoch"
+    if total in (16, 17, 18):
+        return "mittel"
+    if total in (14, 15):
+        return "tief"
+    if total in FORCED_BLUFF_TOTALS or total > 22:
+        return None
+    return "mittel" if total >= 16 else "tief"
+
+
+def compute_outcome(p1_cards: Tuple[int, int], p2_cards: Tuple[int, int],
+                    signal: str, call: str) -> Outcome:
+    """ Regelwerk von GameEngine._resolve_outcome; dient auch als Fallback außerhalb 7–11. """
+    p1_category = hand_category(*p1_cards)
+    p2_category = hand_category(*p2_cards)
+    p1_val = hand_value(*p1_cards)
+    p2_val = hand_value(*p2_cards)
+    truth = (signal == p1_category)
+    forced_bluff = p1_category is None
+
+    if call == "bluff":
+        if truth:
+            winner, reason = "P1", REASON_TRUTH_DOUBTED
+        elif forced_bluff:
+            winner, reason = "P2", REASON_FORCED_DOUBTED
+        else:
+            winner, reason = "P2", REASON_BLUFF_DOUBTED
+    elif truth:
+        if p1_val > p2_val:
+            winner, reason = "P1", REASON_SHOWDOWN_P1
+        elif p2_val > p1_val:
+            winner, reason = "P2", REASON_SHOWDOWN_P2
+        else:
+            winner, reason = None, REASON_SHOWDOWN_DRAW
+    else:
+        winner = "P1"
+        reason = REASON_FORCED_BELIEVED if forced_bluff else REASON_BLUFF_BELIEVED
+    return Outcome(winner, truth, reason, p1_category, p2_category, p1_val, p2_val)
+
+
+# -------------- Tabelle --------------
+
+_N_CARDS = len(CARD_VALUES)
+_N_HANDS = _N_CARDS * _N_CARDS
+_CARD_INDEX = {value: idx for idx, value in enumerate(CARD_VALUES)}
+
+
+def _build_table() -> Tuple[Outcome, ...]:
+    entries = []
+    for a in CARD_VALUES:
+        for b in CARD_VALUES:
+            for c in CARD_VALUES:
+                for d in CARD_VALUES:
+                    for signal in SIGNAL_LEVELS:
+                        for call in CALLS:
+                            entries.append(compute_outcome((a, b), (c, d), signal, call))
+    return tuple(entries)
+
+
+TABLE: Tuple[Outcome, ...] = _build_table()
+
+
+def lookup(p1_cards: Tuple[int, int], p2_cards: Tuple[int, int],
+           signal: str, call: str) -> Outcome:
+    """ O(1)-Zugriff; signal/call im Engine-Vokabular (SignalLevel.value / Call.value). """
+    try:
+        h1 = _CARD_INDEX[p1_cards[0]] * _N_CARDS + _CARD_INDEX[p1_cards[1]]
+        h2 = _CARD_INDEX[p2_cards[0]] * _N_CARDS + _CARD_INDEX[p2_cards[1]]
+    except KeyError:
+        return compute_outcome(tuple(p1_cards), tuple(p2_cards), signal, call)
+    return TABLE[((h1 * _N_HANDS + h2) * 3 + SIGNAL_CODES[signal]) * 2 + CALL_CODES[call]]
+
+
+@lru_cache(maxsize=None)
+def _format_reason(reason_id: int, category: Optional[str], p1_val: int, p2_val: int) -> str:
+    return _REASON_TEMPLATES[reason_id].format(category=category, p1_val=p1_val, p2_val=p2_val)
+
+
+def reason_text(outcome: Optional[Outcome]) -> str:
+    """ Deutscher Begründungstext; None steht für "kein Signal gesetzt". """
+    if outcome is None:
+        return _REASON_TEMPLATES[REASON_NO_SIGNAL]
+    if outcome.reason_id in (REASON_SHOWDOWN_P1, REASON_SHOWDOWN_P2, REASON_SHOWDOWN_DRAW):
+        return _format_reason(outcome.reason_id, outcome.p1_category,
+                              outcome.p1_value, outcome.p2_value)
+    return _REASON_TEMPLATES[outcome.reason_id]
+
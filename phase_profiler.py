@@ -0,0 +1,198 @@
+# phase_profiler.py  (Laufzeit je Phasenwechsel und Logging-Aufruf, pro Tabletop-Rechner)
+#
+# Eingeschaltet über die Umgebung:
+#     PHASE_PROFILE=1 python tabletop_ux_kivy_base_w.py         (→ logs/profile.sqlite3)
+#     PHASE_PROFILE=/pfad/profile.sqlite3 PHASE_PROFILE_CPROFILE=1 python app_kivy2.py
+# attach() ersetzt dann auf der jeweiligen Instanz (GameEngine bzw. TabletopRoot) die
+# genannten Methoden durch Messhüllen: Wall- und CPU-Zeit des Threads, Speicherdelta
+# laut tracemalloc, Phase vorher/nachher. Die Messungen landen gesammelt in der Tabelle
+# profile_samples; mit PHASE_PROFILE_CPROFILE läuft zusätzlich cProfile über die ganze
+# Session (Dump: <source>_<session>.prof neben der DB).
+# Ausgeschaltet gibt attach() None zurück und fasst nichts an – die Methoden bleiben die
+# der Klasse, es entsteht kein Aufwand pro Aufruf.
+#     python phase_profiler.py report logs/profile.sqlite3 [--by host]
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import argparse
+import cProfile
+import functools
+import os
+import pathlib
+import socket
+import sqlite3
+import time
+import tracemalloc
+
+ENV_SWITCH = "PHASE_PROFILE"
+ENV_CPROFILE = "PHASE_PROFILE_CPROFILE"
+DEFAULT_DB = "logs/profile.sqlite3"
+FLUSH_EVERY = 256            # Messungen puffern, SQLite nicht im Takt der UI beschreiben
+
+# context() → (session_id, round_idx, phase); wird vor und nach jedem Aufruf abgefragt
+Context = Callable[[], Tuple[Optional[str], Optional[int], Optional[str]]]
+
+COLUMNS = ("host", "source", "session_id", "round_idx", "step", "phase_from", "phase_to",
+           "wall_ns", "cpu_ns", "alloc_bytes", "t_mono_ns")
+
+
+def _create_schema(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS profile_samples(
+      host TEXT, source TEXT, session_id TEXT, round_idx INT, step TEXT,
+      phase_from TEXT, phase_to TEXT, wall_ns INTEGER, cpu_ns INTEGER,
+      alloc_bytes INTEGER, t_mono_ns INTEGER
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS profile_samples_step ON profile_samples(source, step)")
+
+
+class PhaseProfiler:
+    """ Misst die instrumentierten Methoden eines Objekts; close() schreibt den Rest weg. """
+    def __init__(self, db_path: str, source: str, context: Context, use_cprofile: bool = False):
+        self.db_path = pathlib.Path(db_path)
+        self.source = source
+        self.context = context
+        self.host = socket.gethostname()
+        self._samples: List[tuple] = []
+        self._closed = False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._cprofile: Optional[cProfile.Profile] = None
+        if use_cprofile:
+            self._cprofile = cProfile.Profile()
+            try:
+                self._cprofile.enable()
+            except ValueError:   # anderer Profiler im selben Prozess (z. B. UI + Engine) aktiv
+                self._cprofile = None
+
+    def wrap(self, step: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def measured(*args, **kwargs):
+            _, _, phase_from = self.context()
+            alloc0 = tracemalloc.get_traced_memory()[0]
+            cpu0 = time.thread_time_ns()
+            t0 = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                wall = time.perf_counter_ns() - t0
+                cpu = time.thread_time_ns() - cpu0
+                alloc = tracemalloc.get_traced_memory()[0] - alloc0
+                session_id, round_idx, phase_to = self.context()
+                self._record((self.host, self.source, session_id, round_idx, step,
+                              phase_from, phase_to, wall, cpu, alloc, t0))
+        return measured
+
+    def _record(self, sample: tuple):
+        self._samples.append(sample)
+        if len(self._samples) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        if not self._samples:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            _create_schema(conn)
+            conn.executemany(
+                f"INSERT INTO profile_samples VALUES ({','.join('?' * len(COLUMNS))})",
+                self._samples,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self._samples.clear()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            session_id = self.context()[0] or "ohne_session"
+            self._cprofile.dump_stats(str(self.db_path.parent / f"{self.source}_{session_id}.prof"))
+
+
+def attach(obj: Any, steps: Iterable[str], source: str, context: Context) -> Optional[PhaseProfiler]:
+    """
+    Instrumentiert `steps` (Methodennamen) auf dieser Instanz, falls PHASE_PROFILE gesetzt
+    ist; sonst None und keinerlei Änderung an `obj`.
+    """
+    setting = os.environ.get(ENV_SWITCH)
+    if not setting:
+        return None
+    db_path = DEFAULT_DB if setting == "1" else setting
+    profiler = PhaseProfiler(db_path, source, context,
+                             use_cprofile=bool(os.environ.get(ENV_CPROFILE)))
+    for step in steps:
+        setattr(obj, step, profiler.wrap(step, getattr(obj, step)))
+    return profiler
+
+
+# -------------- Auswertung --------------
+
+def _percentile(sorted_values: List[int], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def report(db_path: str, by: Optional[str] = None, source: Optional[str] = None) -> List[Dict[str, Any]]:
+    """ Aggregiert alle Sessions je (source, step) – optional zusätzlich je host oder session_id. """
+    group_cols = ["source", "step"] + ([by] if by else [])
+    where, params = ("WHERE source = ?", (source,)) if source else ("", ())
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(group_cols)}, session_id, wall_ns, cpu_ns, alloc_bytes "
+            f"FROM profile_samples {where}", params,
+        ).fetchall()
+    finally:
+        conn.close()
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    n_keys = len(group_cols)
+    for row in rows:
+        group = groups.setdefault(row[:n_keys], {"sessions": set(), "wall": [], "cpu": [], "alloc": []})
+        group["sessions"].add(row[n_keys])
+        group["wall"].append(row[n_keys + 1])
+        group["cpu"].append(row[n_keys + 2])
+        group["alloc"].append(row[n_keys + 3])
+    result = []
+    for key, group in groups.items():
+        wall = sorted(group["wall"])
+        entry = dict(zip(group_cols, key))
+        entry.update({
+            "sessions": len(group["sessions"]),
+            "calls": len(wall),
+            "wall_p50_ms": _percentile(wall, 0.5) / 1e6,
+            "wall_p95_ms": _percentile(wall, 0.95) / 1e6,
+            "wall_max_ms": wall[-1] / 1e6,
+            "cpu_mean_ms": sum(group["cpu"]) / len(wall) / 1e6,
+            "alloc_mean_kb": sum(group["alloc"]) / len(wall) / 1024,
+        })
+        result.append(entry)
+    result.sort(key=lambda entry: -entry["wall_p95_ms"])
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Profil-Messungen je Phase/Schritt auswerten")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_report = sub.add_parser("report", help="Aggregat über alle Sessions")
+    p_report.add_argument("db", nargs="?", default=DEFAULT_DB)
+    p_report.add_argument("--by", choices=["host", "session_id"], default=None)
+    p_report.add_argument("--source", default=None, help="nur diese UI/Engine (Dateiname)")
+    args = ap.parse_args()
+
+    entries = report(args.db, args.by, args.source)
+    label = f"{args.by:<16}" if args.by else ""
+    print(f"{'Quelle':<28}{'Schritt':<20}{label}{'Sess.':>6}{'Aufrufe':>9}{'p50 ms':>9}"
+          f"{'p95 ms':>9}{'max ms':>9}{'CPU ms':>9}{'Δ KB':>9}")
+    for e in entries:
+        extra = f"{str(e[args.by]):<16}" if args.by else ""
+        print(f"{e['source']:<28}{e['step']:<20}{extra}{e['sessions']:>6}{e['calls']:>9}"
+              f"{e['wall_p50_ms']:>9.3f}{e['wall_p95_ms']:>9.3f}{e['wall_max_ms']:>9.3f}"
+              f"{e['cpu_mean_ms']:>9.3f}{e['alloc_mean_kb']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# schedule_cache.py  (Schedule-Compiler: Paare*.csv einmal validieren, danach binär per mmap laden)
+#
+# Eine einzige Parser-Definition für Engine (RoundSchedule) und Tabletop-UIs (load_blocks):
+#   Karten VP1 = erste zwei Zahlen in Spalten 2–5, Karten VP2 = erste zwei Zahlen in Spalten 8–11,
+#   Kategorie VP1/VP2 = Spalte 2/7, Wert VP1/VP2 = Spalte 6/11 (fehlt er: hand_value der Karten).
+# Das Ergebnis liegt in .schedule_cache/<name>.bin neben der CSV:
+#   Header (Magic, Formatversion, Rundenzahl, mtime/Größe + SHA-256 der CSV), Kategorien-Wörterbuch,
+#   danach pro Runde 8 int8 (4 Karten, 2 Werte, 2 Kategorie-Codes).
+# Gilt der Cache noch (mtime+Größe gleich, sonst SHA-256 gleich), wird nichts geparst.
+# Manuell vorkompilieren:  python schedule_cache.py compile Paare*.csv
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import io
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from outcome_table import CARD_VALUES, hand_value
+
+CACHE_DIRNAME = '.schedule_cache'
+MAGIC = b'MA1S'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHIIqq32s')    # magic, version, runden, kategorie-bytes, mtime_ns, größe, sha256
+ROW = struct.Struct('<8b')               # vp1 k1 k2, vp2 k1 k2, wert vp1/vp2, kategorie vp1/vp2
+NO_CATEGORY = -1
+
+VP1_CARD_COLS = (1, 5)                   # Spaltenfenster [start, ende) wie bisher in RoundSchedule
+VP2_CARD_COLS = (7, 11)
+VP1_CATEGORY_COL, VP2_CATEGORY_COL = 1, 6
+VP1_VALUE_COL, VP2_VALUE_COL = 5, 10
+
+
+@dataclass(frozen=True)
+class CompiledSchedule:
+    """ Runden eines Schedules; records[i] = (k1, k2, k1, k2, wert1, wert2, kat1, kat2). """
+    source: str
+    sha256: bytes
+    categories: Tuple[str, ...]
+    records: Tuple[Tuple[int, ...], ...]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def card_pairs(self) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """ [((VP1-Karten), (VP2-Karten)), ...] für RoundSchedule. """
+        return [((r[0], r[1]), (r[2], r[3])) for r in self.records]
+
+    def _category(self, code: int) -> Optional[str]:
+        return None if code == NO_CATEGORY else self.categories[code]
+
+    def ui_rounds(self) -> List[Dict]:
+        """ Rundenliste im Format von TabletopRoot.load_csv_rounds. """
+        return [
+            {
+                'vp1': (r[0], r[1]),
+                'vp2': (r[2], r[3]),
+                'vp1_value': r[4],
+                'vp2_value': r[5],
+                'vp1_category': self._category(r[6]),
+                'vp2_category': self._category(r[7]),
+            }
+            for r in self.records
+        ]
+
+
+# -------------- Compiler --------------
+
+def _number(cell) -> Optional[int]:
+    text = (cell or '').strip().replace(',', '.')
+    if not text:
+        return None
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return int(value) if value.is_integer() else None
+
+
+def _cards(row: Sequence[str], window: Tuple[int, int]) -> Tuple[int, int]:
+    start, end = window
+    values = []
+    for cell in row[start:end]:
+        value = _number(cell)
+        if value is None:
+            continue
+        values.append(value)
+        if len(values) == 2:
+            break
+    if len(values) < 2:
+        raise ValueError(f"Zu wenige Karten in Spalten {start+1}–{end}.")
+    return values[0], values[1]
+
+
+def _cell(row: Sequence[str], idx: int) -> str:
+    return row[idx] if idx < len(row) else ''
+
+
+def compile_rows(rows: List[List[str]]) -> Tuple[Tuple[str, ...], List[Tuple[int, ...]]]:
+    """ Validiert die CSV-Zeilen; Rückgabe: (Kategorien-Wörterbuch, Records). """
+    start = 0
+    try:
+        _cards(rows[0], VP1_CARD_COLS); _cards(rows[0], VP2_CARD_COLS)
+    except (IndexError, ValueError):
+        start = 1          # Kopfzeile
+    categories: Dict[str, int] = {}
+
+    def category_code(cell: str) -> int:
+        text = (cell or '').strip().strip('"').lower()
+        if not text:
+            return NO_CATEGORY
+        return categories.setdefault(text, len(categories))
+
+    records = []
+    for line_no, row in enumerate(rows[start:], start=start + 1):
+        if not row or all((c or '').strip() == '' for c in row):
+            continue
+        try:
+            vp1 = _cards(row, VP1_CARD_COLS)
+            vp2 = _cards(row, VP2_CARD_COLS)
+        except ValueError as exc:
+            raise ValueError(f"Zeile {line_no}: {exc}") from None
+        for card in (*vp1, *vp2):
+            if card not in CARD_VALUES:
+                raise ValueError(f"Zeile {line_no}: ungültiger Kartenwert {card}.")
+        v1 = _number(_cell(row, VP1_VALUE_COL))
+        v2 = _number(_cell(row, VP2_VALUE_COL))
+        for value in (v1, v2):
+            if value is not None and not 0 <= value <= 22:
+                raise ValueError(f"Zeile {line_no}: ungültiger Handwert {value}.")
+        records.append((
+            *vp1, *vp2,
+            hand_value(*vp1) if v1 is None else v1,
+            hand_value(*vp2) if v2 is None else v2,
+            category_code(_cell(row, VP1_CATEGORY_COL)),
+            category_code(_cell(row, VP2_CATEGORY_COL)),
+        ))
+    if not records:
+        raise ValueError("Keine Runden in CSV gefunden.")
+    if len(categories) > 127:
+        raise ValueError("Zu viele verschiedene Kategorien für das Binärformat.")
+    return tuple(categories), records
+
+
+def cache_path(csv_path) -> str:
+    csv_path = os.path.abspath(csv_path)
+    folder, name = os.path.split(csv_path)
+    return os.path.join(folder, CACHE_DIRNAME, os.path.splitext(name)[0] + '.bin')
+
+
+def compile_schedule(csv_path, write: bool = True) -> CompiledSchedule:
+    """ Parst und validiert die CSV und schreibt (atomar) den Binär-Cache. """
+    with open(csv_path, 'rb') as fp:
+        raw = fp.read()
+        st = os.fstat(fp.fileno())
+    digest = hashlib.sha256(raw).digest()
+    rows = list(csv.reader(io.StringIO(raw.decode('utf-8'), newline='')))
+    categories, records = compile_rows(rows)
+    schedule = CompiledSchedule(str(csv_path), digest, categories, tuple(records))
+    if write:
+        try:
+            _write_cache(cache_path(csv_path), schedule, st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass            # schreibgeschützter Ordner: Schedule trotzdem nutzbar
+    return schedule
+
+
+def _write_cache(path: str, schedule: CompiledSchedule, mtime_ns: int, size: int):
+    blob = '\n'.join(schedule.categories).encode('utf-8')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as fp:
+        fp.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(schedule.records), len(blob),
+                             mtime_ns, size, schedule.sha256))
+        fp.write(blob)
+        for record in schedule.records:
+            fp.write(ROW.pack(*record))
+    os.replace(tmp, path)
+
+
+# -------------- Loader --------------
+
+def _read_cache(path: str, source: str):
+    """ Rückgabe: (Header-Felder, CompiledSchedule) oder None bei fehlendem/defektem Cache. """
+    try:
+        with open(path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < HEADER.size:
+                return None
+            magic, version, n_rounds, cat_len, mtime_ns, size, digest = HEADER.unpack_from(mm, 0)
+            body = HEADER.size + cat_len
+            if (magic != MAGIC or version != FORMAT_VERSION
+                    or len(mm) != body + n_rounds * ROW.size):
+                return None
+            blob = mm[HEADER.size:body].decode('utf-8')
+            with memoryview(mm) as view:
+                records = tuple(ROW.iter_unpack(view[body:]))
+    except (OSError, ValueError):
+        return None
+    categories = tuple(blob.split('\n')) if blob else ()
+    return (mtime_ns, size), CompiledSchedule(source, digest, categories, records)
+
+
+def load(csv_path) -> CompiledSchedule:
+    """
+    Kompilierten Schedule laden. Der Cache gilt, wenn mtime und Größe der CSV zum Header
+    passen oder – z. B. nach einem git checkout – der SHA-256 des Inhalts gleich ist.
+    Sonst wird neu kompiliert. ValueError bei ungültiger CSV, OSError wenn sie fehlt.
+    """
+    st = os.stat(csv_path)
+    cached = _read_cache(cache_path(csv_path), str(csv_path))
+    if cached is not None:
+        (mtime_ns, size), schedule = cached
+        if (mtime_ns, size) == (st.st_mtime_ns, st.st_size):
+            return schedule
+        with open(csv_path, 'rb') as fp:
+            if hashlib.sha256(fp.read()).digest() == schedule.sha256:
+                try:
+                    _write_cache(cache_path(csv_path), schedule, st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+                return schedule
+    return compile_schedule(csv_path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Schedule-CSVs in den Binär-Cache kompilieren')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    p_compile = sub.add_parser('compile', help='CSV(s) validieren und Cache schreiben')
+    p_compile.add_argument('csv', nargs='+')
+    p_status = sub.add_parser('status', help='Zeigt, ob der Cache aktuell ist')
+    p_status.add_argument('csv', nargs='+')
+    args = ap.parse_args()
+    for path in args.csv:
+        if args.cmd == 'compile':
+            schedule = compile_schedule(path)
+            print(f'{path}: {len(schedule)} Runden → {cache_path(path)}')
+        else:
+            st = os.stat(path)
+            cached = _read_cache(cache_path(path), path)
+            fresh = cached is not None and cached[0] == (st.st_mtime_ns, st.st_size)
+            print(f"{path}: {'aktuell' if fresh else 'fehlt oder veraltet'}")
+
+
+if __name__ == '__main__':
+    main()
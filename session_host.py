@@ -0,0 +1,233 @@
+# session_host.py  (mehrere Spieltische in einem Prozess)
+#
+# Ohne Host bringt jede GameEngine ihren eigenen EventLogger mit: eine SQLite-Verbindung
+# (plus WAL-/SHM-Handles) und im Async-Modus einen Writer-Thread pro Tisch; bei vielen
+# Tischen konkurrieren diese Verbindungen zudem um die Schreibsperre derselben DB.
+# Der SessionHost hält N Engines (Schlüssel: session_id), die sich einen EventLogger und
+# die geladenen Schedules teilen. Befehle aus beliebigen Threads landen über submit() in
+# einer Queue; ein einziger Dispatch-Thread führt sie der Reihe nach auf der richtigen
+# Engine aus. Ein Fehler eines Tisches (z. B. falsche Phase) landet nur im Future dieses
+# Befehls – die anderen Tische laufen unverändert weiter.
+#     host = SessionHost("logs/events.sqlite3"); host.start()
+#     host.open_table(GameEngineConfig(session_id="T01", csv_path="Paare1.csv"))
+#     host.submit("T01", "click_start", Player.P1)
+from __future__ import annotations
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import importlib
+import pathlib
+import queue
+import threading
+
+from event_log import Durability, EventLogger
+
+VARIANTS = ("w", "wl")
+
+# Engine-Methoden, die über den Host aufgerufen werden dürfen
+COMMANDS = frozenset({
+    "click_start", "click_reveal_card", "p1_signal", "p2_call", "click_next_round",
+    "get_public_state", "state_since", "export_state", "restore_state",
+    "subscribe", "unsubscribe",
+})
+
+_STOP = object()   # Queue-Marker: Dispatch-Schleife beenden
+
+
+class TableLogger:
+    """ Sicht eines Tisches auf den gemeinsamen EventLogger; close() schließt nur den Tisch. """
+    def __init__(self, shared: EventLogger):
+        self.shared = shared
+
+    def log(self, *args, **kwargs):
+        return self.shared.log(*args, **kwargs)
+
+    def add_view(self, target: str, header: Sequence[str]):
+        self.shared.add_view(target, header)
+
+    @property
+    def written_seq(self) -> int:
+        return self.shared.written_seq
+
+    def mark_round_end(self):
+        # Commit nur anstoßen: ein wartender Tisch würde die Dispatch-Schleife für alle blockieren
+        self.shared.mark_round_end(wait=False)
+
+    def mark_idle(self, truncate: bool = True):
+        self.shared.mark_idle(truncate)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self.shared.flush(timeout)
+
+    def close(self):
+        pass   # der gemeinsame Logger wird erst von SessionHost.close() geschlossen
+
+
+@dataclass
+class Table:
+    engine: Any
+    variant: str
+    commands: int = 0
+    errors: int = 0
+
+
+class SessionHost:
+    """
+    Besitzt die Engines aller Tische, einen gemeinsamen EventLogger (`db_path`, optional
+    events.csv unter `csv_log_path`) und einen Schedule-Cache pro CSV. cfg.db_path und die
+    Logger-Einstellungen der einzelnen GameEngineConfigs werden ignoriert; die Session-CSV
+    jedes Tisches bleibt ein View unter cfg.log_dir.
+
+    Ohne start() laufen Befehle direkt im aufrufenden Thread (Skripte, Benchmarks); nach
+    start() nur noch im Dispatch-Thread, der als einziger Engines und Logger anfasst.
+    """
+    def __init__(self, db_path: str = "logs/events.sqlite3", csv_log_path: Optional[str] = None, *,
+                 log_async: bool = True, durability: str = Durability.ROUND.value,
+                 batch_size: int = 256, batch_interval: float = 0.05,
+                 queue_size: int = 10_000):
+        self.logger = EventLogger(
+            db_path, csv_log_path, async_mode=log_async, batch_size=batch_size,
+            batch_interval=batch_interval, queue_size=queue_size, durability=durability,
+        )
+        self.tables: Dict[str, Table] = {}
+        self._schedules: Dict[Tuple[str, str, int], Any] = {}
+        self._commands: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    # --- Dispatch ---
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if self._closed:
+            raise RuntimeError("SessionHost ist bereits geschlossen.")
+        self._thread = threading.Thread(
+            target=self._dispatch_loop, name="SessionHost-dispatch", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, session_id: Optional[str], command: str, *args, **kwargs) -> Future:
+        """
+        Reiht `command` für den Tisch `session_id` ein. Das Future liefert den Rückgabewert
+        der Engine-Methode oder deren Exception (RuntimeError bei falscher Phase usw.).
+        """
+        if self._closed:
+            raise RuntimeError("SessionHost ist bereits geschlossen.")
+        future: Future = Future()
+        if self._thread is None:
+            self._run(future, session_id, command, args, kwargs)
+        else:
+            self._commands.put((future, session_id, command, args, kwargs))
+        return future
+
+    def call(self, session_id: Optional[str], command: str, *args, **kwargs) -> Any:
+        """ Wie submit(), wartet aber auf das Ergebnis (nicht aus dem Dispatch-Thread aufrufen). """
+        return self.submit(session_id, command, *args, **kwargs).result()
+
+    def _dispatch_loop(self):
+        while True:
+            item = self._commands.get()
+            if item is _STOP:
+                return
+            self._run(*item)
+
+    def _run(self, future: Future, session_id: Optional[str], command: str,
+             args: tuple, kwargs: dict):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self._execute(session_id, command, args, kwargs)
+        except Exception as exc:   # Fehler bleibt beim Tisch, die Schleife läuft weiter
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _execute(self, session_id: Optional[str], command: str, args: tuple, kwargs: dict) -> Any:
+        if command == "open_table":
+            return self._open_table(*args, **kwargs)
+        if command == "close_table":
+            return self._close_table(session_id)
+        if command == "log":
+            # Events von UIs mit eigener Spiellogik (Tabletop) über den gemeinsamen Logger
+            return self.logger.log(session_id, *args, **kwargs)
+        if command == "round_end":
+            return self.logger.mark_round_end(wait=False)
+        if command == "idle":
+            return self.logger.mark_idle(*args)
+        table = self.tables.get(session_id)
+        if table is None:
+            raise KeyError(f"Unbekannter Tisch: {session_id}")
+        if command not in COMMANDS:
+            raise ValueError(f"Unbekannter Befehl: {command}")
+        table.commands += 1
+        try:
+            return getattr(table.engine, command)(*args, **kwargs)
+        except Exception:
+            table.errors += 1
+            raise
+
+    # --- Tische ---
+
+    def open_table(self, cfg, variant: str = "w"):
+        """ Legt einen Tisch an (cfg: GameEngineConfig der Variante); Rückgabe: die Engine. """
+        return self.call(None, "open_table", cfg, variant)
+
+    def close_table(self, session_id: str):
+        self.call(session_id, "close_table")
+
+    def schedule(self, variant: str, csv_path: str):
+        """ RoundSchedule je Variante und CSV – einmal geladen, von allen Tischen geteilt. """
+        path = pathlib.Path(csv_path).resolve()
+        key = (variant, str(path), path.stat().st_mtime_ns)
+        schedule = self._schedules.get(key)
+        if schedule is None:
+            schedule = self._engine_module(variant).RoundSchedule(str(path))
+            self._schedules[key] = schedule
+        return schedule
+
+    def _engine_module(self, variant: str):
+        if variant not in VARIANTS:
+            raise ValueError(f"Unbekannte Variante: {variant} (erlaubt: {', '.join(VARIANTS)})")
+        return importlib.import_module(f"game_engine_{variant}")
+
+    def _open_table(self, cfg, variant: str):
+        if cfg.session_id in self.tables:
+            raise ValueError(f"Tisch {cfg.session_id} ist bereits offen.")
+        engine = self._engine_module(variant).GameEngine(
+            cfg, schedule=self.schedule(variant, cfg.csv_path), logger=TableLogger(self.logger)
+        )
+        self.tables[cfg.session_id] = Table(engine=engine, variant=variant)
+        return engine
+
+    def _close_table(self, session_id: str):
+        table = self.tables.pop(session_id, None)
+        if table is None:
+            raise KeyError(f"Unbekannter Tisch: {session_id}")
+        table.engine.close()
+        # wie TableLogger.mark_round_end: Commit nur anstoßen, die anderen Tische laufen weiter
+        self.logger.mark_round_end(wait=False)
+
+    # --- Abschluss ---
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"session_id": session_id, "variant": table.variant,
+             "round_idx": table.engine.round_idx, "phase": table.engine.current.phase.name,
+             "commands": table.commands, "errors": table.errors}
+            for session_id, table in self.tables.items()
+        ]
+
+    def close(self):
+        """ Beendet die Dispatch-Schleife (offene Befehle laufen noch), schließt alle Tische. """
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._commands.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        for table in self.tables.values():
+            table.engine.close()
+        self.tables.clear()
+        self.logger.close()
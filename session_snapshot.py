@@ -0,0 +1,134 @@
+# session_snapshot.py  (absturzsichere Snapshots laufender Sessions für Engine und UIs)
+#
+# Jede UI schreibt nach jeder Zustandsänderung (mindestens bei jedem Phasenwechsel) einen
+# kompakten JSON-Snapshot nach logs/snapshots/<ui>/<session>.json: erst in eine Temp-Datei,
+# dann os.replace – die Datei ist also immer entweder der alte oder der neue Stand.
+# Ohne fsync kostet ein Snapshot deutlich unter 1 ms (bench: python session_snapshot.py bench);
+# nach einem Stromausfall kann er höchstens den letzten Schritt zurückliegen, die Event-DB
+# bleibt die vollständige Quelle. Beim Start sucht die UI per latest_unfinished() nach
+# einer unterbrochenen Session und setzt sie in genau der gespeicherten Phase fort.
+from __future__ import annotations
+import argparse
+import json
+import os
+import pathlib
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+FORMAT_VERSION = 1
+
+
+class SnapshotStore:
+    """ Ein Snapshot pro Session-Schlüssel (z. B. "S012"), atomar ersetzt. """
+    def __init__(self, directory, fsync: bool = False):
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+
+    def path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.json"
+
+    def save(self, key: str, state: Dict[str, Any], finished: bool = False):
+        data = json.dumps(
+            {"version": FORMAT_VERSION, "saved": time.time(), "finished": finished,
+             "state": state},
+            ensure_ascii=False, separators=(",", ":"),
+        )
+        target = self.path(key)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fp:
+            fp.write(data)
+            if self.fsync:
+                fp.flush()
+                os.fsync(fp.fileno())
+        os.replace(tmp, target)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """ Vollständiger Eintrag (version, saved, finished, state) oder None. """
+        try:
+            with open(self.path(key), encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != FORMAT_VERSION:
+            return None
+        return data
+
+    def discard(self, key: str):
+        try:
+            self.path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def unfinished(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """ Alle nicht abgeschlossenen Snapshots, neuester zuerst. """
+        found = []
+        for path in self.directory.glob("*.json"):
+            data = self.load(path.stem)
+            if data is not None and not data.get("finished"):
+                found.append((path.stem, data))
+        found.sort(key=lambda item: item[1].get("saved", 0), reverse=True)
+        return found
+
+    def latest_unfinished(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        entries = self.unfinished()
+        return entries[0] if entries else None
+
+
+def int_keys(mapping: Optional[Dict[str, Any]]) -> Optional[Dict[int, Any]]:
+    """ JSON macht aus int-Schlüsseln (Spieler 1/2) Strings – hier zurückwandeln. """
+    if mapping is None:
+        return None
+    return {int(key): value for key, value in mapping.items()}
+
+
+def bench(directory: str, writes: int, fsync: bool) -> Tuple[float, float]:
+    """ Rückgabe: (Median, Maximum) der Schreibdauer in ms für einen typischen UI-Snapshot. """
+    store = SnapshotStore(directory, fsync=fsync)
+    state = {
+        "session_number": 12, "current_block_idx": 1, "next_block_idx": 2,
+        "transition_final": False, "transition_message": "", "transition_button": "",
+        "engine": {
+            "round_idx": 7, "scores": {"VP1": 19, "VP2": 13},
+            "current": {
+                "index": 7, "phase": "CALL_WAIT", "roles": {"P1": "VP2", "P2": "VP1"},
+                "p1_ready": False, "p2_ready": False,
+                "next_ready_p1": False, "next_ready_p2": False,
+                "p1_revealed": [True, True], "p2_revealed": [True, True],
+                "p1_signal": "mittel", "p2_call": None, "winner": None, "outcome_reason": None,
+            },
+        },
+    }
+    times = []
+    for _ in range(writes):
+        t0 = time.perf_counter()
+        store.save("BENCH", state)
+        times.append((time.perf_counter() - t0) * 1000.0)
+    store.discard("BENCH")
+    times.sort()
+    return times[len(times) // 2], times[-1]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Session-Snapshots")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_list = sub.add_parser("list", help="Nicht abgeschlossene Sessions je UI anzeigen")
+    p_list.add_argument("--dir", default="logs/snapshots")
+    p_bench = sub.add_parser("bench", help="Schreibdauer messen")
+    p_bench.add_argument("--dir", default="logs/snapshots")
+    p_bench.add_argument("--writes", type=int, default=2000)
+    args = ap.parse_args()
+    if args.cmd == "list":
+        for ui_dir in sorted(pathlib.Path(args.dir).glob("*/")):
+            for key, data in SnapshotStore(ui_dir).unfinished():
+                saved = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(data.get("saved", 0)))
+                print(f"{ui_dir.name}/{key}: {saved}")
+    else:
+        for fsync in (False, True):
+            median, worst = bench(args.dir, args.writes, fsync)
+            label = "mit fsync" if fsync else "ohne fsync"
+            print(f"{label:<12} Median {median:.3f} ms, Maximum {worst:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# tabletop_bot.py  (Tabletop-UI ohne sichtbares Fenster mit Bot-Spielern durchspielen – Lasttest)
+#
+# Baut TabletopRoot aus einer der drei Tabletop-UIs, startet eine Session und lässt zwei
+# Bots über die echten Handler spielen: start_pressed, tap_card in der erzwungenen
+# Reihenfolge, pick_signal, pick_decision – durch alle Blöcke aus load_blocks bis
+# session_finished. Die 0.2-s-Verzögerungen der UI laufen über eine virtuelle Uhr (BotClock
+# statt kivy.clock.Clock im Modul der UI), also so schnell wie möglich.
+# Gemessen: Runden/Sekunde, Speicher (tracemalloc) je Runde samt Anstieg pro Runde, und die
+# Schreibzugriffe: Events an den Logger, Zeilen im Runden-CSV, Snapshots; am Ende wird
+# gegengeprüft, dass alle Events in der SQLite-DB angekommen sind.
+# Ohne Display: Kivy mit SDL_VIDEODRIVER=dummy und KIVY_GL_BACKEND=mock (wird hier
+# vorbelegt), sonst unter xvfb-run.
+#     python tabletop_bot.py --ui tabletop_ux_kivy_base_wl --sessions 3
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+import argparse
+import gc
+import heapq
+import importlib
+import itertools
+import os
+import pathlib
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from session_snapshot import SnapshotStore
+
+UIS = ["tabletop_ux_kivy_base_w", "tabletop_ux_kivy_base_wl", "tabletop_ux_kivy_aruco_w"]
+SIGNAL_LEVELS = ("low", "mid", "high")
+DECISIONS = ("bluff", "wahr")
+
+
+def prepare_headless():
+    """ Vor dem ersten Kivy-Import: kein Fenster zeigen, ohne Display Dummy-Treiber nehmen. """
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    os.environ.pop("ENGINE_SERVER", None)   # Bots loggen lokal, damit die DB gegengeprüft werden kann
+    if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("KIVY_GL_BACKEND", "mock")
+    from kivy.config import Config
+    Config.set("graphics", "window_state", "hidden")
+    Config.set("graphics", "fullscreen", "0")
+
+
+class _BotEvent:
+    def __init__(self, callback: Callable, interval: Optional[float]):
+        self.callback = callback
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class BotClock:
+    """
+    Virtuelle Uhr mit der von den UIs benutzten Clock-Schnittstelle. run_pending() führt
+    alle einmaligen Events in Zeitreihenfolge aus und stellt die Uhr entsprechend vor;
+    Intervalle (Marker-Poll der ArUco-UI) werden angenommen, aber nie ausgeführt.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self._events: List[tuple] = []
+        self._order = itertools.count()
+
+    def schedule_once(self, callback: Callable, timeout: float = 0) -> _BotEvent:
+        event = _BotEvent(callback, None)
+        heapq.heappush(self._events, (self.now + max(0.0, timeout), next(self._order), event))
+        return event
+
+    def schedule_interval(self, callback: Callable, interval: float) -> _BotEvent:
+        return _BotEvent(callback, interval)
+
+    def unschedule(self, callback: Callable):
+        for _, _, event in self._events:
+            if event.callback is callback:
+                event.cancel()
+
+    def get_time(self) -> float:
+        return self.now
+
+    def clear(self):
+        self._events.clear()
+
+    def run_pending(self) -> int:
+        ran = 0
+        while self._events:
+            due, _, event = heapq.heappop(self._events)
+            if event.cancelled:
+                continue
+            dt = due - self.now
+            self.now = due
+            event.callback(dt)
+            ran += 1
+        return ran
+
+
+@dataclass
+class WriteCounter:
+    events: int = 0
+    round_log_rows: int = 0
+    snapshots: int = 0
+
+    def count(self, name: str, method: Callable) -> Callable:
+        def counted(*args, **kwargs):
+            setattr(self, name, getattr(self, name) + 1)
+            return method(*args, **kwargs)
+        return counted
+
+
+@dataclass
+class SessionReport:
+    session_id: str
+    rounds: int
+    seconds: float
+    writes: WriteCounter
+    db_events: int
+    memory: List[int] = field(default_factory=list)   # tracemalloc-Bytes nach jeder Runde
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.seconds if self.seconds else 0.0
+
+    def memory_slope(self, warmup: int = 4) -> float:
+        """ Bytes pro Runde (Kleinste Quadrate nach `warmup` Runden). """
+        points = self.memory[warmup:] if len(self.memory) > warmup + 1 else self.memory
+        if len(points) < 2:
+            return 0.0
+        n = len(points)
+        mean_x = (n - 1) / 2
+        mean_y = sum(points) / n
+        cov = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(points))
+        var = sum((x - mean_x) ** 2 for x in range(n))
+        return cov / var
+
+
+class TabletopBot:
+    """ Zwei Bot-Spieler an einem TabletopRoot; play() spielt die Session bis zum Ende. """
+    def __init__(self, ui: Any, root: Any, clock: BotClock, *, truth_rate: float = 0.7,
+                 seed: int = 0):
+        self.ui = ui
+        self.root = root
+        self.clock = clock
+        self.truth_rate = truth_rate
+        self.rng = random.Random(seed)
+        self.card_phases = {
+            ui.PH_P1_INNER: (1, "inner"), ui.PH_P2_INNER: (2, "inner"),
+            ui.PH_P1_OUTER: (1, "outer"), ui.PH_P2_OUTER: (2, "outer"),
+        }
+
+    def step(self):
+        """ Eine Aktion passend zur aktuellen Phase, danach die geplanten Phasenwechsel. """
+        root, ui = self.root, self.ui
+        if root.phase in (ui.PH_WAIT_BOTH_START, ui.PH_SHOWDOWN):
+            root.start_pressed(1)
+            root.start_pressed(2)
+        elif root.phase in self.card_phases:
+            root.tap_card(*self.card_phases[root.phase])
+        elif root.phase == ui.PH_SIGNALER:
+            level = root.determine_signal_level(root.signaler)
+            if level is None or self.rng.random() >= self.truth_rate:
+                level = self.rng.choice([lvl for lvl in SIGNAL_LEVELS if lvl != level])
+            root.pick_signal(root.signaler, level)
+        elif root.phase == ui.PH_JUDGE:
+            root.pick_decision(root.judge, self.rng.choice(DECISIONS))
+        else:
+            raise RuntimeError(f"Bot kennt Phase {root.phase!r} nicht.")
+        self.clock.run_pending()
+
+    def play(self, max_steps: int = 100_000) -> List[int]:
+        """ Spielt bis session_finished; Speicher (tracemalloc) nach jeder Runde. """
+        root = self.root
+        memory: List[int] = []
+        last_round = root.round
+        for _ in range(max_steps):
+            if root.session_finished:
+                return memory
+            self.step()
+            if root.round != last_round:
+                last_round = root.round
+                gc.collect()
+                memory.append(tracemalloc.get_traced_memory()[0])
+        raise RuntimeError(f"Session nach {max_steps} Bot-Aktionen nicht beendet (Phase {root.phase}).")
+
+
+def run_session(ui: Any, clock: BotClock, log_dir: pathlib.Path, number: int,
+                truth_rate: float, seed: int) -> SessionReport:
+    clock.clear()
+    root = ui.TabletopRoot()
+    clock.clear()   # resume_or_prompt: der Bot startet seine Session selbst
+    if getattr(root, "aruco", None) is not None:
+        root.stop_marker_tracking()
+    root.log_dir = log_dir
+    root.snapshots = SnapshotStore(log_dir / "snapshots")
+    writes = WriteCounter()
+    root.write_round_log = writes.count("round_log_rows", root.write_round_log)
+    root.snapshots.save = writes.count("snapshots", root.snapshots.save)
+    root.start_session(number)
+    root.logger.log = writes.count("events", root.logger.log)
+
+    t0 = time.perf_counter()
+    memory = TabletopBot(ui, root, clock, truth_rate=truth_rate, seed=seed).play()
+    seconds = time.perf_counter() - t0
+    root.logger.close()
+    root.close_round_log()
+    if root.profiler:
+        root.profiler.close()
+    if root.touch_latency:
+        root.touch_latency.close()
+
+    conn = sqlite3.connect(log_dir / f"events_{root.session_id}.sqlite3")
+    try:
+        db_events = conn.execute(
+            "SELECT COUNT(*) FROM events WHERE session_id = ?", (root.session_id,)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return SessionReport(root.session_id, len(memory), seconds, writes, db_events, memory)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tabletop-UI headless mit Bot-Spielern durchspielen")
+    ap.add_argument("--ui", choices=UIS, default=UIS[0])
+    ap.add_argument("--sessions", type=int, default=1, help="Sessions nacheinander im selben Prozess")
+    ap.add_argument("--first-session", type=int, default=900)
+    ap.add_argument("--truth-rate", type=float, default=0.7, help="Anteil ehrlicher Signale")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--log-dir", default=None, help="Logs hier behalten statt im Temp-Ordner")
+    args = ap.parse_args()
+
+    prepare_headless()
+    ui = importlib.import_module(args.ui)
+    clock = BotClock()
+    ui.Clock = clock
+    tracemalloc.start()
+
+    print(f"{args.ui}: {args.sessions} Session(s), Bots mit {args.truth_rate:.0%} ehrlichen Signalen")
+    print(f"{'Session':<9}{'Runden':>7}{'Runden/s':>10}{'Events':>8}{'in DB':>7}{'CSV':>6}"
+          f"{'Snapsh.':>8}{'Speicher KB':>13}{'Δ B/Runde':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = pathlib.Path(args.log_dir or tmp)
+        failed = False
+        for offset in range(args.sessions):
+            report = run_session(ui, clock, log_dir, args.first_session + offset,
+                                 args.truth_rate, args.seed + offset)
+            w = report.writes
+            print(f"{report.session_id:<9}{report.rounds:>7}{report.rounds_per_second:>10.1f}"
+                  f"{w.events:>8}{report.db_events:>7}{w.round_log_rows:>6}{w.snapshots:>8}"
+                  f"{report.memory[-1] / 1024 if report.memory else 0:>13.0f}"
+                  f"{report.memory_slope():>11.0f}")
+            if report.db_events != w.events:
+                print(f"  Achtung: {w.events - report.db_events} Events fehlen in der DB")
+                failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,7 @@ from kivy.app import App
 from kivy.clock import Clock
 from kivy.config import Config
 from kivy.core.window import Window
-from kivy.graphics import Color, Rectangle, PushMatrix, PopMatrix, Rotate
+from kivy.graphics import Color, Rectangle, PushMatrix, PopMatrix, Rotate, Line, InstructionGroup
 from kivy.uix.image import Image
 from kivy.uix.widget import Widget
 from kivy.uix.button import Button
@@ -33,6 +33,14 @@ from kivy.uix.label import Label
 from kivy.graphics import Color, Rectangle, PushMatrix, PopMatrix, Rotate
 
 from game_engine_wl import EventLogger, Phase as EnginePhase
+import aruco_capture
+import outcome_table
+import engine_server
+import phase_profiler
+import touch_latency
+import schedule_cache
+from session_snapshot import SnapshotStore, int_keys
+import ux_assets
 
 # --- Display fest auf 3840x2160, Vollbild aktivierbar (kommentiere die nächste Zeile, falls du Fenster willst)
 Config.set('graphics', 'fullscreen', 'auto')
@@ -44,23 +52,28 @@ CARD_DIR = os.path.join(ROOT, 'Karten')
 
 BACKGROUND_IMAGE = os.path.join(UX_DIR, 'Aruco.png')
 
+# Kamera über dem Tisch (Index oder Videodatei); ihr Bild deckt die Tischfläche = Fenster ab
+ARUCO_SOURCE = 0
+MARKER_POLL_INTERVAL = 1 / 30
+
+# Grafiken kommen per Schlüssel aus ux_assets (Texturatlas, vorgeladen in TabletopApp.build)
 ASSETS = {
     'play': {
-        'live':  os.path.join(UX_DIR, 'play_live.png'),
-        'stop':  os.path.join(UX_DIR, 'play_stop.png'),
+        'live':  ux_assets.asset('play_live'),
+        'stop':  ux_assets.asset('play_stop'),
     },
     'signal': {
-        'low':   {'live': os.path.join(UX_DIR, 'tief_live.png'),   'stop': os.path.join(UX_DIR, 'tief_stop.png')},
-        'mid':   {'live': os.path.join(UX_DIR, 'mittel_live.png'), 'stop': os.path.join(UX_DIR, 'mittel_stop.png')},
-        'high':  {'live': os.path.join(UX_DIR, 'hoch_live.png'),   'stop': os.path.join(UX_DIR, 'hoch_stop.png')},
+        'low':   {'live': ux_assets.asset('tief_live'),   'stop': ux_assets.asset('tief_stop')},
+        'mid':   {'live': ux_assets.asset('mittel_live'), 'stop': ux_assets.asset('mittel_stop')},
+        'high':  {'live': ux_assets.asset('hoch_live'),   'stop': ux_assets.asset('hoch_stop')},
     },
     'decide': {
-        'bluff': {'live': os.path.join(UX_DIR, 'bluff_live.png'),  'stop': os.path.join(UX_DIR, 'bluff_stop.png')},
-        'wahr':  {'live': os.path.join(UX_DIR, 'wahr_live.png'),   'stop': os.path.join(UX_DIR, 'wahr_stop.png')},
+        'bluff': {'live': ux_assets.asset('bluff_live'),  'stop': ux_assets.asset('bluff_stop')},
+        'wahr':  {'live': ux_assets.asset('wahr_live'),   'stop': ux_assets.asset('wahr_stop')},
     },
     'cards': {
-        'back':      os.path.join(CARD_DIR, 'back.png'),
-        'back_stop': os.path.join(CARD_DIR, 'back_stop.png'),
+        'back':      ux_assets.asset('back'),
+        'back_stop': ux_assets.asset('back_stop'),
     }
 }
 
@@ -128,9 +141,7 @@ class CardWidget(Button):
         self.update_visual()
 
     def set_front(self, img_path: str):
-        self.front_image = img_path
-        if not os.path.exists(img_path):
-            self.front_image = ASSETS['cards']['back']
+        self.front_image = img_path or ASSETS['cards']['back']
         self.update_visual()
 
     def update_visual(self):
@@ -204,6 +215,10 @@ class IconButton(Button):
         self.opacity = 1.0 if (self.live or self.selected) else 0.6
 
 
+# Mit PHASE_PROFILE gemessene Methoden (siehe phase_profiler)
+PROFILE_STEPS = ('goto', 'apply_phase', 'setup_round', 'log_event')
+
+
 class TabletopRoot(FloatLayout):
     def __init__(self, **kw):
         super().__init__(**kw)
@@ -231,17 +246,100 @@ class TabletopRoot(FloatLayout):
         self.round_log_path = None
         self.round_log_fp = None
         self.round_log_writer = None
+        # Snapshot bei jedem Phasenwechsel (apply_phase); beim Start ggf. fortsetzen
+        self.snapshots = SnapshotStore(self.log_dir / 'snapshots' / Path(__file__).stem)
+        # PHASE_PROFILE gesetzt → Phasenwechsel/Logging messen; sonst None und ohne Aufwand
+        self.profiler = phase_profiler.attach(
+            self, PROFILE_STEPS, Path(__file__).stem,
+            lambda: (self.session_id, max(0, self.round - 1), self.phase),
+        )
+        # Berührung → Handler → Logging → Frame-Swap je Aktion, Histogramme neben den Event-DBs
+        self.touch_latency = touch_latency.instrument(
+            self, Path(__file__).stem, str(self.log_dir / touch_latency.DB_NAME),
+        )
+        # ArUco: Erkennung läuft in eigenen Threads, der Clock holt nur das neueste Ergebnis ab
+        self.aruco = None
+        self.aruco_error = ''
+        self._aruco_error_logged = False
+        self.markers = {}
+        self._marker_frame = None
+        self._marker_event = None
+        self.marker_overlay = InstructionGroup()
+        self.canvas.after.add(self.marker_overlay)
 
         # --- UI Elemente platzieren
         self.make_ui()
         self.setup_round()
         self.apply_phase()
-        Clock.schedule_once(lambda *_: self.prompt_session_number(), 0.1)
+        self.start_marker_tracking()
+        Clock.schedule_once(lambda *_: self.resume_or_prompt(), 0.1)
 
     # --- Layout & Elemente
     def on_resize(self, *_):
         self.bg.size = Window.size
         self.update_layout()
+        self.draw_markers()
+
+    # --- ArUco-Marker
+    def start_marker_tracking(self):
+        """ Startet Kamera + Erkennung; ohne OpenCV/Kamera bleibt es beim statischen Hintergrund. """
+        try:
+            self.aruco = aruco_capture.ArucoPipeline.open(ARUCO_SOURCE)
+        except RuntimeError as exc:
+            self.aruco = None
+            self.report_marker_error(str(exc))
+            return
+        self._marker_event = Clock.schedule_interval(self.poll_markers, MARKER_POLL_INTERVAL)
+
+    def stop_marker_tracking(self):
+        if self._marker_event is not None:
+            self._marker_event.cancel()
+            self._marker_event = None
+        if self.aruco is not None:
+            self.aruco.stop()
+            self.aruco = None
+
+    def poll_markers(self, *_):
+        # nur abholen, nie warten: latest() liefert das zuletzt fertige Ergebnis
+        if self.aruco.error is not None:
+            self.report_marker_error(str(self.aruco.error))
+            self.stop_marker_tracking()
+            return
+        detection = self.aruco.latest()
+        if detection is None or detection.frame_index == self._marker_frame:
+            return
+        self._marker_frame = detection.frame_index
+        self.markers = {marker.id: marker for marker in detection.markers}
+        self.draw_markers()
+
+    def report_marker_error(self, text: str):
+        """ Ausfall des Marker-Trackings sichtbar machen und als SYS-Event loggen. """
+        self.aruco_error = text
+        self._aruco_error_logged = False
+        self.markers = {}
+        self.marker_overlay.clear()
+        self.update_status_label(1)
+        self.update_status_label(2)
+        self.log_marker_error()
+
+    def log_marker_error(self):
+        # vor der Session-Nummer gibt es noch kein Log: dann beim Session-Start nachholen
+        if not self.aruco_error or self._aruco_error_logged:
+            return
+        if self.log_event(None, 'marker_error', {'error': self.aruco_error}) is not None:
+            self._aruco_error_logged = True
+
+    def draw_markers(self):
+        self.marker_overlay.clear()
+        if not self.markers:
+            return
+        W, H = Window.size
+        self.marker_overlay.add(Color(0.1, 0.8, 0.3, 1))
+        for marker in self.markers.values():
+            points = []
+            for x, y in marker.corners + marker.corners[:1]:
+                points += [x * W, (1.0 - y) * H]
+            self.marker_overlay.add(Line(points=points, width=2))
 
     def make_ui(self):
         # Start-Buttons links/rechts (für beide Spieler)
@@ -605,98 +703,15 @@ class TabletopRoot(FloatLayout):
         return blocks
 
     def load_csv_rounds(self, path: Path):
-        rounds = []
+        # Einmal validiert und kompiliert (schedule_cache), danach mmap-Lesen ohne Parsen
         try:
-            with open(path, newline='', encoding='utf-8') as fp:
-                rows = list(csv.reader(fp))
-        except FileNotFoundError:
-            return rounds
-        except Exception:
-            return rounds
-
-        def parse_cards(row, start, end):
-            values = []
-            for idx in range(start, min(end, len(row))):
-                cell = (row[idx] or '').strip()
-                if not cell:
-                    continue
-                try:
-                    # Einige CSVs enthalten Ganzzahlen ohne Dezimalstellen, andere mit.
-                    values.append(int(float(cell)))
-                except ValueError:
-                    continue
-                if len(values) == 2:
-                    break
-            if len(values) < 2:
-                raise ValueError('Zu wenige Karten')
-            return tuple(values[:2])
-
-        def parse_numeric(cell):
-            if cell is None:
-                return None
-            if isinstance(cell, (int, float)):
-                return int(cell)
-            text = str(cell).strip().replace(',', '.')
-            if not text:
-                return None
-            try:
-                return int(float(text))
-            except ValueError:
-                return None
-
-        def parse_category(cell):
-            text = (cell or '').strip().strip('"').lower()
-            return text or None
-
-        start_idx = 0
-        if rows:
-            try:
-                parse_cards(rows[0], 2, 4)
-                parse_cards(rows[0], 7, 9)
-            except Exception:
-                start_idx = 1
-
-        for row in rows[start_idx:]:
-            if not row or all((cell or '').strip() == '' for cell in row):
-                continue
-            try:
-                vp1_cards = parse_cards(row, 2, 4)
-                vp2_cards = parse_cards(row, 7, 9)
-            except Exception:
-                continue
-
-            vp1_value = parse_numeric(row[5]) if len(row) > 5 else None
-            vp2_value = parse_numeric(row[10]) if len(row) > 10 else None
-            vp1_category = parse_category(row[1]) if len(row) > 1 else None
-            vp2_category = parse_category(row[6]) if len(row) > 6 else None
-
-            if vp1_value is None:
-                total = sum(vp1_cards)
-                vp1_value = 0 if total in (20, 21, 22) else total
-            if vp2_value is None:
-                total = sum(vp2_cards)
-                vp2_value = 0 if total in (20, 21, 22) else total
-
-            rounds.append(
-                {
-                    'vp1': vp1_cards,
-                    'vp2': vp2_cards,
-                    'vp1_value': vp1_value,
-                    'vp2_value': vp2_value,
-                    'vp1_category': vp1_category,
-                    'vp2_category': vp2_category,
-                }
-            )
-        return rounds
+            return schedule_cache.load(path).ui_rounds()
+        except (OSError, ValueError):
+            return []
 
     def value_to_card_path(self, value):
-        try:
-            number = int(value)
-        except (TypeError, ValueError):
-            return ASSETS['cards']['back']
-        filename = f'{number}.png'
-        path = os.path.join(CARD_DIR, filename)
-        return path if os.path.exists(path) else ASSETS['cards']['back']
+        # gemeinsame, einmal aufgebaute Registry – kein Dateisystemzugriff pro Karte
+        return ux_assets.card_source(value)
 
     @staticmethod
     def _parse_value(value):
@@ -863,6 +878,9 @@ class TabletopRoot(FloatLayout):
                 self.pause_message = 'Alle Blöcke abgeschlossen. Vielen Dank!'
             else:
                 self.in_block_pause = True
+                if self.logger:
+                    # Blockpause: niemand wartet auf Eingaben → WAL zurückschreiben und kürzen
+                    self.logger.mark_idle()
                 next_block = self.blocks[self.current_block_idx]
                 condition = 'Stake' if next_block['payout'] else 'ohne Stake'
                 self.pause_message = (
@@ -921,6 +939,7 @@ class TabletopRoot(FloatLayout):
         # Badge unten ist deaktiviert
         self.round_badge.text = ''
         self.update_user_displays()
+        self.save_snapshot()
 
     def start_pressed(self, who:int):
         if self.session_finished:
@@ -1031,6 +1050,9 @@ class TabletopRoot(FloatLayout):
         self.apply_phase()
 
     def prepare_next_round(self, start_immediately: bool = False):
+        # Rundengrenze: je nach Durability committen
+        if self.logger:
+            self.logger.mark_round_end()
         # Rollen tauschen
         self.signaler, self.judge = self.judge, self.signaler
         self.update_turn_order()
@@ -1176,45 +1198,24 @@ class TabletopRoot(FloatLayout):
         judge_value = self.get_hand_value_for_player(judge)
         actual_level = self.signal_level_from_value(actual_value)
 
+        # Gewinner/Wahrheit aus der gemeinsamen Outcome-Tabelle (identisch zur GameEngine)
         truthful = None
-        if signal_choice:
-            if actual_level:
-                truthful = (signal_choice == actual_level)
-            elif actual_total in (20, 21, 22):
-                # Werte über 19 können nicht wahrheitsgemäß signalisiert werden
-                truthful = False
-
         winner = None
-        if judge_choice and truthful is not None:
-            if judge_choice == 'wahr':
-                if truthful:
-                    if (
-                        actual_value is not None
-                        and judge_value is not None
-                    ):
-                        if actual_value > judge_value:
-                            winner = signaler
-                        elif judge_value > actual_value:
-                            winner = judge
-                        else:
-                            winner = None
-                    else:
-                        winner = judge
-                else:
-                    winner = signaler
-            elif judge_choice == 'bluff':
-                winner = judge if not truthful else signaler
-
         draw = False
-        if (
-            judge_choice == 'wahr'
-            and truthful is True
-            and winner is None
-            and actual_value is not None
-            and judge_value is not None
-            and actual_value == judge_value
-        ):
-            draw = True
+        signaler_cards = self._cards_for_role(self.role_by_physical.get(signaler))
+        judge_cards = self._cards_for_role(self.role_by_physical.get(judge))
+        if signal_choice in outcome_table.UI_SIGNALS and signaler_cards and judge_cards:
+            call = outcome_table.UI_CALLS.get(judge_choice)
+            outcome = outcome_table.lookup(
+                signaler_cards,
+                judge_cards,
+                outcome_table.UI_SIGNALS[signal_choice],
+                call or 'wahrheit',
+            )
+            truthful = outcome.truth
+            if call:
+                winner = {'P1': signaler, 'P2': judge}.get(outcome.winner)
+                draw = outcome.reason_id == outcome_table.REASON_SHOWDOWN_DRAW
 
         self.last_outcome = {
             'winner': winner,
@@ -1413,7 +1414,7 @@ class TabletopRoot(FloatLayout):
             role = self.role_by_physical.get(player)
             actor = 'P1' if role == 1 else 'P2'
         round_idx = max(0, self.round - 1)
-        self.logger.log(
+        event = self.logger.log(
             self.session_id,
             round_idx,
             self.current_engine_phase(),
@@ -1422,6 +1423,7 @@ class TabletopRoot(FloatLayout):
             payload
         )
         self.write_round_log(actor, action, payload, player)
+        return event
 
     def init_round_log(self):
         if not self.session_id:
@@ -1621,20 +1623,29 @@ class TabletopRoot(FloatLayout):
                 self.session_error.text = 'Bitte eine positive Zahl eingeben.'
             return
 
+        self.start_session(number)
+        self.log_event(None, 'session_start', {'session_number': number})
+        self.log_marker_error()
+        self.log_round_start()
+        self.apply_phase()
+
+    def start_session(self, number: int):
         self.session_number = number
         self.session_id = f'S{number:03d}'
         self.session_configured = True
         self.log_dir.mkdir(parents=True, exist_ok=True)
         db_path = self.log_dir / f'events_{self.session_id}.sqlite3'
-        self.logger = EventLogger(str(db_path))
+        # Writer-Thread bzw. Engine-Server (ENGINE_SERVER): Disk-I/O läuft nicht im Kivy-Mainloop
+        client = engine_server.connect_from_env()
+        if client is not None:
+            self.logger = engine_server.RemoteEventLogger(client)
+        else:
+            self.logger = EventLogger(str(db_path), async_mode=True)
         self.init_round_log()
         self.update_role_assignments()
         if self.session_popup:
             self.session_popup.dismiss()
             self.session_popup = None
-        self.log_event(None, 'session_start', {'session_number': number})
-        self.log_round_start()
-        self.apply_phase()
 
     def log_round_start(self):
         if not self.session_configured:
@@ -1649,6 +1660,96 @@ class TabletopRoot(FloatLayout):
             'vp_roles': self.role_by_physical.copy(),
         })
 
+    # --- Snapshots (Fortsetzen nach Absturz)
+    def snapshot_state(self):
+        return {
+            'session_number': self.session_number,
+            'phase': self.phase,
+            'signaler': self.signaler,
+            'judge': self.judge,
+            'current_block_idx': self.current_block_idx,
+            'current_round_idx': self.current_round_idx,
+            'in_block_pause': self.in_block_pause,
+            'pause_message': self.pause_message,
+            'session_finished': self.session_finished,
+            'score_state': self.score_state,
+            'score_state_block': self.score_state_block,
+            'score_state_round_start': self.score_state_round_start,
+            'outcome_score_applied': self.outcome_score_applied,
+            'player_signals': self.player_signals,
+            'player_decisions': self.player_decisions,
+        }
+
+    def save_snapshot(self):
+        if not self.session_configured:
+            return
+        self.snapshots.save(self.session_id, self.snapshot_state(),
+                            finished=self.session_finished)
+
+    def resume_or_prompt(self):
+        entry = self.snapshots.latest_unfinished()
+        if entry is None:
+            self.prompt_session_number()
+            return
+        key, data = entry
+        try:
+            self.restore_snapshot(data['state'])
+        except (KeyError, IndexError, ValueError) as exc:
+            self.prompt_session_number()
+            self.session_error.text = f'Snapshot {key} nicht lesbar: {exc}'
+
+    def restore_snapshot(self, state):
+        """Setzt eine unterbrochene Session in der gespeicherten Phase fort."""
+        self.start_session(state['session_number'])
+        self.log_event(None, 'session_resumed', {
+            'session_number': state['session_number'],
+            'phase': state['phase'],
+            'block_idx': state['current_block_idx'],
+            'round_idx': state['current_round_idx'],
+        })
+        self.log_marker_error()
+        self.signaler, self.judge = state['signaler'], state['judge']
+        self.update_turn_order()
+        self.current_block_idx = state['current_block_idx']
+        self.current_round_idx = state['current_round_idx']
+        self.in_block_pause = state['in_block_pause']
+        self.pause_message = state['pause_message']
+        self.session_finished = state['session_finished']
+        self.score_state = int_keys(state['score_state'])
+        self.score_state_block = state['score_state_block']
+        self.setup_round()
+        self.score_state_round_start = int_keys(state['score_state_round_start'])
+        self.outcome_score_applied = state['outcome_score_applied']
+        self.player_signals = int_keys(state['player_signals'])
+        self.player_decisions = int_keys(state['player_decisions'])
+        self.phase = state['phase']
+
+        # Bereits aufgedeckte Karten und getroffene Auswahl wieder anzeigen
+        order = [
+            (self.first_player, 'inner'),
+            (self.second_player, 'inner'),
+            (self.first_player, 'outer'),
+            (self.second_player, 'outer'),
+        ]
+        card_phases = [self.phase_for_player(player, which) for player, which in order]
+        if self.phase in card_phases:
+            revealed = card_phases.index(self.phase)
+        elif self.phase in (PH_SIGNALER, PH_JUDGE, PH_SHOWDOWN):
+            revealed = len(order)
+        else:
+            revealed = 0
+        for player, which in order[:revealed]:
+            widget = self.card_widget_for_player(player, which)
+            widget.face_up = True
+            widget.update_visual()
+        level = self.player_signals.get(self.signaler)
+        if level in self.signal_buttons[self.signaler]:
+            self.signal_buttons[self.signaler][level].set_pressed_state()
+        decision = self.player_decisions.get(self.judge)
+        if decision in self.decision_buttons[self.judge]:
+            self.decision_buttons[self.judge][decision].set_pressed_state()
+        self.apply_phase()
+
     def record_action(self, player:int, text:str):
         self.status_lines[player].append(text)
         self.update_status_label(player)
@@ -1660,11 +1761,15 @@ class TabletopRoot(FloatLayout):
         role = 'Signal' if self.signaler == player else 'Judge'
         header = [f"Du bist Spieler {player}", f"Rolle: {role}"]
         body = self.status_lines[player]
+        if self.aruco_error:
+            body = body + [f'Marker-Tracking aus: {self.aruco_error}']
         self.status_labels[player].text = "\n".join(header + body)
 
 class TabletopApp(App):
     def build(self):
         self.title = 'Masterarbeit – Tabletop UX'
+        # Atlas einmal dekodieren, damit Phasenwechsel keine Bilder nachladen
+        ux_assets.preload()
         root = TabletopRoot()
         return root
 
@@ -1672,7 +1777,12 @@ class TabletopApp(App):
         root = self.root
         if root and root.logger:
             root.logger.close()
+        if root and root.profiler:
+            root.profiler.close()
+        if root and root.touch_latency:
+            root.touch_latency.close()
         if root:
+            root.stop_marker_tracking()
             root.close_round_log()
 
 if __name__ == '__main__':
@@ -0,0 +1,221 @@
+# touch_latency.py  (Latenz Berührung → Handler → Logging → nächster Frame, je Tabletop-Aktion)
+#
+# instrument() hängt sich an ein TabletopRoot: Window.on_touch_up stempelt die Berührung
+# (touch.time_update, also die Zeit des Eingabe-Events), die Handler (tap_card, pick_signal,
+# pick_decision) stempeln ihren Eintritt, log_event das Ende des Loggings und Window.on_flip
+# den ersten Buffer-Swap danach – ab da ist die neue Grafik sichtbar. Je Aktion entstehen
+# vier Abschnitte:
+#     input    Berührung → Handler-Eintritt
+#     handler  Handler-Eintritt → Logging fertig
+#     render   Logging fertig → Frame-Swap
+#     total    Berührung → Frame-Swap
+# Die Werte landen als Histogramme (Bucket-Obergrenzen in ms) in touch_latency.sqlite3 im
+# Log-Ordner neben den events_*.sqlite3; Berührungen, die kein Handler annimmt (falsche
+# Phase, Fläche ohne Button), zählen nicht. TOUCH_LATENCY=0 schaltet die Messung ab.
+#     python touch_latency.py report logs/touch_latency.sqlite3 [--source tabletop_ux_kivy_base_w]
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import argparse
+import bisect
+import functools
+import os
+import pathlib
+import sqlite3
+import time
+
+ENV_SWITCH = "TOUCH_LATENCY"
+DB_NAME = "touch_latency.sqlite3"
+ACTIONS = ("tap_card", "pick_signal", "pick_decision")
+SEGMENTS = ("input", "handler", "render", "total")
+# Obergrenzen in ms; 16.7/33.3 = ein bzw. zwei Frames bei 60 Hz, letzter Bucket offen
+BUCKETS_MS = (0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3, 50.0, 100.0, 200.0, 500.0, 1000.0, float("inf"))
+FLUSH_EVERY = 64             # Samples; SQLite nicht bei jeder Berührung im Mainloop öffnen
+
+
+def _create_schema(conn: sqlite3.Connection):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS touch_latency_hist(
+      source TEXT, session_id TEXT NOT NULL DEFAULT '', action TEXT, segment TEXT,
+      bucket_ms REAL, count INTEGER,
+      PRIMARY KEY(source, session_id, action, segment, bucket_ms)
+    )""")
+
+
+class TouchLatency:
+    """ Sammelt je Berührung die vier Stempel und zählt die Abschnitte in Histogramme. """
+    def __init__(self, db_path: str, source: str, session: Callable[[], Optional[str]]):
+        self.db_path = pathlib.Path(db_path)
+        self.source = source
+        self.session = session
+        self._touch_time: Optional[float] = None   # time.time() des letzten touch_up
+        # [action, t_touch (wall), t_handler (wall), t_handler (perf), t_logged (perf)]
+        self._sample: Optional[list] = None
+        self._hist: Dict[tuple, int] = {}
+        self._pending = 0
+        self.samples = 0
+
+    # --- Stempel
+    def on_touch_up(self, _window, touch):
+        self._touch_time = getattr(touch, "time_update", None) or time.time()
+
+    def wrap_handler(self, action: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def stamped(*args, **kwargs):
+            # nur direkt aus einer Berührung heraus; Aufrufe aus Clock/Restore haben keinen Stempel
+            if self._touch_time is not None and self._sample is None:
+                self._sample = [action, self._touch_time, time.time(), time.perf_counter(), None]
+            self._touch_time = None
+            return method(*args, **kwargs)
+        return stamped
+
+    def wrap_log(self, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def stamped(*args, **kwargs):
+            result = method(*args, **kwargs)
+            # log_event gibt None zurück, wenn es nichts geloggt hat (keine Session konfiguriert)
+            if result is not None and self._sample is not None and self._sample[4] is None:
+                self._sample[4] = time.perf_counter()
+            return result
+        return stamped
+
+    def on_flip(self, *_):
+        now = time.perf_counter()
+        self._touch_time = None
+        sample, self._sample = self._sample, None
+        if sample is None or sample[4] is None:
+            return   # Handler hat abgelehnt (kein Logging) → keine sichtbare Änderung
+        action, t_touch, t_handler_wall, t_handler, t_logged = sample
+        input_ms = max(0.0, (t_handler_wall - t_touch) * 1000.0)
+        handler_ms = (t_logged - t_handler) * 1000.0
+        render_ms = (now - t_logged) * 1000.0
+        self.add(action, (input_ms, handler_ms, render_ms, input_ms + handler_ms + render_ms))
+
+    def add(self, action: str, values_ms: Iterable[float]):
+        # '' statt NULL: NULL-Werte im Primärschlüssel gelten als verschieden, das Upsert griffe nie
+        session_id = self.session() or ""
+        for segment, value in zip(SEGMENTS, values_ms):
+            bucket = BUCKETS_MS[bisect.bisect_left(BUCKETS_MS, value)]
+            key = (self.source, session_id, action, segment, bucket)
+            self._hist[key] = self._hist.get(key, 0) + 1
+        self.samples += 1
+        self._pending += 1
+        if self._pending >= FLUSH_EVERY:
+            self.flush()
+
+    # --- Persistenz
+    def flush(self):
+        if not self._hist:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            _create_schema(conn)
+            conn.executemany(
+                "INSERT INTO touch_latency_hist VALUES (?,?,?,?,?,?) "
+                "ON CONFLICT(source, session_id, action, segment, bucket_ms) "
+                "DO UPDATE SET count = count + excluded.count",
+                [key + (count,) for key, count in self._hist.items()],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self._hist.clear()
+        self._pending = 0
+
+    def close(self):
+        from kivy.core.window import Window
+        Window.unbind(on_touch_up=self.on_touch_up, on_flip=self.on_flip)
+        self.flush()
+
+
+def instrument(root: Any, source: str, db_path: str,
+               actions: Iterable[str] = ACTIONS) -> Optional[TouchLatency]:
+    """
+    Stempelt auf dieser TabletopRoot-Instanz die Handler `actions` und log_event und
+    bindet sich an Window; None, wenn TOUCH_LATENCY=0.
+    """
+    if os.environ.get(ENV_SWITCH) == "0":
+        return None
+    from kivy.core.window import Window
+    latency = TouchLatency(db_path, source, lambda: root.session_id)
+    for action in actions:
+        setattr(root, action, latency.wrap_handler(action, getattr(root, action)))
+    root.log_event = latency.wrap_log(root.log_event)
+    Window.bind(on_touch_up=latency.on_touch_up, on_flip=latency.on_flip)
+    return latency
+
+
+# -------------- Auswertung --------------
+
+def _bucket_percentile(buckets: List[tuple], total: int, q: float) -> float:
+    """ Obergrenze des Buckets, in dem das q-Quantil liegt. """
+    seen = 0
+    for bucket_ms, count in buckets:
+        seen += count
+        if seen >= q * total:
+            return bucket_ms
+    return buckets[-1][0]
+
+
+def report(db_path: str, source: Optional[str] = None,
+           session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """ Je (source, action, segment): Anzahl und p50/p95/p99 als Bucket-Obergrenzen. """
+    clauses, params = [], []
+    if source:
+        clauses.append("source = ?")
+        params.append(source)
+    if session_id:
+        clauses.append("session_id = ?")
+        params.append(session_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            f"SELECT source, action, segment, bucket_ms, SUM(count), COUNT(DISTINCT NULLIF(session_id, '')) "
+            f"FROM touch_latency_hist {where} "
+            f"GROUP BY source, action, segment, bucket_ms ORDER BY source, action, segment, bucket_ms",
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+    groups: Dict[tuple, List[tuple]] = {}
+    sessions: Dict[tuple, int] = {}
+    for src, action, segment, bucket_ms, count, n_sessions in rows:
+        key = (src, action, segment)
+        groups.setdefault(key, []).append((bucket_ms, count))
+        sessions[key] = max(sessions.get(key, 0), n_sessions)
+    result = []
+    for (src, action, segment), buckets in groups.items():
+        total = sum(count for _, count in buckets)
+        result.append({
+            "source": src, "action": action, "segment": segment,
+            "sessions": sessions[(src, action, segment)], "count": total,
+            "p50_ms": _bucket_percentile(buckets, total, 0.50),
+            "p95_ms": _bucket_percentile(buckets, total, 0.95),
+            "p99_ms": _bucket_percentile(buckets, total, 0.99),
+        })
+    result.sort(key=lambda e: (e["source"], e["action"], SEGMENTS.index(e["segment"])))
+    return result
+
+
+def print_report(entries: List[Dict[str, Any]]):
+    print(f"{'Quelle':<28}{'Aktion':<15}{'Abschnitt':<10}{'Sess.':>6}{'Anzahl':>8}"
+          f"{'p50 ≤ms':>9}{'p95 ≤ms':>9}{'p99 ≤ms':>9}")
+    for e in entries:
+        print(f"{e['source']:<28}{e['action']:<15}{e['segment']:<10}{e['sessions']:>6}{e['count']:>8}"
+              f"{e['p50_ms']:>9g}{e['p95_ms']:>9g}{e['p99_ms']:>9g}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Touch-Latenz-Histogramme auswerten")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_report = sub.add_parser("report", help="Perzentile je Aktion und Abschnitt")
+    p_report.add_argument("db", nargs="?", default=f"logs/{DB_NAME}")
+    p_report.add_argument("--source", default=None, help="nur diese UI (Dateiname)")
+    p_report.add_argument("--session", default=None)
+    args = ap.parse_args()
+    print_report(report(args.db, args.source, args.session))
+
+
+if __name__ == "__main__":
+    main()
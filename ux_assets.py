@@ -0,0 +1,208 @@
+# ux_assets.py  (Texturatlas + Vorlade-Cache für Karten- und UX-Grafiken der Tabletop-UIs)
+#
+# Build-Schritt (nach Änderungen in Karten/ oder UX/; benötigt Kivy und Pillow):
+#     python ux_assets.py build
+# Die UIs verweisen über asset(<Schlüssel>) bzw. card_source(<Kartenwert>) auf atlas://-URIs
+# (CardAssetRegistry, eine Instanz für alle UIs). preload() dekodiert nach dem Fensteraufbau
+# alles genau einmal; danach lösen Phasenwechsel weder Datei-I/O noch Bilddekodierung aus. Fehlt der Atlas oder ist er
+# älter als die Quellbilder, werden die Einzeldateien verwendet.
+from __future__ import annotations
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional, Set, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+UX_DIR = os.path.join(ROOT, 'UX')
+CARD_DIR = os.path.join(ROOT, 'Karten')
+ATLAS_DIR = os.path.join(ROOT, 'atlas')
+ATLAS_NAME = 'tabletop'
+ATLAS_SIZE = 2048              # Atlas.create legt bei Bedarf mehrere Seiten an
+ICON_MAX_EDGE = 512            # größte Buttonfläche auf 4K: 360 px (Start-Button)
+ATLAS_EXCLUDE = {'Aruco'}      # Vollbild-Hintergrund der ArUco-UI, zu groß für den Atlas
+MTIME_CHECK_INTERVAL = 5.0     # Sekunden zwischen zwei mtime-Prüfungen der Ordner
+
+
+def source_files(dirs=(CARD_DIR, UX_DIR)) -> Dict[str, str]:
+    """ Schlüssel (Dateiname ohne .png) → Quellpfad für Karten/ und UX/. """
+    files = {}
+    for folder in dirs:
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() == '.png' and stem not in ATLAS_EXCLUDE:
+                files[stem] = os.path.join(folder, name)
+    return files
+
+
+def atlas_file(atlas_dir: str = ATLAS_DIR) -> str:
+    return os.path.join(atlas_dir, ATLAS_NAME + '.atlas')
+
+
+def _atlas_keys(sources: Dict[str, str], path: str) -> Set[str]:
+    """ Schlüssel im Atlas, sofern er existiert und nicht älter als die Quellbilder ist. """
+    try:
+        atlas_mtime = os.path.getmtime(path)
+        with open(path, encoding='utf-8') as fp:
+            meta = json.load(fp)
+    except (OSError, ValueError):
+        return set()
+    if any(os.path.getmtime(src) > atlas_mtime for src in sources.values()):
+        return set()
+    return {key for page in meta.values() for key in page}
+
+
+class CardAssetRegistry:
+    """
+    Einmal aufgebaute Zuordnung Grafik-Schlüssel bzw. Kartenwert → geprüfte Kivy-Quelle
+    (atlas://-URI oder Dateipfad) samt vorgeladener Texturen. Neu eingelesen wird nur per
+    reload() oder wenn sich die mtime von Karten/, UX/ oder des Atlas ändert; geprüft wird
+    das höchstens alle MTIME_CHECK_INTERVAL Sekunden, Lookups kosten keinen Dateizugriff.
+    """
+    def __init__(self, card_dir: str = CARD_DIR, ux_dir: str = UX_DIR,
+                 atlas_dir: str = ATLAS_DIR):
+        self.dirs = (card_dir, ux_dir)
+        self.atlas_path = atlas_file(atlas_dir)
+        self.atlas_uri = 'atlas://' + os.path.join(atlas_dir, ATLAS_NAME).replace(os.sep, '/')
+        self._textures: Dict[str, object] = {}     # hält vorgeladene Texturen im Speicher
+        self.reload()
+
+    def _mtimes(self) -> Tuple[Optional[int], ...]:
+        stamps = []
+        for path in (*self.dirs, os.path.dirname(self.atlas_path), self.atlas_path):
+            try:
+                stamps.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def reload(self):
+        self._seen_mtimes = self._mtimes()
+        self._next_check = time.monotonic() + MTIME_CHECK_INTERVAL
+        self.sources = source_files(self.dirs)
+        self.atlas_keys = _atlas_keys(self.sources, self.atlas_path)
+        self._resolved = {
+            key: (f'{self.atlas_uri}/{key}' if key in self.atlas_keys else path)
+            for key, path in self.sources.items()
+        }
+        self._cards = {int(key): src for key, src in self._resolved.items() if key.isdigit()}
+        self._textures.clear()
+
+    def _check_fresh(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + MTIME_CHECK_INTERVAL
+        if self._mtimes() != self._seen_mtimes:
+            self.reload()
+
+    def asset(self, key: str) -> str:
+        """ Kivy-Quelle für einen Grafik-Schlüssel (KeyError, falls unbekannt). """
+        self._check_fresh()
+        return self._resolved[key]
+
+    def has(self, key: str) -> bool:
+        self._check_fresh()
+        return key in self._resolved
+
+    def card(self, value) -> str:
+        """ Quelle der Kartenvorderseite; unbekannte Werte zeigen die Rückseite. """
+        self._check_fresh()
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            number = None
+        source = self._cards.get(number)
+        return source if source is not None else self._resolved.get('back', '')
+
+    def texture(self, key: str):
+        """ Vorgeladene Textur (lädt bei Bedarf nach, falls preload() nicht lief). """
+        tex = self._textures.get(key)
+        if tex is None:
+            from kivy.core.image import Image as CoreImage
+            tex = self._textures[key] = CoreImage(self.asset(key)).texture
+        return tex
+
+    def preload(self) -> float:
+        """
+        Nach dem Fensteraufbau (GL-Kontext) aufrufen, z. B. in App.build(). Lädt den Atlas
+        bzw. die Einzeldateien einmal in den Kivy-Cache. Rückgabe: Dauer in Sekunden.
+        """
+        t0 = time.perf_counter()
+        for key in self._resolved:
+            self.texture(key)
+        return time.perf_counter() - t0
+
+
+# Gemeinsame Instanz für alle UIs
+REGISTRY = CardAssetRegistry()
+
+
+def asset(key: str) -> str:
+    return REGISTRY.asset(key)
+
+
+def has_asset(key: str) -> bool:
+    return REGISTRY.has(key)
+
+
+def card_source(value) -> str:
+    return REGISTRY.card(value)
+
+
+def uses_atlas() -> bool:
+    return bool(REGISTRY.atlas_keys)
+
+
+def preload() -> float:
+    return REGISTRY.preload()
+
+
+def texture(key: str):
+    return REGISTRY.texture(key)
+
+
+def build_atlas() -> str:
+    """ Packt alle Karten- und UX-Grafiken in atlas/tabletop.atlas (+ PNG-Seiten). """
+    from kivy.atlas import Atlas
+    from PIL import Image as PILImage
+
+    sources = source_files()
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for key, path in sources.items():
+            out = os.path.join(tmp, key + '.png')
+            with PILImage.open(path) as im:
+                # Icons liegen in ~2400 px vor, angezeigt werden höchstens 360 px
+                if max(im.size) > ICON_MAX_EDGE:
+                    im.thumbnail((ICON_MAX_EDGE, ICON_MAX_EDGE), PILImage.LANCZOS)
+                im.save(out)
+            files.append(out)
+        os.makedirs(ATLAS_DIR, exist_ok=True)
+        result = Atlas.create(os.path.join(ATLAS_DIR, ATLAS_NAME), files, ATLAS_SIZE)
+    if not result:
+        raise RuntimeError('Atlas konnte nicht erstellt werden (Bilder größer als ATLAS_SIZE?).')
+    return atlas_file()
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Texturatlas für die Tabletop-UIs')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('build', help='Karten/ und UX/ in atlas/tabletop.atlas packen')
+    sub.add_parser('status', help='Zeigt, ob der Atlas aktuell ist')
+    args = ap.parse_args()
+    if args.cmd == 'build':
+        path = build_atlas()
+        REGISTRY.reload()
+        print(f'{path}: {len(REGISTRY.atlas_keys)} Grafiken')
+    else:
+        state = 'aktuell' if uses_atlas() else 'fehlt oder veraltet'
+        print(f'{atlas_file()}: {state} '
+              f'({len(REGISTRY.atlas_keys)}/{len(REGISTRY.sources)} Grafiken)')
+
+
+if __name__ == '__main__':
+    main()